@@ -36,6 +36,7 @@
 from __future__ import annotations
 
 from .vertica.connection import Connection, connect, parse_dsn
+from .vertica.row import LazyRow, Row
 
 # Importing exceptions for compatibility with dbapi 2.0.
 # See: PEP 249 - Python Database API 2.0
@@ -51,7 +52,7 @@ __copyright__ = 'Copyright (c) 2018-2024 Open Text.'
 __license__ = 'Apache 2.0'
 
 __all__ = ['Connection', 'PROTOCOL_VERSION', 'version_info', 'apilevel', 'threadsafety',
-           'paramstyle', 'connect', 'parse_dsn', 'Error', 'Warning', 'DataError', 'DatabaseError',
+           'paramstyle', 'connect', 'parse_dsn', 'Row', 'LazyRow', 'Error', 'Warning', 'DataError', 'DatabaseError',
            'IntegrityError', 'InterfaceError', 'InternalError', 'NotSupportedError',
            'OperationalError', 'ProgrammingError']
 
@@ -24,6 +24,10 @@ from ... import errors
 
 class CancelTestCase(VerticaPythonIntegrationTestCase):
 
+    def tearDown(self):
+        self._conn_info.pop('drain_cancel_threshold', None)
+        super(CancelTestCase, self).tearDown()
+
     def test_cursor_cancel(self):
         # Cursor.cancel() should be not supported any more
         with self._connect() as conn:
@@ -99,5 +103,46 @@ class CancelTestCase(VerticaPythonIntegrationTestCase):
             finally:
                 cur.execute("DROP TABLE IF EXISTS vptest")
 
+    def test_abandoned_query_is_canceled(self):
+        self._conn_info['drain_cancel_threshold'] = 4 * 1024 * 1024
+        with self._connect() as conn:
+            cur = conn.cursor()
+            # This query returns about 30,000,000 rows. Executing the next query
+            # without fetching them cancels it instead of reading all of them.
+            cur.execute("SELECT slice_time FROM ("
+                        "  SELECT '2021-01-01'::timestamp s UNION ALL SELECT '2022-01-01'::timestamp s"
+                        ") sq TIMESERIES slice_time AS '1 second' OVER(ORDER BY s)")
+            for i, _ in enumerate(cur.iterate()):
+                if i == 100:
+                    break
+            start = time.time()
+            cur.execute("SELECT 1")
+            self.assertLess(time.time() - start, 10)
+            res = cur.fetchall()
+            self.assertListOfListsEqual(res, [[1]])
+
+            # The next query runs normally
+            cur.execute("SELECT 2")
+            res = cur.fetchall()
+            self.assertListOfListsEqual(res, [[2]])
+
+    def test_abandoned_query_is_read_by_default(self):
+        with self._connect() as conn:
+            cur = conn.cursor()
+            cur.execute("DROP TABLE IF EXISTS vptest")
+            cur.execute("CREATE TABLE vptest (a INT)")
+            # The statement after the abandoned result is executed
+            cur.execute("SELECT slice_time FROM ("
+                        "  SELECT '2021-01-01'::timestamp s UNION ALL SELECT '2021-02-01'::timestamp s"
+                        ") sq TIMESERIES slice_time AS '1 second' OVER(ORDER BY s);"
+                        " INSERT INTO vptest VALUES (1)", use_prepared_statements=False)
+            for i, _ in enumerate(cur.iterate()):
+                if i == 100:
+                    break
+            cur.execute("SELECT COUNT(*) FROM vptest")
+            res = cur.fetchall()
+            self.assertListOfListsEqual(res, [[1]])
+            cur.execute("DROP TABLE IF EXISTS vptest")
+
 
 exec(CancelTestCase.createPrepStmtClass())
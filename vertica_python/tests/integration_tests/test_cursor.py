@@ -53,6 +53,8 @@ from parameterized import parameterized
 
 from .base import VerticaPythonIntegrationTestCase
 from ... import errors
+from ...datatypes import VerticaType
+from ...vertica.column import FormatCode
 
 """
 There are a couple of testcases in this file, they are
@@ -405,6 +407,26 @@ class CursorTestCase(VerticaPythonIntegrationTestCase):
             res = cur.fetchall()
             self.assertListOfListsEqual(res, [[3]])
 
+    def test_fetch_after_batched_rows(self):
+        # 5000 rows, more than one batch of DataRow messages
+        query = ("SELECT DATEDIFF('second', '2000-01-01', ts) FROM "
+                 "(SELECT '2000-01-01 00:00:00'::TIMESTAMP AS tm UNION ALL "
+                 " SELECT '2000-01-01 01:23:19'::TIMESTAMP) t "
+                 "TIMESERIES ts AS '1 second' OVER (ORDER BY tm) ORDER BY 1")
+        with self._connect() as conn:
+            cur = conn.cursor()
+            cur.execute(query)
+            for res in cur.iterate():
+                if res[0] == 10:
+                    break
+            self.assertListEqual(cur.fetchone(), [11])
+            self.assertListOfListsEqual(cur.fetchmany(3), [[12], [13], [14]])
+            self.assertEqual(cur.rowcount, 15)
+            res = cur.fetchall()
+            self.assertEqual(len(res), 4985)
+            self.assertListEqual(res[-1], [4999])
+            self.assertEqual(cur.rowcount, 5000)
+
     def test_query_errors(self):
         with self._connect() as conn:
             cur = conn.cursor()
@@ -1201,6 +1223,10 @@ class PreparedStatementTestCase(VerticaPythonIntegrationTestCase):
         with self._connect() as conn:
             cur = conn.cursor()
             cur.execute("DROP TABLE IF EXISTS {0}".format(self._table))
+        self._conn_info.pop('pipeline_prepared_statements', None)
+        self._conn_info.pop('prepared_statement_cache_size', None)
+        self._conn_info.pop('binary_parameters', None)
+        self._conn_info.pop('mixed_result_formats', None)
         super(PreparedStatementTestCase, self).tearDown()
 
     def test_empty_statement(self):
@@ -1320,6 +1346,107 @@ class PreparedStatementTestCase(VerticaPythonIntegrationTestCase):
             self.assertIsNone(cur.fetchone())
             self.assertFalse(cur.nextset())
 
+    def test_prepared_statement_cache(self):
+        self._conn_info['prepared_statement_cache_size'] = 2
+        with self._connect() as conn:
+            cur = conn.cursor()
+            queries = ["SELECT ? + {}".format(i) for i in range(3)]
+            for query in queries[:2] + queries[:2] + queries[2:]:
+                cur.execute(query, [1])
+                self.assertEqual(cur.fetchone()[0], int(query[-1]) + 1)
+            info = conn.prepared_statement_cache_info()
+            self.assertEqual((info.hits, info.misses, info.evictions, info.currsize), (2, 3, 1, 2))
+
+            # The evicted statement is prepared again
+            cur.execute(queries[0], [2])
+            self.assertEqual(cur.fetchone()[0], 2)
+            self.assertEqual(conn.prepared_statement_cache_info().evictions, 2)
+
+            # The statements outlive the cursor that prepared them
+            cur.close()
+            with conn.cursor() as cur:
+                cur.execute(queries[2], [1])
+                self.assertEqual(cur.fetchone()[0], 3)
+            info = conn.prepared_statement_cache_info()
+            self.assertEqual((info.hits, info.currsize), (3, 2))
+
+    def test_binary_parameters(self):
+        self._conn_info['binary_parameters'] = True
+        values = [True, -2 ** 63, 1.5, date(1999, 12, 31), datetime(2024, 2, 29, 1, 2, 3, 456789),
+                  datetime(2000, 1, 1, 12, tzinfo=tzoffset(None, 3600)), UUID('12345678-1234-5678-1234-567812345678'),
+                  Decimal('1.25')]
+        with self._connect() as conn:
+            cur = conn.cursor()
+            cur.execute("SET TIME ZONE TO 'UTC'")
+            cur.execute("CREATE TABLE {} (a boolean, b int, c float, d date, e timestamp,"
+                        " f timestamptz, g uuid, h numeric(10, 2))".format(self._table))
+            cur.executemany("INSERT INTO {} VALUES (?, ?, ?, ?, ?, ?, ?, ?)".format(self._table),
+                            [values, [None] * len(values), ['f', '7', 2, '2000-01-01', date(2000, 1, 1),
+                                                            datetime(2000, 1, 1), None, 3]])
+            conn.commit()
+            cur.execute("SELECT * FROM {} ORDER BY b NULLS LAST".format(self._table))
+            self.assertListOfListsEqual(cur.fetchall(), [
+                values,
+                [False, 7, 2.0, date(2000, 1, 1), datetime(2000, 1, 1),
+                 datetime(2000, 1, 1, tzinfo=tzoffset(None, 0)), None, Decimal('3.00')],
+                [None] * len(values)])
+
+    def test_mixed_result_formats(self):
+        self._conn_info['mixed_result_formats'] = True
+        query = ("SELECT 1 AS a, 1.5::float AS b, DATE '2024-02-29' AS c, TIMESTAMP '2024-02-29 01:02:03.5' AS d,"
+                 " 'abc'::varchar AS e, 1.25::numeric(10, 2) AS f, ?::int AS g")
+        expected = [1, 1.5, date(2024, 2, 29), datetime(2024, 2, 29, 1, 2, 3, 500000), 'abc', Decimal('1.25'), 2]
+        with self._connect() as conn:
+            cur = conn.cursor()
+            cur.execute(query, [2], use_prepared_statements=True)
+            self.assertEqual([col.format_code for col in cur.description], [1, 1, 1, 1, 0, 0, 1])
+            self.assertListOfListsEqual(cur.fetchall(), [expected])
+
+            cur.set_result_formats(types={VerticaType.DATE: FormatCode.TEXT},
+                                   columns={'a': FormatCode.TEXT, -1: FormatCode.TEXT})
+            cur.execute(query, [2], use_prepared_statements=True)
+            self.assertEqual([col.format_code for col in cur.description], [0, 1, 0, 1, 0, 0, 0])
+            self.assertListOfListsEqual(cur.fetchall(), [expected])
+
+    def test_pipelined_execute(self):
+        self._conn_info['pipeline_prepared_statements'] = True
+        with self._connect() as conn:
+            cur = conn.cursor()
+            cur.execute("CREATE TABLE {} (a int, b varchar(100), c float, d boolean)".format(self._table))
+            cur.execute("INSERT INTO {} VALUES (?, ?, ?, ?)".format(self._table), [1, 'x' * 100, 1.5, True])
+            cur.execute("INSERT INTO {} VALUES (?, ?, ?, ?)".format(self._table), [2, '2000-01-01', None, False])
+            conn.commit()
+
+            cur.execute("SELECT * FROM {} WHERE a = ?".format(self._table), [1])
+            self.assertListOfListsEqual(cur.fetchall(), [[1, 'x' * 100, 1.5, True]])
+            # String parameters are resolved like string literals
+            cur.execute("SELECT a FROM {} WHERE a = ? AND b::date = ?".format(self._table), ['2', '2000-01-01'])
+            self.assertListOfListsEqual(cur.fetchall(), [[2]])
+
+            with pytest.raises(errors.VerticaSyntaxError):
+                cur.execute("SELECT * FROM {} WHERE a = ? ORDER".format(self._table), [1])
+            with pytest.raises(ValueError, match='Invalid number of parameters'):
+                cur.execute("SELECT * FROM {} WHERE a = ?".format(self._table), [1, 2])
+            cur.execute("SELECT COUNT(*) FROM {} WHERE d = ?".format(self._table), [False])
+            self.assertListOfListsEqual(cur.fetchall(), [[1]])
+
+    def test_pipelined_parameter_types(self):
+        self._conn_info['pipeline_prepared_statements'] = True
+        with self._connect() as conn:
+            cur = conn.cursor()
+            cur.execute("CREATE TABLE {} (a numeric(30, 2))".format(self._table))
+            # The parameter type is inferred from the column, not from the first value
+            query = "INSERT INTO {} VALUES (?)".format(self._table)
+            for value in (1, Decimal('12345678901234567.89'), '2.25', 2 ** 70):
+                cur.execute(query, [value])
+            conn.commit()
+            cur.execute("SELECT a FROM {} WHERE a > ? ORDER BY a".format(self._table), [1])
+            self.assertListOfListsEqual(cur.fetchall(), [
+                [Decimal('2.25')], [Decimal('12345678901234567.89')], [Decimal(2 ** 70)]])
+            cur.execute("SELECT a FROM {} WHERE a > ? ORDER BY a".format(self._table), [Decimal('2.5')])
+            self.assertListOfListsEqual(cur.fetchall(), [
+                [Decimal('12345678901234567.89')], [Decimal(2 ** 70)]])
+
     def test_bind_boolean(self):
         values = (True, 't', 'true', '1', 1, 'Yes', 'y', None,
                   False, 'f', 'false', '0', 0, 'No', 'n')
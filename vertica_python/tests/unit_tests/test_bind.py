@@ -0,0 +1,109 @@
+# Copyright (c) 2024 Open Text.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from struct import pack, unpack_from
+from uuid import UUID
+
+from .base import VerticaPythonUnitTestCase
+from ...datatypes import VerticaType
+from ...vertica.deserializer import (load_bool_binary, load_date_binary, load_float8_binary,
+                                     load_int8_binary, load_timestamp_binary,
+                                     load_timestamptz_binary, load_uuid_binary)
+from ...vertica.column import FormatCode
+from ...vertica.messages import Bind, RowDescription
+
+
+def parse_bind(message, results=False):
+    """Return the parameter format codes and values of a Bind message, or its
+    result format codes."""
+    data = message.read_bytes()
+    pos = data.index(b'\x00', data.index(b'\x00') + 1) + 1
+    count = unpack_from('!H', data, pos)[0]
+    formats = list(unpack_from('!{}H'.format(count), data, pos + 2))
+    pos += 2 + 2 * count
+    count = unpack_from('!H', data, pos)[0]
+    pos += 2 + 4 * count
+    values = []
+    for _ in range(count):
+        size = unpack_from('!i', data, pos)[0]
+        pos += 4
+        values.append(None if size == -1 else data[pos:pos + size])
+        pos += max(size, 0)
+    if results:
+        count = unpack_from('!H', data, pos)[0]
+        return list(unpack_from('!{}H'.format(count), data, pos + 2))
+    return formats, values
+
+
+def row_description(*oids):
+    data = pack('!HI', len(oids), 0)
+    for i, oid in enumerate(oids):
+        data += b'col%d\x00' % i + pack('!QH', 0, i + 1) + pack('!BIhHHiH', 0, oid, 8, 1, 0, -1, 0)
+    return RowDescription(data, False)
+
+
+class BindTestCase(VerticaPythonUnitTestCase):
+    def test_binary_parameters(self):
+        ctx = {'unicode_error': 'strict', 'session_tz': 'UTC', 'timestamptz_output': 'utc'}
+        oids = [VerticaType.BOOL, VerticaType.INT8, VerticaType.FLOAT8, VerticaType.DATE,
+                VerticaType.TIMESTAMP, VerticaType.TIMESTAMPTZ, VerticaType.UUID]
+        values = [True, -2 ** 63, 1.5, date(1999, 12, 31), datetime(2024, 2, 29, 1, 2, 3, 456789),
+                  datetime(1970, 1, 1, tzinfo=timezone.utc), UUID('12345678-1234-5678-1234-567812345678')]
+        formats, raw = parse_bind(Bind('', 's0', values, oids, False, True))
+        self.assertEqual(formats, [1] * len(oids))
+        loaders = [load_bool_binary, load_int8_binary, load_float8_binary, load_date_binary,
+                   load_timestamp_binary, load_timestamptz_binary, load_uuid_binary]
+        for load, value, data in zip(loaders, values, raw):
+            self.assertEqual(load(data, ctx), value)
+
+    def test_text_fallback(self):
+        oids = [VerticaType.BOOL, VerticaType.INT8, VerticaType.INT8, VerticaType.FLOAT8,
+                VerticaType.TIMESTAMPTZ, VerticaType.NUMERIC, VerticaType.VARCHAR, VerticaType.INT8]
+        values = ['yes', 2 ** 63, '7', 2, datetime(2024, 1, 1), Decimal('1.5'), 'a', None]
+        formats, raw = parse_bind(Bind('', 's0', values, oids, False, True))
+        self.assertEqual(formats, [])
+        self.assertEqual(raw, [b'1', b'9223372036854775808', b'7', b'2',
+                               b'2024-01-01 00:00:00', b'1.5', b'a', None])
+
+        values = [False, 1, 1, 2.5, datetime(2024, 1, 1, tzinfo=timezone.utc), 1, 'a', None]
+        formats, raw = parse_bind(Bind('', 's0', values, oids, False, True))
+        self.assertEqual(formats, [1, 1, 1, 1, 1, 0, 0, 0])
+        formats, raw = parse_bind(Bind('', 's0', values, oids, False, False))
+        self.assertEqual(formats, [])
+
+
+class ResultFormatTestCase(VerticaPythonUnitTestCase):
+    def test_bind_result_formats(self):
+        def result_formats(binary_transfer, codes):
+            return parse_bind(Bind('', 's0', [], [], binary_transfer, False, codes), results=True)
+        self.assertEqual(result_formats(False, None), [])
+        self.assertEqual(result_formats(True, None), [1])
+        self.assertEqual(result_formats(True, [0, 0]), [])
+        self.assertEqual(result_formats(False, [1, 1]), [1])
+        self.assertEqual(result_formats(False, [1, 0, 1]), [1, 0, 1])
+        self.assertEqual(result_formats(True, []), [])
+
+    def test_row_description_formats(self):
+        desc = row_description(VerticaType.INT8, VerticaType.VARCHAR)
+        self.assertIs(desc.with_format_codes([0, 0]), desc)
+        variant = desc.with_format_codes([FormatCode.BINARY, FormatCode.TEXT])
+        self.assertIs(desc.with_format_codes((1, 0)), variant)
+        self.assertEqual([col.format_code for col in variant.get_description()], [1, 0])
+        self.assertEqual([col.format_code for col in desc.get_description()], [0, 0])
+        self.assertEqual(variant.get_description()[0].name, 'col0')
+        self.assertEqual(variant.row_decoders, {})
@@ -0,0 +1,50 @@
+# Copyright (c) 2024 Open Text.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+from .base import VerticaPythonUnitTestCase
+from ...vertica.cache import CacheInfo, LRUCache
+
+
+class LRUCacheTestCase(VerticaPythonUnitTestCase):
+    def test_eviction_order(self):
+        cache = LRUCache(2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        self.assertEqual(cache.get('a'), 1)  # 'b' is now the least recently used
+        cache.put('c', 3)
+        self.assertNotIn('b', cache)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('c'), 3)
+        self.assertEqual(cache.info(), CacheInfo(hits=2, misses=1, evictions=1, maxsize=2, currsize=2))
+
+    def test_evict(self):
+        cache = LRUCache(2)
+        self.assertRaises(KeyError, cache.evict)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        self.assertEqual(cache.evict(), ('b', 2))
+        self.assertEqual(list(cache.values()), [1])
+        self.assertEqual(cache.info(), CacheInfo(hits=1, misses=0, evictions=1, maxsize=2, currsize=1))
+
+    def test_zero_size(self):
+        cache = LRUCache(0)
+        cache.put('a', 1)
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.info(), CacheInfo(hits=0, misses=1, evictions=0, maxsize=0, currsize=0))
+
+    def test_invalid_size(self):
+        self.assertRaises(ValueError, LRUCache, -1)
@@ -0,0 +1,72 @@
+# Copyright (c) 2024 Open Text.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+from io import BytesIO
+
+from .base import VerticaPythonUnitTestCase
+from .test_deserializer import make_column
+from ...datatypes import VerticaType
+from ...vertica.cellstream import CellStream, VarbinaryUnescaper
+from ...vertica.column import FormatCode
+from ...vertica.row import LazyRow, LazyRowLayout
+
+
+def chunked(data, size):
+    return [memoryview(data)[i:i + size] for i in range(0, len(data), size)]
+
+
+class CellStreamTestCase(VerticaPythonUnitTestCase):
+    RAW = b'\\\\\x01a\\' * 3 + bytes(range(256))
+    TEXT = b''.join(b'\\\\' if x == 92 else bytes([x]) if 32 <= x < 127 else b'\\%03o' % x
+                    for x in RAW)
+
+    def test_unescape_chunks(self):
+        # Escapes split at every position
+        for size in range(1, 9):
+            f = BytesIO()
+            writer = VarbinaryUnescaper(f)
+            for chunk in chunked(self.TEXT, size):
+                writer.write(chunk)
+            writer.close()
+            self.assertEqual(f.getvalue(), self.RAW, size)
+
+    def test_read_cell(self):
+        columns = [make_column('a', VerticaType.INT8), make_column('b', VerticaType.LONGVARBINARY),
+                   make_column('c', VerticaType.LONGVARBINARY, FormatCode.BINARY),
+                   make_column('d', VerticaType.LONGVARCHAR)]
+        stream = CellStream(columns, 4)
+        self.assertEqual(stream.positions, {1, 2, 3})
+        with stream.read_cell(1, chunked(self.TEXT, 5)) as f:
+            self.assertEqual(f.read(), self.RAW)
+        with stream.read_cell(2, chunked(self.TEXT, 5)) as f:
+            self.assertEqual(f.read(), self.TEXT)
+
+        sinks = []
+        def sink(col):
+            sinks.append((col.name, BytesIO()))
+            return sinks[-1][1]
+        stream = CellStream(columns, 4, sink)
+        f = stream.read_cell(3, chunked('été'.encode(), 2))
+        self.assertEqual(sinks, [('d', f)])
+        self.assertEqual(f.getvalue().decode(), 'été')
+
+    def test_lazy_row(self):
+        f = BytesIO(b'large')
+        layout = LazyRowLayout([int, bytes.decode], {'id': 0, 'doc': 1})
+        row = LazyRow([b'1', None], layout, cells={1: f})
+        self.assertEqual(row.id, 1)
+        self.assertIs(row.doc, f)
+        self.assertIsNone(row.raw('doc'))
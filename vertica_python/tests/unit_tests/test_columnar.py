@@ -0,0 +1,203 @@
+# Copyright (c) 2024 Open Text.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import unittest
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from struct import pack
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+try:
+    import pandas
+except ImportError:
+    pandas = None
+
+from .base import VerticaPythonUnitTestCase
+from .test_deserializer import make_column
+from ...datatypes import VerticaType
+from ...vertica.column import FormatCode
+from ...vertica.columnar import (ColumnConverter, DataFrameBuilder, arrow_record_batch,
+                                 arrow_table, numpy_columns)
+
+
+@unittest.skipIf(numpy is None, 'NumPy is not installed')
+class NumpyColumnsTestCase(VerticaPythonUnitTestCase):
+    CONTEXT = {'unicode_error': 'strict', 'session_tz': 'UTC', 'complex_types_enabled': False}
+
+    def _converters(self, columns, custom_converters=None):
+        return [ColumnConverter(col, custom_converters or {}, self.CONTEXT) for col in columns]
+
+    def test_binary_columns(self):
+        columns = [make_column('i', VerticaType.INT8, FormatCode.BINARY),
+                   make_column('f', VerticaType.FLOAT8, FormatCode.BINARY),
+                   make_column('b', VerticaType.BOOL, FormatCode.BINARY),
+                   make_column('d', VerticaType.DATE, FormatCode.BINARY),
+                   make_column('ts', VerticaType.TIMESTAMP, FormatCode.BINARY),
+                   make_column('s', VerticaType.VARCHAR, FormatCode.BINARY)]
+        rows = [[pack('!q', -7), pack('!d', 0.5), b'\x01', pack('!q', 2451545), pack('!q', 1), b'a'],
+                [None, None, None, None, None, None]]
+        result = numpy_columns(self._converters(columns), rows)
+        self.assertEqual([a.dtype.name for a in result.values()],
+                         ['int64', 'float64', 'bool', 'datetime64[D]', 'datetime64[us]', 'object'])
+        self.assertEqual(result['i'].tolist(), [-7, None])
+        self.assertEqual(result['f'].tolist(), [0.5, None])
+        self.assertEqual(result['b'].tolist(), [True, None])
+        self.assertEqual(result['d'].tolist(), [date(2000, 1, 1), None])
+        self.assertEqual(result['ts'].tolist(), [datetime(2000, 1, 1, microsecond=1), None])
+        self.assertEqual(result['s'].tolist(), ['a', None])
+
+    def test_text_columns(self):
+        columns = [make_column('i', VerticaType.INT8), make_column('d', VerticaType.DATE),
+                   make_column('tz', VerticaType.TIMESTAMPTZ)]
+        rows = [[b'42', b'2000-01-01', b'2000-01-01 01:00:00+01'], [None, None, None]]
+        result = numpy_columns(self._converters(columns), rows)
+        self.assertEqual(result['i'].tolist(), [42, None])
+        self.assertEqual(result['d'].tolist(), [date(2000, 1, 1), None])
+        self.assertEqual(result['tz'].tolist(), [datetime(2000, 1, 1), None])
+
+    def test_text_intervals(self):
+        columns = [make_column('iv', VerticaType.INTERVAL, type_name='Interval Day to Second'),
+                   make_column('ym', VerticaType.INTERVALYM, type_name='Interval Year to Month')]
+        rows = [[b'1 00:00:01.5', b'1-02'], [None, None]]
+        result = numpy_columns(self._converters(columns), rows)
+        self.assertEqual(result['iv'].tolist(), [timedelta(days=1, seconds=1, microseconds=500000), None])
+        self.assertEqual(result['ym'].dtype, numpy.dtype('timedelta64[M]'))
+        self.assertEqual(result['ym'].data.view('int64')[0], 14)
+
+    def test_numeric_output(self):
+        columns = [make_column('n', VerticaType.NUMERIC, FormatCode.BINARY, (18 << 16 | 2) + 4),
+                   make_column('t', VerticaType.NUMERIC, FormatCode.TEXT, (10 << 16 | 2) + 4),
+                   make_column('w', VerticaType.NUMERIC, FormatCode.BINARY, (30 << 16 | 2) + 4)]
+        rows = [[pack('!q', -12345), b'1.50', (10**25).to_bytes(16, 'big', signed=True)],
+                [None, None, None]]
+        context = dict(self.CONTEXT, numeric_output='scaled_int')
+        result = numpy_columns([ColumnConverter(col, {}, context) for col in columns], rows)
+        self.assertEqual([a.dtype.name for a in result.values()], ['int64', 'int64', 'object'])
+        self.assertEqual(result['n'].tolist(), [-12345, None])
+        self.assertEqual(result['t'].tolist(), [150, None])
+        self.assertEqual(result['w'].tolist(), [10**25, None])
+        context = dict(self.CONTEXT, numeric_output='float')
+        result = numpy_columns([ColumnConverter(col, {}, context) for col in columns], rows)
+        self.assertEqual([a.dtype.name for a in result.values()], ['float64'] * 3)
+        self.assertEqual(result['n'].tolist(), [-123.45, None])
+        self.assertEqual(result['t'].tolist(), [1.5, None])
+
+    def test_empty(self):
+        columns = [make_column('i', VerticaType.INT8, FormatCode.BINARY),
+                   make_column('iv', VerticaType.INTERVAL, FormatCode.BINARY)]
+        result = numpy_columns(self._converters(columns), [])
+        self.assertEqual(result['i'].dtype.name, 'int64')
+        self.assertEqual(result['iv'].dtype, numpy.dtype('timedelta64[us]'))
+        self.assertEqual(len(result['iv']), 0)
+
+    def test_custom_converter(self):
+        columns = [make_column('i', VerticaType.INT8, FormatCode.BINARY)]
+        converters = self._converters(columns, {VerticaType.INT8: lambda val, ctx: timedelta(len(val))})
+        result = numpy_columns(converters, [[pack('!q', 1)]])
+        self.assertEqual(result['i'].dtype, object)
+        self.assertEqual(result['i'].tolist(), [timedelta(8)])
+
+
+@unittest.skipIf(numpy is None or pyarrow is None, 'NumPy or pyarrow is not installed')
+class ArrowRecordBatchTestCase(VerticaPythonUnitTestCase):
+    CONTEXT = {'unicode_error': 'strict', 'session_tz': 'UTC', 'complex_types_enabled': False}
+
+    def _converters(self, columns, custom_converters=None):
+        return [ColumnConverter(col, custom_converters or {}, self.CONTEXT) for col in columns]
+
+    def test_schema(self):
+        columns = [make_column('i', VerticaType.INT8, FormatCode.BINARY),
+                   make_column('n', VerticaType.NUMERIC, type_modifier=(10 << 16 | 2) + 4),
+                   make_column('tz', VerticaType.TIMESTAMPTZ, FormatCode.BINARY),
+                   make_column('s', VerticaType.VARCHAR),
+                   make_column('l', VerticaType.LONGVARCHAR)]
+        rows = [[pack('!q', 1), b'-1.50', pack('!q', 0), b'\xc3\xa9', b'x'],
+                [None, None, None, None, None]]
+        batch = arrow_record_batch(self._converters(columns), rows)
+        self.assertEqual(batch.schema.types,
+                         [pyarrow.int64(), pyarrow.decimal128(10, 2), pyarrow.timestamp('us', tz='UTC'),
+                          pyarrow.string(), pyarrow.large_string()])
+        self.assertEqual(batch.to_pylist()[0],
+                         {'i': 1, 'n': Decimal('-1.50'), 'tz': datetime(2000, 1, 1, tzinfo=timezone.utc),
+                          's': 'é', 'l': 'x'})
+        self.assertEqual(batch.to_pylist()[1], dict.fromkeys(['i', 'n', 'tz', 's', 'l']))
+
+    def test_dictionary_encode(self):
+        converters = self._converters([make_column('s', VerticaType.VARCHAR)])
+        batches = [arrow_record_batch(converters, [[b'a'], [b'b'], [b'a']], True),
+                   arrow_record_batch(converters, [[b'c'], [None]], True)]
+        table = arrow_table(converters, batches, True)
+        self.assertEqual(table.schema.types, [pyarrow.dictionary(pyarrow.int32(), pyarrow.string())])
+        self.assertEqual(table.column('s').to_pylist(), ['a', 'b', 'a', 'c', None])
+
+    def test_inferred_types(self):
+        # The types of the batches are promoted to a common type
+        converters = self._converters([make_column('n', VerticaType.VARCHAR)],
+                                      {VerticaType.VARCHAR: lambda val, ctx: Decimal(val.decode())})
+        values = [[None, None], [b'1.5'], [b'12345.678', None]]
+        batches = [arrow_record_batch(converters, [[v] for v in batch]) for batch in values]
+        self.assertEqual([b.schema.types[0] for b in batches],
+                         [pyarrow.null(), pyarrow.decimal128(2, 1), pyarrow.decimal128(8, 3)])
+        table = arrow_table(converters, batches)
+        self.assertEqual(table.schema.types, [pyarrow.decimal128(8, 3)])
+        self.assertEqual(table.column('n').to_pylist(),
+                         [None, None, Decimal('1.5'), Decimal('12345.678'), None])
+
+        # A column of NULL values only
+        batches = [arrow_record_batch(converters, [[None]]), arrow_record_batch(converters, [[None]])]
+        self.assertEqual(arrow_table(converters, batches).column('n').to_pylist(), [None, None])
+
+    def test_empty_table(self):
+        converters = self._converters([make_column('d', VerticaType.DATE)])
+        table = arrow_table(converters, [])
+        self.assertEqual(table.num_rows, 0)
+        self.assertEqual(table.schema.types, [pyarrow.date32()])
+
+
+@unittest.skipIf(numpy is None or pandas is None, 'NumPy or pandas is not installed')
+class DataFrameBuilderTestCase(VerticaPythonUnitTestCase):
+    CONTEXT = {'unicode_error': 'strict', 'session_tz': 'UTC', 'complex_types_enabled': False}
+
+    def test_dtypes(self):
+        columns = [make_column('i', VerticaType.INT8, FormatCode.BINARY),
+                   make_column('f', VerticaType.FLOAT8),
+                   make_column('b', VerticaType.BOOL),
+                   make_column('tz', VerticaType.TIMESTAMPTZ, FormatCode.BINARY),
+                   make_column('s', VerticaType.VARCHAR),
+                   make_column('s', VerticaType.UUID)]
+        builder = DataFrameBuilder([ColumnConverter(col, {}, self.CONTEXT) for col in columns])
+        builder.append([[pack('!q', 3), b'2.5', b't', pack('!q', 0), b'a',
+                         b'00010203-0405-0607-0809-0a0b0c0d0e0f']])
+        builder.append([[None, None, None, None, None, None]])
+        df = builder.build()
+        self.assertEqual(list(df.columns), ['i', 'f', 'b', 'tz', 's', 's'])
+        self.assertEqual([str(t) for t in df.dtypes],
+                         ['Int64', 'float64', 'boolean', 'datetime64[us, UTC]', 'string', 'object'])
+        self.assertEqual(df.iloc[0, 0], 3)
+        self.assertEqual(df.iloc[0, 3], pandas.Timestamp('2000-01-01', tz='UTC'))
+        self.assertTrue(df.iloc[1, :5].isna().all())
+        self.assertIsNone(df.iloc[1, 5])
+        # the builder is reset after build()
+        self.assertEqual(len(builder.build()), 0)
@@ -0,0 +1,72 @@
+# Copyright (c) 2024 Open Text.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import logging
+
+import mock
+
+from .base import VerticaPythonUnitTestCase
+from ... import errors
+from ...vertica import messages
+from ...vertica.connection import Connection
+
+
+class CorkTestCase(VerticaPythonUnitTestCase):
+    def make_connection(self):
+        with mock.patch.object(Connection, '__init__', return_value=None):
+            conn = Connection()
+        conn._logger = logging.getLogger('vertica')
+        conn._write_buffer = None
+        conn.socket = mock.Mock()
+        conn.close_socket = mock.Mock()
+        return conn
+
+    def test_send_on_exit(self):
+        conn = self.make_connection()
+        with conn.corked():
+            with conn.corked():
+                conn.write(messages.Sync())
+            conn.write(messages.Flush())
+            conn.socket.sendall.assert_not_called()
+        conn.socket.sendall.assert_called_once_with(bytearray(b'S\x00\x00\x00\x04H\x00\x00\x00\x04'))
+        self.assertIsNone(conn._write_buffer)
+
+    def test_error_in_context(self):
+        # The messages written before the error are sent
+        conn = self.make_connection()
+        with self.assertRaises(KeyError):
+            with conn.corked():
+                conn.write(messages.Sync())
+                raise KeyError('error in context')
+        conn.socket.sendall.assert_called_once_with(bytearray(b'S\x00\x00\x00\x04'))
+        self.assertIsNone(conn._write_buffer)
+
+        # A failure to send them does not replace the error
+        conn = self.make_connection()
+        conn.socket.sendall.side_effect = OSError('broken pipe')
+        with self.assertRaises(KeyError):
+            with conn.corked():
+                conn.write(messages.Sync())
+                raise KeyError('error in context')
+        conn.close_socket.assert_called_once_with()
+
+        # Without an error in the context, the send failure is raised
+        conn = self.make_connection()
+        conn.socket.sendall.side_effect = OSError('broken pipe')
+        with self.assertRaises(errors.ConnectionError):
+            with conn.corked():
+                conn.write(messages.Sync())
+        self.assertIsNone(conn._write_buffer)
@@ -0,0 +1,316 @@
+# Copyright (c) 2024 Open Text.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+from datetime import date, datetime, time, timedelta
+from dateutil.relativedelta import relativedelta
+from decimal import Decimal
+from struct import pack
+import unittest
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from .base import VerticaPythonUnitTestCase
+from ... import errors
+from ...datatypes import VerticaType
+from ...vertica.column import Column, FormatCode
+from ...vertica.deserializer import (MEMO_SAMPLE_ROWS, Deserializer, get_session_timezone,
+                                     load_array_text, load_date_binary, load_date_text, load_numeric_float,
+                                     load_numeric_scaled_int, load_time_text, load_timestamp_binary,
+                                     load_timestamp_text, load_row_text,
+                                     load_varbinary_text, loads_json, unescape_varbinary)
+
+
+def make_column(name, type_code, format_code=FormatCode.TEXT, type_modifier=-1, type_name=''):
+    return Column({'name': name, 'data_type_oid': type_code, 'data_type_name': type_name,
+                   'table_oid': 0, 'schema_name': None, 'table_name': None,
+                   'attribute_number': 1, 'type_modifier': type_modifier,
+                   'data_type_size': 8, 'null_ok': True, 'is_identity': False,
+                   'format_code': format_code})
+
+
+class RowDecoderTestCase(VerticaPythonUnitTestCase):
+    CONTEXT = {'unicode_error': 'strict', 'session_tz': 'UTC', 'complex_types_enabled': False}
+
+    def test_text_row(self):
+        columns = [make_column('a', VerticaType.INT8), make_column('b', VerticaType.VARCHAR),
+                   make_column('c', VerticaType.BOOL), make_column('d', VerticaType.FLOAT8),
+                   make_column('e', VerticaType.DATE), make_column('f', VerticaType.UNKNOWN)]
+        decode = Deserializer().get_row_decoder(columns, {}, self.CONTEXT)
+        self.assertEqual(decode([b'-12', b'\xc3\xa9t\xc3\xa9', b't', b'1.5', b'2024-02-29', b'raw']),
+                         [-12, 'été', True, 1.5, date(2024, 2, 29), b'raw'])
+        self.assertEqual(decode([None] * 6), [None] * 6)
+
+    def test_binary_row(self):
+        columns = [make_column('a', VerticaType.INT8, FormatCode.BINARY),
+                   make_column('b', VerticaType.FLOAT8, FormatCode.BINARY),
+                   make_column('c', VerticaType.BOOL, FormatCode.BINARY),
+                   make_column('d', VerticaType.NUMERIC, FormatCode.BINARY, (10 << 16 | 2) + 4)]
+        decode = Deserializer().get_row_decoder(columns, {}, self.CONTEXT)
+        self.assertEqual(decode([pack('!q', -2**63), pack('!d', -0.25), b'\x00', pack('!q', 12345)]),
+                         [-2**63, -0.25, False, Decimal('123.45')])
+
+    def test_custom_converter(self):
+        columns = [make_column('a', VerticaType.INT8), make_column('b', VerticaType.VARCHAR)]
+        converters = {VerticaType.INT8: lambda val, ctx: (ctx['column'].name, int(val) * 2)}
+        decode = Deserializer().get_row_decoder(columns, converters, self.CONTEXT)
+        self.assertEqual(decode([b'21', b'x']), [('a', 42), 'x'])
+
+    def test_column_converters(self):
+        columns = [make_column('a', VerticaType.INT8), make_column('b', VerticaType.VARCHAR),
+                   make_column('c', VerticaType.INT8)]
+        converters = {VerticaType.INT8: lambda val, ctx: int(val) * 2}
+        column_converters = {0: None, 1: lambda val, ctx: (ctx['column'].name, val.upper())}
+        decode = Deserializer().get_row_decoder(columns, converters, self.CONTEXT, column_converters)
+        self.assertEqual(decode([b'1', b'x', b'3']), [b'1', ('b', b'X'), 6])
+        self.assertEqual(decode([None, None, None]), [None, None, None])
+
+    def test_decode_cache(self):
+        columns = [make_column('a', VerticaType.VARCHAR), make_column('b', VerticaType.DATE)]
+        context = dict(self.CONTEXT, decode_cache_size=8)
+        decode = Deserializer().get_row_decoder(columns, {}, context)
+        first = decode([b'same', b'2024-01-01'])
+        second = decode([b'same', b'2024-01-01'])
+        self.assertEqual(first, ['same', date(2024, 1, 1)])
+        self.assertIs(first[0], second[0])
+        self.assertIs(first[1], second[1])
+        # the memo of a column with mostly distinct values is dropped
+        rows = [[str(i).encode(), b'2024-01-01'] for i in range(MEMO_SAMPLE_ROWS)]
+        self.assertEqual([row[0] for row in map(decode, rows)], [str(i) for i in range(MEMO_SAMPLE_ROWS)])
+        self.assertIsNot(decode([b'same', b'2024-01-01'])[0], first[0])
+        self.assertIs(decode([b'same', b'2024-01-01'])[1], first[1])
+
+    def test_unicode_error(self):
+        columns = [make_column('a', VerticaType.VARCHAR)]
+        context = dict(self.CONTEXT, unicode_error='replace')
+        decode = Deserializer().get_row_decoder(columns, {}, context)
+        self.assertEqual(decode([b'\xff']), ['�'])
+
+    def test_no_columns(self):
+        self.assertEqual(Deserializer().get_row_decoder([], {}, self.CONTEXT)([]), [])
+
+
+class TextTemporalTestCase(VerticaPythonUnitTestCase):
+    def test_date(self):
+        self.assertEqual(load_date_text(b'2024-02-29', {}), date(2024, 2, 29))
+        self.assertRaises(errors.NotSupportedError, load_date_text, b'0044-03-15 BC', {})
+        self.assertRaises(errors.NotSupportedError, load_date_text, b'10000-01-01', {})
+
+    def test_time(self):
+        self.assertEqual(load_time_text(b'23:59:59', {}), time(23, 59, 59))
+        self.assertEqual(load_time_text(b'23:59:59.123456', {}), time(23, 59, 59, 123456))
+        self.assertEqual(load_time_text(b'23:59:59.05', {}), time(23, 59, 59, 50000))
+
+    def test_timestamp(self):
+        self.assertEqual(load_timestamp_text(b'2024-02-29 01:02:03', {}),
+                         datetime(2024, 2, 29, 1, 2, 3))
+        self.assertEqual(load_timestamp_text(b'2024-02-29 01:02:03.000123', {}),
+                         datetime(2024, 2, 29, 1, 2, 3, 123))
+        self.assertEqual(load_timestamp_text(b'2024-02-29 01:02:03.5', {}),
+                         datetime(2024, 2, 29, 1, 2, 3, 500000))
+        for value in (b'0044-03-15 12:00:00 BC', b'10000-01-01 00:00:00',
+                      b'10000-01-01 00:00:00.5', b'10000-01-01 00:00:00.12345'):
+            self.assertRaises(errors.NotSupportedError, load_timestamp_text, value, {})
+
+
+class BinaryTemporalTestCase(VerticaPythonUnitTestCase):
+    def test_date(self):
+        columns = [make_column('a', VerticaType.DATE, FormatCode.BINARY)]
+        decode = Deserializer().get_row_decoder(columns, {}, {'unicode_error': 'strict'})
+        self.assertEqual(decode([pack('!q', 2460370)]), [date(2024, 2, 29)])
+        self.assertEqual(load_date_binary(pack('!q', 1721426), {}), date(1, 1, 1))
+        for jdn in (1721425, 5373485, 2 ** 62, -2 ** 62, 2 ** 63 - 1, -2 ** 63):
+            self.assertRaises(errors.NotSupportedError, load_date_binary, pack('!q', jdn), {})
+
+    def test_timestamp(self):
+        columns = [make_column('a', VerticaType.TIMESTAMP, FormatCode.BINARY)]
+        decode = Deserializer().get_row_decoder(columns, {}, {'unicode_error': 'strict'})
+        self.assertEqual(decode([pack('!q', -1)]), [datetime(1999, 12, 31, 23, 59, 59, 999999)])
+        self.assertEqual(load_timestamp_binary(pack('!q', 762483723000123), {}),
+                         datetime(2024, 2, 29, 1, 2, 3, 123))
+        for micros in (-63082281600000001, 252455616000000000, 2 ** 63 - 1, -2 ** 63):
+            self.assertRaises(errors.NotSupportedError, load_timestamp_binary, pack('!q', micros), {})
+
+
+class VarbinaryTestCase(VerticaPythonUnitTestCase):
+    RAW = bytes(range(256)) + b'\\\\abc'
+    TEXT = b''.join(b'\\\\' if x == 92 else bytes([x]) if 32 <= x < 127 else b'\\%03o' % x
+                    for x in RAW)
+
+    def test_unescape(self):
+        self.assertEqual(load_varbinary_text(self.TEXT, {}), self.RAW)
+        self.assertEqual(load_varbinary_text(b'plain', {}), b'plain')
+        self.assertEqual(load_varbinary_text(b'', {}), b'')
+
+    def test_unescape_into_buffer(self):
+        buffer = bytearray()
+        with unescape_varbinary(self.TEXT, buffer) as view:
+            self.assertEqual(view, self.RAW)
+        with unescape_varbinary(b'\\001\\\\', buffer) as view:
+            self.assertEqual(view.tobytes(), b'\x01\\')
+        with unescape_varbinary(b'plain', buffer) as view:
+            self.assertEqual(view.tobytes(), b'plain')
+        # Escapes across chunk boundaries
+        for n in (255, 256, 257):
+            with unescape_varbinary(self.TEXT * n, buffer) as view:
+                self.assertEqual(view, self.RAW * n)
+
+
+class NumericTestCase(VerticaPythonUnitTestCase):
+    CONTEXT = {'unicode_error': 'strict', 'session_tz': 'UTC', 'complex_types_enabled': False}
+
+    def decode(self, format_code, values, output, column_converters=None):
+        columns = [make_column('a', VerticaType.NUMERIC, format_code, (12 << 16 | 3) + 4)]
+        context = dict(self.CONTEXT, numeric_output=output)
+        decode = Deserializer().get_row_decoder(columns, {}, context, column_converters)
+        return [decode([v])[0] for v in values]
+
+    def test_output(self):
+        text = [b'-1.250', b'0.000', b'123456789.001']
+        binary = [pack('!q', -1250), pack('!q', 0), pack('!q', 123456789001)]
+        for format_code, values in ((FormatCode.TEXT, text), (FormatCode.BINARY, binary)):
+            self.assertEqual([str(v) for v in self.decode(format_code, values, 'decimal')],
+                             ['-1.250', '0.000', '123456789.001'])
+            self.assertEqual(self.decode(format_code, values, 'float'), [-1.25, 0.0, 123456789.001])
+            self.assertEqual(self.decode(format_code, values, 'scaled_int'), [-1250, 0, 123456789001])
+
+    def test_column_converters(self):
+        for format_code, value in ((FormatCode.TEXT, b'-1.250'), (FormatCode.BINARY, pack('!q', -1250))):
+            self.assertEqual(self.decode(format_code, [value], 'decimal', {0: load_numeric_float}), [-1.25])
+            self.assertEqual(self.decode(format_code, [value], 'decimal', {0: load_numeric_scaled_int}), [-1250])
+
+
+class IntervalTestCase(VerticaPythonUnitTestCase):
+    CONTEXT = {'unicode_error': 'strict', 'session_tz': 'UTC', 'complex_types_enabled': False}
+
+    def decode(self, type_code, type_name, format_code, value, output):
+        columns = [make_column('a', type_code, format_code, type_name=type_name)]
+        context = dict(self.CONTEXT, interval_output=output)
+        return Deserializer().get_row_decoder(columns, {}, context)([value])[0]
+
+    def test_day_time(self):
+        micros = -((1 * 24 + 2) * 3600 + 3 * 60 + 4) * 1000000 - 500000
+        for format_code, value in ((FormatCode.TEXT, b'-1 02:03:04.5'), (FormatCode.BINARY, pack('!q', micros))):
+            self.assertEqual(self.decode(VerticaType.INTERVAL, 'Interval Day to Second', format_code, value, 'relativedelta'),
+                             relativedelta(days=-1, hours=-2, minutes=-3, seconds=-4, microseconds=-500000))
+            self.assertEqual(self.decode(VerticaType.INTERVAL, 'Interval Day to Second', format_code, value, 'timedelta'),
+                             timedelta(microseconds=micros))
+            self.assertEqual(self.decode(VerticaType.INTERVAL, 'Interval Day to Second', format_code, value, 'microseconds'),
+                             micros)
+        self.assertEqual(self.decode(VerticaType.INTERVAL, 'Interval Minute to Second', FormatCode.TEXT, b'90:30', 'microseconds'),
+                         (90 * 60 + 30) * 1000000)
+
+    def test_year_month(self):
+        for format_code, value in ((FormatCode.TEXT, b'-2-03'), (FormatCode.BINARY, pack('!q', -27))):
+            self.assertEqual(self.decode(VerticaType.INTERVALYM, 'Interval Year to Month', format_code, value, 'relativedelta'),
+                             relativedelta(years=-2, months=-3))
+            for output in ('timedelta', 'microseconds'):
+                self.assertEqual(self.decode(VerticaType.INTERVALYM, 'Interval Year to Month', format_code, value, output), -27)
+        self.assertEqual(self.decode(VerticaType.INTERVALYM, 'Interval Year', FormatCode.TEXT, b'3', 'timedelta'), 36)
+
+
+class TimestampTzTestCase(VerticaPythonUnitTestCase):
+    CONTEXT = {'unicode_error': 'strict', 'session_tz': '+02:00', 'complex_types_enabled': False}
+    # 2024-05-01 10:00:00.5 UTC
+    MICROSECONDS = 1714557600500000
+
+    def decode(self, format_code, value, output):
+        columns = [make_column('a', VerticaType.TIMESTAMPTZ, format_code)]
+        context = dict(self.CONTEXT, timestamptz_output=output)
+        return Deserializer().get_row_decoder(columns, {}, context)([value])[0]
+
+    def test_session_timezone(self):
+        self.assertEqual(get_session_timezone('+02:00').utcoffset(None), timedelta(hours=2))
+        self.assertIs(get_session_timezone('+02:00'), get_session_timezone('+02:00'))
+
+    def test_output(self):
+        binary = pack('!q', self.MICROSECONDS - 946684800000000)
+        text = b'2024-05-01 12:00:00.5+02'
+        for format_code, value in ((FormatCode.BINARY, binary), (FormatCode.TEXT, text)):
+            ts = self.decode(format_code, value, 'session')
+            self.assertEqual(ts.replace(tzinfo=None), datetime(2024, 5, 1, 12, 0, 0, 500000))
+            self.assertEqual(ts.utcoffset(), timedelta(hours=2))
+            ts = self.decode(format_code, value, 'utc')
+            self.assertEqual(ts.replace(tzinfo=None), datetime(2024, 5, 1, 10, 0, 0, 500000))
+            self.assertEqual(ts.utcoffset(), timedelta(0))
+            self.assertEqual(self.decode(format_code, value, 'microseconds'), self.MICROSECONDS)
+
+
+class ComplexTypeTestCase(VerticaPythonUnitTestCase):
+    CONTEXT = {'unicode_error': 'strict', 'session_tz': 'UTC', 'complex_types_enabled': True}
+
+    @staticmethod
+    def make_complex_column(name, type_code, *children):
+        col = make_column(name, type_code)
+        for child in children:
+            col.add_child_column(child)
+        return col
+
+    def decode(self, col, value, **options):
+        context = dict(self.CONTEXT, **options)
+        return Deserializer().get_row_decoder([col], {}, context)([value])[0]
+
+    def test_nested(self):
+        col = self.make_complex_column('r', VerticaType.ROW,
+            make_column('id', VerticaType.INT8),
+            make_column('d', VerticaType.DATE),
+            make_column('n', VerticaType.NUMERIC, type_modifier=(10 << 16 | 2) + 4),
+            self.make_complex_column('a', VerticaType.ARRAY,
+                self.make_complex_column('', VerticaType.ARRAY, make_column('', VerticaType.FLOAT8))))
+        value = b'{"id":1,"d":"2024-02-29","n":1.25,"a":[[1.5,"Infinity",null],null]}'
+        expected = {'id': 1, 'd': date(2024, 2, 29), 'n': Decimal(1.25),
+                    'a': [[1.5, float('inf'), None], None]}
+        self.assertEqual(self.decode(col, value), expected)
+        # Same result as the converter that walks the column hierarchy per value
+        self.assertEqual(load_row_text(value, dict(self.CONTEXT, column=col)), expected)
+        self.assertEqual(self.decode(col, value, numeric_output='scaled_int')['n'], 125)
+        self.assertEqual(self.decode(col, b'{"id":1,"d":null,"n":null,"a":[]}'),
+                         {'id': 1, 'd': None, 'n': None, 'a': []})
+        self.assertRaises(TypeError, self.decode, col, b'[]')
+
+    def test_array_and_set(self):
+        array = self.make_complex_column('a', VerticaType.ARRAY1D_DATE, make_column('', VerticaType.DATE))
+        value = b'["2024-02-29",null,"2024-02-29"]'
+        self.assertEqual(self.decode(array, value), [date(2024, 2, 29), None, date(2024, 2, 29)])
+        self.assertEqual(load_array_text(value, dict(self.CONTEXT, column=array)),
+                         [date(2024, 2, 29), None, date(2024, 2, 29)])
+        self.assertEqual(self.decode(array, value, complex_types_enabled=False), value.decode())
+        varchars = self.make_complex_column('s', VerticaType.SET_VARCHAR, make_column('', VerticaType.VARCHAR))
+        self.assertEqual(self.decode(varchars, b'["a","\\u00e9"]'), {'a', '\u00e9'})
+
+    def test_loads_json(self):
+        # Values that not every JSON parser accepts
+        self.assertEqual(loads_json(b'[18446744073709551616,null]', 'strict'), [2**64, None])
+        self.assertTrue(numpy is None or numpy.isnan(loads_json(b'[NaN]', 'strict')[0]))
+        self.assertEqual(loads_json(b'["\xff"]', 'replace'), ['\ufffd'])
+
+    @unittest.skipIf(numpy is None, 'NumPy is not installed')
+    def test_numpy_output(self):
+        ints = self.make_complex_column('a', VerticaType.ARRAY1D_INT8, make_column('', VerticaType.INT8))
+        arr = self.decode(ints, b'[1,null,3]', array_output='numpy')
+        self.assertEqual(arr.dtype, numpy.int64)
+        self.assertEqual(arr.tolist(), [1, None, 3])
+        arr = self.decode(ints, b'[1,2]', array_output='numpy')
+        self.assertEqual(arr.tolist(), [1, 2])
+        self.assertNotIsInstance(arr, numpy.ma.MaskedArray)
+        floats = self.make_complex_column('a', VerticaType.ARRAY1D_FLOAT8, make_column('', VerticaType.FLOAT8))
+        self.assertEqual(self.decode(floats, b'[1.5,"-Infinity"]', array_output='numpy').tolist(),
+                         [1.5, float('-inf')])
+        # Other arrays are lists
+        dates = self.make_complex_column('a', VerticaType.ARRAY1D_DATE, make_column('', VerticaType.DATE))
+        self.assertEqual(self.decode(dates, b'[]', array_output='numpy'), [])
@@ -64,19 +64,27 @@ class ParseDSNTestCase(VerticaPythonUnitTestCase):
     def test_boolean_arguments(self):
         dsn = ('vertica://mike@127.0.0.1/db1?connection_load_balance=True&'
                'use_prepared_statements=0&ssl=false&disable_copy_local=on&'
-               'autocommit=true&binary_transfer=1&request_complex_types=off')
+               'autocommit=true&binary_transfer=1&request_complex_types=off&'
+               'pipeline_prepared_statements=on&binary_parameters=true&'
+               'mixed_result_formats=on')
         expected = {'database': 'db1', 'connection_load_balance': True,
                     'use_prepared_statements': False,  'ssl': False,
                     'disable_copy_local': True, 'autocommit': True,
                     'binary_transfer': True, 'request_complex_types': False,
+                    'pipeline_prepared_statements': True, 'binary_parameters': True,
+                    'mixed_result_formats': True,
                     'host': '127.0.0.1', 'user': 'mike'}
         parsed = parse_dsn(dsn)
         self.assertDictEqual(expected, parsed)
 
     def test_numeric_arguments(self):
-        dsn = 'vertica://mike@127.0.0.1/db1?connection_timeout=1.5&log_level=10'
+        dsn = ('vertica://mike@127.0.0.1/db1?connection_timeout=1.5&log_level=10&'
+               'row_description_cache_size=16&decode_cache_size=256&drain_cancel_threshold=0&'
+               'prepared_statement_cache_size=32')
         expected = {'host': '127.0.0.1', 'user': 'mike', 'database': 'db1',
-                    'connection_timeout': 1.5, 'log_level': 10}
+                    'connection_timeout': 1.5, 'log_level': 10,
+                    'row_description_cache_size': 16, 'decode_cache_size': 256,
+                    'drain_cancel_threshold': 0, 'prepared_statement_cache_size': 32}
         parsed = parse_dsn(dsn)
         self.assertDictEqual(expected, parsed)
 
@@ -0,0 +1,103 @@
+# Copyright (c) 2024 Open Text.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import pickle
+from struct import pack
+
+from .base import VerticaPythonUnitTestCase
+from ...vertica.messages import DataRow
+from ...vertica.row import LazyRow, LazyRowLayout, Row, column_index, namedtuple_type
+
+
+class RowTestCase(VerticaPythonUnitTestCase):
+    def test_access(self):
+        index = column_index(['id', 'value', 'id'])
+        row = Row([1, 'foo', 2], index)
+        self.assertEqual(row['id'], 1)
+        self.assertEqual(row.value, 'foo')
+        self.assertEqual(row[2], 2)
+        self.assertEqual(row[-1], 2)
+        self.assertEqual(row[:2], [1, 'foo'])
+        self.assertEqual(len(row), 3)
+        self.assertEqual(list(row), [1, 'foo', 2])
+        self.assertEqual(row.keys(), ['id', 'value'])
+        self.assertEqual(row.as_dict(), {'id': 1, 'value': 'foo'})
+        self.assertRaises(KeyError, lambda: row['missing'])
+        self.assertRaises(AttributeError, lambda: row.missing)
+        self.assertRaises(AttributeError, setattr, row, 'id', 3)
+
+    def test_compare(self):
+        index = column_index(['a', 'b'])
+        self.assertEqual(Row([1, 2], index), Row([1, 2], index))
+        self.assertEqual(Row([1, 2], index), [1, 2])
+        self.assertEqual(Row([1, 2], index), (1, 2))
+        self.assertNotEqual(Row([1, 2], index), [2, 1])
+
+    def test_pickle(self):
+        row = Row([1, None], column_index(['a', 'b']))
+        copy = pickle.loads(pickle.dumps(row))
+        self.assertEqual(copy, row)
+        self.assertIsNone(copy.b)
+
+    def test_namedtuple_type(self):
+        row = namedtuple_type(['id', '?column?', 'id'])._make([1, 2, 3])
+        self.assertEqual(row, (1, 2, 3))
+        self.assertEqual(row._fields, ('id', '_1', '_2'))
+
+
+class LazyRowTestCase(VerticaPythonUnitTestCase):
+    @staticmethod
+    def _body(values):
+        body = pack('!H', len(values))
+        for v in values:
+            body += pack('!i', -1) if v is None else pack('!i', len(v)) + v
+        return body
+
+    def test_lazy_conversion(self):
+        calls = []
+        def convert(val):
+            calls.append(val)
+            return int(val)
+        layout = LazyRowLayout([convert, None, convert], column_index(['a', 'b', 'c']))
+        row = LazyRow(self._body([b'1', b'raw', None]), layout)
+        self.assertEqual(row.a, 1)
+        self.assertEqual(row['a'], 1)
+        self.assertEqual(calls, [b'1'])  # converted once
+        self.assertEqual(row.raw('c'), None)
+        self.assertEqual(row[-2], b'raw')
+        self.assertEqual(calls, [b'1'])
+        self.assertEqual(row.materialize(), [1, b'raw', None])
+        self.assertEqual(row.as_dict(), {'a': 1, 'b': b'raw', 'c': None})
+        self.assertEqual(row, Row([1, b'raw', None], layout.index))
+        self.assertRaises(IndexError, lambda: row[3])
+        self.assertRaises(AttributeError, lambda: row.d)
+
+    def test_field_values(self):
+        layout = LazyRowLayout([int, int], column_index(['a', 'b']))
+        row = LazyRow([b'3', None], layout)
+        self.assertEqual(row.raw(0), b'3')
+        self.assertEqual(list(row), [3, None])
+        self.assertEqual(pickle.loads(pickle.dumps(row)), [3, None])
+
+    def test_data_row_from_buffer(self):
+        # The values outlive the receive buffer they are read from
+        buffer = bytearray(b'xx' + self._body([b'3', None, b'']))
+        message = DataRow(memoryview(buffer)[2:])
+        buffer[:] = b'\0' * len(buffer)
+        self.assertEqual(message.values, [b'3', None, b''])
+        self.assertTrue(all(v is None or type(v) is bytes for v in message.values))
+        layout = LazyRowLayout([int, None, None], column_index(['a', 'b', 'c']))
+        self.assertEqual(list(LazyRow(message.data, layout)), [3, None, b''])
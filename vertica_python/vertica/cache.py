@@ -0,0 +1,92 @@
+# Copyright (c) 2024 Open Text.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import TYPE_CHECKING, NamedTuple
+if TYPE_CHECKING:
+    from typing import Any, Hashable, Iterator, Optional, Tuple
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int
+    currsize: int
+
+
+class LRUCache:
+    """A bounded mapping that discards the least recently used entry when full.
+
+    A cache with maxsize 0 stores nothing, but still counts lookups.
+    """
+    def __init__(self, maxsize: int) -> None:
+        if maxsize < 0:
+            raise ValueError(f'Cache size must be a non-negative integer, got {maxsize}')
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the value stored for key and mark it as recently used, or None."""
+        value = self._data.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._data.move_to_end(key)
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Store value for key, evicting the least recently used entry if full."""
+        if self.maxsize == 0:
+            return
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def pop(self, key: Hashable) -> Optional[Any]:
+        """Remove and return the value stored for key, or None."""
+        return self._data.pop(key, None)
+
+    def evict(self) -> Tuple[Hashable, Any]:
+        """Remove the least recently used entry and return its key and value.
+
+        Raises KeyError if the cache is empty.
+        """
+        item = self._data.popitem(last=False)
+        self.evictions += 1
+        return item
+
+    def values(self) -> Iterator[Any]:
+        return iter(self._data.values())
+
+    def clear(self) -> None:
+        """Remove all entries. Statistics are kept."""
+        self._data.clear()
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(self.hits, self.misses, self.evictions, self.maxsize, len(self._data))
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -0,0 +1,116 @@
+# Copyright (c) 2024 Open Text.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Streaming of large query result values, see Cursor.stream_large_cells()."""
+
+from __future__ import annotations
+
+from tempfile import SpooledTemporaryFile
+
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from typing import IO, Any, Callable, Iterable, List, Optional
+    from ..vertica.column import Column
+
+from ..vertica.column import FormatCode
+from ..vertica.columnar import BINARY_TYPES, STRING_TYPES
+from ..vertica.deserializer import unescape_varbinary
+
+
+class StreamedRow(list):
+    """The field values of a DataRow message read by a CellStream.
+
+    The positions of the streamed values hold None, the file objects they were
+    written to are kept in `cells`, by position.
+    """
+    __slots__ = ('cells',)
+
+    def __init__(self, values: List[Optional[bytes]]) -> None:
+        super().__init__(values)
+        self.cells = {}
+
+
+class CellStream:
+    """Write the values of a result set that are larger than a threshold to files
+    as they are received, instead of reading them into memory.
+
+    Only values of string and binary columns are streamed. The data written is
+    the UTF-8 text of CHAR/VARCHAR/LONG VARCHAR values, and the bytes of
+    BINARY/VARBINARY/LONG VARBINARY values.
+    """
+    def __init__(self,
+                 columns: List[Column],
+                 threshold: int,
+                 sink: Optional[Callable[[Column], IO[bytes]]] = None) -> None:
+        self.columns = columns
+        self.threshold = threshold
+        self.sink = sink
+        # Positions of the columns whose values can be streamed
+        self.positions = {idx for idx, col in enumerate(columns)
+                          if col.type_code in STRING_TYPES or col.type_code in BINARY_TYPES}
+
+    def read_cell(self, idx: int, chunks: Iterable[memoryview]) -> IO[bytes]:
+        """Write the raw data of the value in column idx, received as chunks,
+        to a file and return the file.
+
+        The file is the one returned by the sink for the column, or else a
+        temporary file rewound to its start.
+        """
+        col = self.columns[idx]
+        if self.sink is None:
+            # Values up to the threshold size are held in memory, larger ones on disk
+            f = SpooledTemporaryFile(max_size=self.threshold)
+        else:
+            f = self.sink(col)
+        if col.type_code in BINARY_TYPES and col.format_code == FormatCode.TEXT:
+            writer = VarbinaryUnescaper(f)
+            for chunk in chunks:
+                writer.write(chunk)
+            writer.close()
+        else:
+            for chunk in chunks:
+                f.write(chunk)
+        if self.sink is None:
+            f.seek(0)
+        return f
+
+
+class VarbinaryUnescaper:
+    """Decode the text representation of binary data written in chunks, which
+    may split escapes, and write the decoded data to a file.
+    """
+    def __init__(self, f: IO[bytes]) -> None:
+        self._file = f
+        self._pending = b''
+
+    def write(self, chunk: Any) -> None:
+        data = self._pending + chunk
+        end = len(data)
+        # An escape is '\\' or '\ooo'. A run of backslashes not preceded by a
+        # backslash starts at an escape, so an odd run leaves the last backslash
+        # starting an escape, which is incomplete if it is in the last 3 bytes.
+        pos = data.rfind(b'\\', max(end - 3, 0))
+        if pos != -1:
+            run = pos + 1 - len(data[:pos + 1].rstrip(b'\\'))
+            if run % 2:
+                end = pos
+        self._pending = data[end:]
+        if end:
+            self._file.write(unescape_varbinary(data[:end]))
+
+    def close(self) -> None:
+        """Write the rest of the data."""
+        if self._pending:
+            self._file.write(unescape_varbinary(self._pending))
+            self._pending = b''
@@ -0,0 +1,405 @@
+# Copyright (c) 2024 Open Text.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Columnar conversion of query results.
+
+The raw field values of a batch of rows are converted column by column into
+arrays of third-party libraries. Fixed-width values sent in binary transfer
+format are converted in bulk, without creating a Python object per value.
+The libraries are optional dependencies, imported when first used.
+"""
+
+from __future__ import annotations
+
+import importlib
+from datetime import timezone
+
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from types import ModuleType
+    from typing import Any, Callable, Dict, List, Optional, Sequence
+    from ..vertica.column import Column
+
+from .. import errors
+from ..datatypes import VerticaType
+from ..vertica.column import FormatCode
+from ..vertica.deserializer import NUMERIC_OUTPUT_CONVERTERS, Y2K_EPOCH_MICROSECONDS, Deserializer
+
+
+# Julian day number of 1970-01-01
+UNIX_EPOCH_JDN = 2440588
+
+# NumPy dtypes of the types with a native NumPy representation
+NUMPY_DTYPES = {
+    VerticaType.BOOL: 'bool',
+    VerticaType.INT8: 'int64',
+    VerticaType.FLOAT8: 'float64',
+    VerticaType.DATE: 'datetime64[D]',
+    VerticaType.TIMESTAMP: 'datetime64[us]',
+    VerticaType.TIMESTAMPTZ: 'datetime64[us]',  # in UTC
+    VerticaType.INTERVAL: 'timedelta64[us]',
+    VerticaType.INTERVALYM: 'timedelta64[M]',
+}
+
+STRING_TYPES = {VerticaType.CHAR, VerticaType.VARCHAR, VerticaType.LONGVARCHAR}
+BINARY_TYPES = {VerticaType.BINARY, VerticaType.VARBINARY, VerticaType.LONGVARBINARY}
+
+# Maximum precision of the unscaled NUMERIC values that fit in int64
+INT64_MAX_PRECISION = 18
+# Maximum precision of the Arrow decimal types
+DECIMAL128_MAX_PRECISION = 38
+DECIMAL256_MAX_PRECISION = 76
+
+_PACKAGES = {
+    'numpy': 'NumPy',
+    'pyarrow': 'Apache Arrow',
+    'pandas': 'pandas',
+}
+
+
+def import_package(module: str) -> ModuleType:
+    """Import an optional dependency needed for a columnar fetch."""
+    try:
+        return importlib.import_module(module)
+    except ImportError as e:
+        raise errors.NotSupportedError("{}\nCannot fetch results as {} data because "
+            "no {} package is installed. Get it with 'pip install {}'.".format(
+            str(e), _PACKAGES[module], _PACKAGES[module], module))
+
+
+def split_columns(rows: List[List[Optional[bytes]]], num_columns: int) -> List[Sequence[Optional[bytes]]]:
+    """Transpose the raw field values of rows into the raw values of each column."""
+    if not rows:
+        return [()] * num_columns
+    return list(zip(*rows))
+
+
+_NO_COLUMN_CONVERTER = object()
+
+# Deserializer context options of the columns decoded by the default converters
+COLUMNAR_CONTEXT = {'timestamptz_output': 'utc', 'interval_output': 'microseconds', 'array_output': 'list'}
+
+
+class ColumnConverter:
+    """Convert the raw values of one result column in bulk.
+
+    Columns that use the default sqldata converter in binary transfer format
+    are decoded directly from the bytes of all values. Other columns fall back
+    to converting value by value with the sqldata converter of the column,
+    which honors custom converters.
+    """
+    def __init__(self, col: Column,
+                 custom_converters: Dict[int, Callable[[bytes, Dict[str, Any]], Any]],
+                 context: Dict[str, Any], convert: bool = True,
+                 column_converter: Any = _NO_COLUMN_CONVERTER) -> None:
+        # column_converter is a converter chosen for this very column (None for
+        # no conversion), which takes precedence over custom_converters
+        self.column = col
+        self.type_code = col.type_code
+        has_column_converter = column_converter is not _NO_COLUMN_CONVERTER
+        if (has_column_converter and col.type_code == VerticaType.NUMERIC
+                and column_converter in NUMERIC_OUTPUT_CONVERTERS):
+            # The NUMERIC converters of the deserializer module keep bulk decoding
+            numeric_output = (NUMERIC_OUTPUT_CONVERTERS[column_converter]
+                              or context.get('numeric_output', 'decimal'))
+            context = {**context, 'numeric_output': numeric_output}
+            self.is_default = convert
+        else:
+            # bulk decoding applies to values converted with default converters
+            self.is_default = (convert and not has_column_converter
+                               and col.type_code not in custom_converters)
+        self.is_binary = self.is_default and col.format_code == FormatCode.BINARY
+        if self.is_default:
+            # The column is decoded to the typed representations of the columnar
+            # formats, which do not depend on the output options of row fetches
+            context = {**context, **COLUMNAR_CONTEXT}
+        self.context = context
+        if not convert or column_converter is None:
+            self.converter = None
+        elif has_column_converter:
+            self.converter = Deserializer().bind_converter(column_converter, col, context)
+        else:
+            self.converter = Deserializer().get_column_converter(col, custom_converters, context)
+        self.numeric_output = None
+        if self.is_default and col.type_code == VerticaType.NUMERIC:
+            self.numeric_output = context.get('numeric_output', 'decimal')
+            # NUMERIC values as float, or as unscaled integers that fit in int64,
+            # are decoded like FLOAT / INTEGER values
+            if self.numeric_output == 'float':
+                self.type_code = VerticaType.FLOAT8
+                self.is_binary = False  # the binary data is the unscaled integer
+            elif self.numeric_output == 'scaled_int' and col.precision <= INT64_MAX_PRECISION:
+                self.type_code = VerticaType.INT8
+
+    def convert(self, values: Sequence[Optional[bytes]]) -> List[Any]:
+        """Return the list of Python objects of the values, with None for NULL."""
+        f = self.converter
+        if f is None:
+            return list(values)
+        return [None if v is None else f(v) for v in values]
+
+    def arrow_type(self, pa: ModuleType, dictionary_encode: bool = False) -> Optional[Any]:
+        """Return the Arrow data type of the column, or None if it is inferred
+        from the converted values.
+        """
+        col = self.column
+        type_code = self.type_code
+        if not self.is_default:
+            return pa.binary() if self.converter is None else None
+        if type_code in STRING_TYPES:
+            if dictionary_encode:
+                return pa.dictionary(pa.int32(), pa.string())
+            return pa.large_string() if type_code == VerticaType.LONGVARCHAR else pa.string()
+        elif type_code == VerticaType.NUMERIC:
+            # unscaled integers are stored as decimals of scale 0
+            scale = 0 if self.numeric_output == 'scaled_int' else col.scale
+            if col.precision is None or col.precision > DECIMAL256_MAX_PRECISION:
+                return pa.string()
+            elif col.precision > DECIMAL128_MAX_PRECISION:
+                return pa.decimal256(col.precision, scale)
+            return pa.decimal128(col.precision, scale)
+        elif type_code == VerticaType.LONGVARBINARY:
+            return pa.large_binary()
+        elif type_code in BINARY_TYPES or type_code == VerticaType.UNKNOWN:
+            return pa.binary()
+        return {
+            VerticaType.BOOL: pa.bool_(),
+            VerticaType.INT8: pa.int64(),
+            VerticaType.FLOAT8: pa.float64(),
+            VerticaType.DATE: pa.date32(),
+            VerticaType.TIME: pa.time64('us'),
+            VerticaType.TIMESTAMP: pa.timestamp('us'),
+            VerticaType.TIMESTAMPTZ: pa.timestamp('us', tz='UTC'),
+            VerticaType.INTERVAL: pa.duration('us'),
+            VerticaType.INTERVALYM: pa.month_day_nano_interval(),
+            VerticaType.UUID: pa.binary(16),
+        }.get(type_code)
+
+    def to_arrow(self, pa: ModuleType, values: Sequence[Optional[bytes]],
+                 dictionary_encode: bool = False) -> Any:
+        """Return the values as an Arrow array."""
+        type_code = self.type_code
+        arrow_type = self.arrow_type(pa, dictionary_encode)
+        if arrow_type is None:
+            # The type is inferred from the values of this batch only, and may
+            # differ between batches (see arrow_table())
+            return pa.array(self.convert(values))
+        if not self.is_default or self.converter is None:
+            # raw values
+            return pa.array(values, type=arrow_type)
+        if self.is_binary and type_code in NUMPY_DTYPES and type_code != VerticaType.INTERVALYM:
+            np = import_package('numpy')
+            mask = numpy_mask(np, values)
+            has_nulls = mask is not np.ma.nomask
+            data = self._binary_to_numpy(np, values, has_nulls)
+            return pa.array(data, type=arrow_type, mask=mask if has_nulls else None)
+        if type_code in STRING_TYPES and self.context['unicode_error'] == 'strict':
+            # Arrow validates and copies the UTF-8 data without creating Python strings
+            binary_type = pa.large_binary() if type_code == VerticaType.LONGVARCHAR else pa.binary()
+            arr = pa.array(values, type=binary_type).cast(
+                pa.large_string() if type_code == VerticaType.LONGVARCHAR else pa.string())
+            return arr.dictionary_encode() if dictionary_encode else arr
+        if self.is_binary and type_code == VerticaType.UUID:
+            return pa.array(values, type=arrow_type)
+
+        objs = self.convert(values)
+        # INTERVAL values are converted to microseconds and INTERVALYM values to months
+        if type_code == VerticaType.INTERVALYM:
+            objs = [None if v is None else (v, 0, 0) for v in objs]
+        elif type_code == VerticaType.UUID:
+            objs = [None if v is None else v.bytes for v in objs]
+        elif arrow_type == pa.string():
+            objs = [None if v is None else str(v) for v in objs]
+        elif dictionary_encode and type_code in STRING_TYPES:
+            return pa.array(objs, type=pa.string()).dictionary_encode()
+        return pa.array(objs, type=arrow_type)
+
+    def to_numpy(self, np: ModuleType, values: Sequence[Optional[bytes]]) -> Any:
+        """Return the values as a NumPy masked array, masking NULL values."""
+        n = len(values)
+        mask = numpy_mask(np, values)
+        dtype = NUMPY_DTYPES.get(self.type_code) if self.is_default else None
+        if dtype is None:
+            data = np.empty(n, dtype=object)
+            for i, v in enumerate(self.convert(values)):
+                data[i] = v
+        elif self.is_binary:
+            data = self._binary_to_numpy(np, values, mask is not np.ma.nomask)
+        else:
+            data = self._objects_to_numpy(np, self.convert(values), dtype)
+        return np.ma.MaskedArray(data, mask=mask)
+
+    def _binary_to_numpy(self, np: ModuleType, values: Sequence[Optional[bytes]], has_nulls: bool) -> Any:
+        type_code = self.type_code
+        width = 1 if type_code == VerticaType.BOOL else 8
+        if has_nulls:
+            zero = bytes(width)
+            values = [zero if v is None else v for v in values]
+        data = b''.join(values)
+        if type_code == VerticaType.BOOL:
+            return np.frombuffer(data, dtype=np.uint8) != 0
+        if type_code == VerticaType.FLOAT8:
+            return np.frombuffer(data, dtype='>f8').astype(np.float64)
+        ints = np.frombuffer(data, dtype='>i8').astype(np.int64)
+        if type_code == VerticaType.DATE:
+            # Julian day numbers
+            return (ints - UNIX_EPOCH_JDN).astype('datetime64[D]')
+        elif type_code in (VerticaType.TIMESTAMP, VerticaType.TIMESTAMPTZ):
+            # microseconds since 2000-01-01 00:00:00 (in UTC for TIMESTAMPTZ)
+            return (ints + Y2K_EPOCH_MICROSECONDS).view('datetime64[us]')
+        elif type_code == VerticaType.INTERVAL:
+            # microseconds
+            return ints.view('timedelta64[us]')
+        elif type_code == VerticaType.INTERVALYM:
+            # months
+            return ints.view('timedelta64[M]')
+        return ints
+
+    def _objects_to_numpy(self, np: ModuleType, objs: List[Any], dtype: str) -> Any:
+        type_code = self.type_code
+        if type_code == VerticaType.TIMESTAMPTZ:
+            objs = [None if v is None else v.astimezone(timezone.utc).replace(tzinfo=None)
+                    for v in objs]
+        elif type_code in (VerticaType.BOOL, VerticaType.INT8):
+            objs = [0 if v is None else v for v in objs]
+        # None is converted to NaN / NaT for the other dtypes
+        if dtype.startswith('timedelta64'):
+            return np.array([0 if v is None else v for v in objs], dtype=np.int64).view(dtype)
+        return np.array(objs, dtype=dtype)
+
+
+    def numpy_to_pandas(self, np: ModuleType, pd: ModuleType, arr: Any) -> Any:
+        """Convert a masked array returned by to_numpy() to the data of a pandas column:
+        Int64, boolean, float64, datetime64, timedelta64 or string dtype, or object
+        dtype for the other types.
+        """
+        type_code = self.type_code if self.is_default else None
+        mask = np.ma.getmaskarray(arr)
+        data = arr.data
+        if type_code in (VerticaType.INT8, VerticaType.INTERVALYM):
+            # INTERVAL YEAR TO MONTH as a number of months
+            return pd.arrays.IntegerArray(data.view(np.int64), mask)
+        elif type_code == VerticaType.BOOL:
+            return pd.arrays.BooleanArray(data, mask)
+        elif type_code == VerticaType.FLOAT8:
+            return np.where(mask, np.nan, data)
+        elif type_code in (VerticaType.DATE, VerticaType.TIMESTAMP,
+                           VerticaType.TIMESTAMPTZ, VerticaType.INTERVAL):
+            if type_code == VerticaType.DATE:
+                # pandas supports datetime64 down to second resolution
+                data = data.astype('datetime64[s]')
+            data = np.where(mask, data.dtype.type('NaT'), data)
+            if type_code == VerticaType.TIMESTAMPTZ:
+                return pd.DatetimeIndex(data).tz_localize('UTC')
+            return data
+        elif type_code in STRING_TYPES:
+            return pd.array(data, dtype='string')
+        return data
+
+def numpy_mask(np: ModuleType, values: Sequence[Optional[bytes]]) -> Any:
+    """Return the mask of the NULL values, or nomask if there is none."""
+    if None not in values:
+        return np.ma.nomask
+    return np.fromiter((v is None for v in values), dtype=bool, count=len(values))
+
+
+def numpy_columns(converters: List[ColumnConverter],
+                  rows: List[List[Optional[bytes]]]) -> Dict[str, Any]:
+    """Convert the raw field values of rows to a dict of NumPy masked arrays,
+    one per column in the order of the result set.
+    """
+    names = [conv.column.name for conv in converters]
+    if len(set(names)) != len(names):
+        raise errors.ProgrammingError('Result columns must have unique names to be fetched '
+                                      'as a dict of arrays. Got: {}'.format(names))
+    return dict(zip(names, numpy_arrays(converters, rows)))
+
+
+def numpy_arrays(converters: List[ColumnConverter], rows: List[List[Optional[bytes]]]) -> List[Any]:
+    """Convert the raw field values of rows to a list of NumPy masked arrays,
+    one per column in the order of the result set.
+    """
+    np = import_package('numpy')
+    return [conv.to_numpy(np, values)
+            for conv, values in zip(converters, split_columns(rows, len(converters)))]
+
+
+def concat_numpy_columns(batches: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Concatenate the masked arrays of batches returned by numpy_columns()."""
+    if len(batches) == 1:
+        return batches[0]
+    np = import_package('numpy')
+    return {name: np.ma.concatenate([batch[name] for batch in batches])
+            for name in batches[0]}
+
+
+def arrow_record_batch(converters: List[ColumnConverter], rows: List[List[Optional[bytes]]],
+                       dictionary_encode: bool = False) -> Any:
+    """Convert the raw field values of rows to an Arrow RecordBatch."""
+    pa = import_package('pyarrow')
+    arrays = [conv.to_arrow(pa, values, dictionary_encode)
+              for conv, values in zip(converters, split_columns(rows, len(converters)))]
+    schema = pa.schema([pa.field(conv.column.name, arr.type, nullable=bool(conv.column.null_ok))
+                        for conv, arr in zip(converters, arrays)])
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def arrow_table(converters: List[ColumnConverter], batches: List[Any],
+                dictionary_encode: bool = False) -> Any:
+    """Combine RecordBatches returned by arrow_record_batch() into an Arrow Table."""
+    pa = import_package('pyarrow')
+    if not batches:
+        batches = [arrow_record_batch(converters, [], dictionary_encode)]
+    schema = batches[0].schema
+    if all(batch.schema.equals(schema) for batch in batches):
+        return pa.Table.from_batches(batches)
+    # The types inferred for a column differ between batches, e.g. null for a
+    # batch of NULL values, or decimals of growing precision. They are promoted
+    # to a common type.
+    return pa.concat_tables([pa.Table.from_batches([batch]) for batch in batches],
+                            promote_options='permissive')
+
+
+class DataFrameBuilder:
+    """Build a pandas DataFrame from batches of rows.
+
+    Each batch is converted to compact NumPy arrays as soon as it is read, so
+    no Python object is kept per value; the pandas columns are created once
+    from the arrays of all batches.
+    """
+    def __init__(self, converters: List[ColumnConverter]) -> None:
+        self.np = import_package('numpy')
+        self.pd = import_package('pandas')
+        self.converters = converters
+        self.chunks = [[] for _ in converters]
+
+    def append(self, rows: List[List[Optional[bytes]]]) -> None:
+        for chunks, arr in zip(self.chunks, numpy_arrays(self.converters, rows)):
+            chunks.append(arr)
+
+    def build(self) -> Any:
+        """Return the DataFrame of the rows appended since the last call."""
+        np, pd = self.np, self.pd
+        data = {}
+        for idx, (conv, chunks) in enumerate(zip(self.converters, self.chunks)):
+            if not chunks:
+                chunks.append(conv.to_numpy(np, ()))
+            arr = chunks[0] if len(chunks) == 1 else np.ma.concatenate(chunks)
+            chunks.clear()
+            data[idx] = conv.numpy_to_pandas(np, pd, arr)
+        df = pd.DataFrame(data, copy=False)
+        # column names may be duplicated
+        df.columns = [conv.column.name for conv in self.converters]
+        return df
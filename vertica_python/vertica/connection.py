@@ -51,19 +51,27 @@ import select
 import sys
 import unicodedata
 from collections import deque
-from struct import unpack
+from contextlib import contextmanager
+from struct import Struct, unpack, unpack_from
 
 # noinspection PyCompatibility,PyUnresolvedReferences
 from urllib.parse import urlparse, parse_qs
 from typing import TYPE_CHECKING, NamedTuple
 if TYPE_CHECKING:
-    from typing import Any, Dict, List, Optional, Type, Union, Deque, Tuple
+    from typing import Any, Dict, Generator, Iterator, List, Optional, Type, Union, Deque, Tuple
+    from ..vertica.cache import CacheInfo
+    from ..vertica.cellstream import CellStream
 
 import vertica_python
 from .. import errors
 from ..vertica import messages
+from ..vertica.cache import LRUCache
+from ..vertica.cellstream import StreamedRow
 from ..vertica.cursor import Cursor
+from ..vertica.deserializer import ARRAY_OUTPUTS, INTERVAL_OUTPUTS, NUMERIC_OUTPUTS, TIMESTAMPTZ_OUTPUTS
+from ..vertica.row import LazyRow, Row
 from ..vertica.messages.message import BackendMessage, FrontendMessage
+from ..vertica.messages.backend_messages.data_row import split_data_row
 from ..vertica.messages.frontend_messages import CancelRequest
 from ..vertica.log import VerticaLogging
 from ..vertica.tlsmode import TLSMode
@@ -82,6 +90,19 @@ DEFAULT_REQUEST_COMPLEX_TYPES = True
 DEFAULT_OAUTH_ACCESS_TOKEN = ''
 DEFAULT_WORKLOAD = ''
 DEFAULT_TLSMODE = 'prefer'
+DEFAULT_READ_BUFFER_SIZE = 65536
+DEFAULT_ROW_DESCRIPTION_CACHE_SIZE = 128
+DEFAULT_PREPARED_STATEMENT_CACHE_SIZE = 1
+DEFAULT_TIMESTAMPTZ_OUTPUT = 'session'
+DEFAULT_NUMERIC_OUTPUT = 'decimal'
+DEFAULT_INTERVAL_OUTPUT = 'relativedelta'
+DEFAULT_ARRAY_OUTPUT = 'list'
+DEFAULT_DECODE_CACHE_SIZE = 0
+DEFAULT_DRAIN_CANCEL_THRESHOLD = 0
+DATA_ROW_ID = ord(messages.DataRow.message_id)
+_unpack_size = Struct('!I').unpack_from
+# The size above which corked messages are sent without waiting for the end of the cork
+WRITE_BUFFER_SIZE = 64 * 1024
 try:
     DEFAULT_USER = getpass.getuser()
 except Exception as e:
@@ -168,9 +189,10 @@ def parse_dsn(dsn: str) -> Dict[str, Union[str, int, bool, float]]:
             continue
         elif key == 'backup_server_node':
             continue
-        elif key in ('connection_load_balance', 'use_prepared_statements',
+        elif key in ('connection_load_balance', 'use_prepared_statements', 'pipeline_prepared_statements',
                      'disable_copy_local', 'ssl', 'autocommit',
-                     'binary_transfer', 'request_complex_types'):
+                     'binary_transfer', 'binary_parameters', 'mixed_result_formats',
+                     'request_complex_types'):
             lower = value.lower()
             if lower in ('true', 'on', '1'):
                 result[key] = True
@@ -180,6 +202,9 @@ def parse_dsn(dsn: str) -> Dict[str, Union[str, int, bool, float]]:
             result[key] = float(value)
         elif key == 'log_level' and value.isdigit():
             result[key] = int(value)
+        elif key in ('row_description_cache_size', 'decode_cache_size', 'drain_cancel_threshold',
+                     'prepared_statement_cache_size'):
+            result[key] = int(value)
         else:
             result[key] = value
 
@@ -316,7 +341,12 @@ class Connection:
         self.backend_key = None
         self.transaction_status = None
         self.socket = None
-        self.socket_as_file = None
+        self._reset_read_buffer()
+        # The CellStream for the large values of the current result set, set by
+        # the cursor (see Cursor.stream_large_cells())
+        self._cell_stream: Optional[CellStream] = None
+        # The messages written while corked, see corked()
+        self._write_buffer: Optional[bytearray] = None
 
         options = options or {}
         self.options = parse_dsn(options['dsn']) if 'dsn' in options else {}
@@ -394,6 +424,17 @@ class Connection:
         self._logger.debug('Connection prepared statements is {}'.format(
                      'enabled' if self.options['use_prepared_statements'] else 'disabled'))
 
+        # knob for the number of server-side prepared statements kept for reuse
+        self.options.setdefault('prepared_statement_cache_size', DEFAULT_PREPARED_STATEMENT_CACHE_SIZE)
+        self._prepared_statement_cache = LRUCache(self.options['prepared_statement_cache_size'])
+        self._logger.debug('Prepared statement cache size is {}'.format(
+                     self.options['prepared_statement_cache_size']))
+
+        # knob for sending the first execution of a prepared statement with its preparation
+        self.options.setdefault('pipeline_prepared_statements', False)
+        self._logger.debug('Prepared statements pipelining is {}'.format(
+                     'enabled' if self.options['pipeline_prepared_statements'] else 'disabled'))
+
         # knob for disabling COPY LOCAL operations
         self.options.setdefault('disable_copy_local', False)
         self._logger.debug('COPY LOCAL operation is {}'.format(
@@ -404,11 +445,62 @@ class Connection:
         self._logger.debug('Data binary transfer is {}'.format(
                      'enabled' if self.options['binary_transfer'] else 'disabled'))
 
+        # knob for choosing the transfer format of prepared statement results by column type
+        self.options.setdefault('mixed_result_formats', False)
+        self._logger.debug('Mixed result formats are {}'.format(
+                     'enabled' if self.options['mixed_result_formats'] else 'disabled'))
+
+        # knob for sending prepared statement parameters in binary format
+        self.options.setdefault('binary_parameters', False)
+        self._logger.debug('Binary parameters are {}'.format(
+                     'enabled' if self.options['binary_parameters'] else 'disabled'))
+
         # knob for requesting complex types metadata
         self.options.setdefault('request_complex_types', DEFAULT_REQUEST_COMPLEX_TYPES)
         self._logger.debug('Complex types metadata is {}'.format(
                      'requested' if self.options['request_complex_types'] else 'not requested'))
 
+        # knob for the number of result set layouts (RowDescription) kept for reuse
+        self.options.setdefault('row_description_cache_size', DEFAULT_ROW_DESCRIPTION_CACHE_SIZE)
+        self._row_description_cache = LRUCache(self.options['row_description_cache_size'])
+        self._logger.debug('Row description cache size is {}'.format(
+                     self.options['row_description_cache_size']))
+
+        # knob for the representation of TIMESTAMPTZ values in query results
+        self.options.setdefault('timestamptz_output', DEFAULT_TIMESTAMPTZ_OUTPUT)
+        if self.options['timestamptz_output'] not in TIMESTAMPTZ_OUTPUTS:
+            raise ValueError('The value of connection option "timestamptz_output" should be one of {}'.format(
+                             ', '.join(repr(v) for v in TIMESTAMPTZ_OUTPUTS)))
+        self._logger.debug('TIMESTAMPTZ output is {}'.format(self.options['timestamptz_output']))
+
+        # knob for the representation of NUMERIC values in query results
+        self.options.setdefault('numeric_output', DEFAULT_NUMERIC_OUTPUT)
+        if self.options['numeric_output'] not in NUMERIC_OUTPUTS:
+            raise ValueError('The value of connection option "numeric_output" should be one of {}'.format(
+                             ', '.join(repr(v) for v in NUMERIC_OUTPUTS)))
+        self._logger.debug('NUMERIC output is {}'.format(self.options['numeric_output']))
+
+        # knob for the representation of INTERVAL values in query results
+        self.options.setdefault('interval_output', DEFAULT_INTERVAL_OUTPUT)
+        if self.options['interval_output'] not in INTERVAL_OUTPUTS:
+            raise ValueError('The value of connection option "interval_output" should be one of {}'.format(
+                             ', '.join(repr(v) for v in INTERVAL_OUTPUTS)))
+        self._logger.debug('INTERVAL output is {}'.format(self.options['interval_output']))
+        self.options.setdefault('array_output', DEFAULT_ARRAY_OUTPUT)
+        if self.options['array_output'] not in ARRAY_OUTPUTS:
+            raise ValueError('The value of connection option "array_output" should be one of {}'.format(
+                             ', '.join(repr(v) for v in ARRAY_OUTPUTS)))
+        self._logger.debug('ARRAY output is {}'.format(self.options['array_output']))
+
+        # knob for memoizing the decoded values of low-cardinality columns
+        self.options.setdefault('decode_cache_size', DEFAULT_DECODE_CACHE_SIZE)
+        self._logger.debug('Decode cache size is {}'.format(self.options['decode_cache_size']))
+
+        # knob for canceling a query instead of reading the rest of a large result
+        # that is no longer wanted
+        self.options.setdefault('drain_cancel_threshold', DEFAULT_DRAIN_CANCEL_THRESHOLD)
+        self._logger.debug('Drain cancel threshold is {}'.format(self.options['drain_cancel_threshold']))
+
         self._logger.info('Connecting as user "{}" to database "{}" on host "{}" with port {}'.format(
                      self.options['user'], self.options['database'],
                      self.options['host'], self.options['port']))
@@ -458,7 +550,8 @@ class Connection:
         cur.execute('ROLLBACK;')
 
     def cursor(self,
-               cursor_type: Union[None, str, Type[List[Any]], Type[Dict[Any, Any]]] = None) -> Cursor:
+               cursor_type: Union[None, str, Type[List[Any]], Type[Dict[Any, Any]],
+                                  Type[Tuple[Any, ...]], Type[Row], Type[LazyRow]] = None) -> Cursor:
         """Return the Cursor Object using the connection.
 
         vertica-python only support one cursor per connection.
@@ -473,6 +566,24 @@ class Connection:
         E.g. [ {'id': 1, 'value': 'foo'}, {'id': 2, 'value': 'bar'} ]
          - cursor(cursor_type=dict)
          - cursor(cursor_type='dict')
+
+        The following cases return each row as a tuple. E.g. [ (1, 'foo'), (2, 'bar') ]
+         - cursor(cursor_type=tuple)
+         - cursor(cursor_type='tuple')
+
+        The following case returns each row as a namedtuple.
+        E.g. [ Row(id=1, value='foo'), Row(id=2, value='bar') ]
+         - cursor(cursor_type='namedtuple')
+
+        The following cases return each row as a vertica_python.Row, a sequence that
+        also supports access by column name, as row['value'] or row.value.
+         - cursor(cursor_type=vertica_python.Row)
+         - cursor(cursor_type='row')
+
+        The following cases return each row as a vertica_python.LazyRow, which supports
+        the same access as vertica_python.Row but converts each value on first access.
+         - cursor(cursor_type=vertica_python.LazyRow)
+         - cursor(cursor_type='lazy')
         """
         if self.closed():
             raise errors.ConnectionError('Connection is closed')
@@ -548,7 +659,9 @@ class Connection:
         self.backend_key = None
         self.transaction_status = None
         self.socket = None
-        self.socket_as_file = None
+        self._reset_read_buffer()
+        # The prepared statements are gone with the session
+        self._prepared_statement_cache.clear()
         self.address_list = _AddressList(self.options['host'], self.options['port'],
                                          self.options['backup_server_node'], self._logger)
 
@@ -610,10 +723,13 @@ class Connection:
         else:
             return None, False
 
-    def _socket_as_file(self):
-        if self.socket_as_file is None:
-            self.socket_as_file = self._socket().makefile('rb')
-        return self.socket_as_file
+    def _reset_read_buffer(self) -> None:
+        # Bytes received from the server are kept in a buffer owned by the connection.
+        # Unread data lies in self._read_buffer[self._read_start:self._read_end].
+        self._read_buffer = bytearray(DEFAULT_READ_BUFFER_SIZE)
+        self._read_view = memoryview(self._read_buffer)
+        self._read_start = 0
+        self._read_end = 0
 
     def create_socket(self, family) -> socket.socket:
         """Create a TCP socket object."""
@@ -745,18 +861,63 @@ class Connection:
     def write(self, message: FrontendMessage, vsocket: Optional[Union[socket.socket, ssl.SSLSocket]] = None) -> None:
         if not isinstance(message, FrontendMessage):
             raise TypeError("invalid message: ({0})".format(message))
+        self._logger.debug('=> %s', message)
+        if vsocket is None and self._write_buffer is not None:
+            # A message that cannot be encoded is not added to the buffer
+            self._write_buffer += b''.join(message.fetch_message())
+            if len(self._write_buffer) >= WRITE_BUFFER_SIZE:
+                self._send_write_buffer()
+            return
         if vsocket is None:
             vsocket = self._socket()
-        self._logger.debug('=> %s', message)
         try:
             for data in message.fetch_message():
-                size = 8192  # Max msg size, consistent with how the server works
-                pos = 0
-                while pos < len(data):
-                    sent = vsocket.send(data[pos : pos + size])
-                    if sent == 0:
-                        raise errors.ConnectionError("Couldn't send message: Socket connection broken")
-                    pos += sent
+                vsocket.sendall(data)
+        except Exception as e:
+            self.close_socket()
+            self._logger.error(str(e))
+            if isinstance(e, IOError):
+                raise errors.ConnectionError(str(e))
+            else:
+                raise
+
+    @contextmanager
+    def corked(self) -> Generator[None, None, None]:
+        """Collect the messages written in this context into one buffer, and send
+        them together when the context exits.
+
+        This saves a socket send, and possibly a network packet, per message. The
+        buffer is also sent whenever it grows over WRITE_BUFFER_SIZE. Nested
+        contexts send nothing themselves, the outermost one sends everything.
+        """
+        if self._write_buffer is not None:
+            yield
+            return
+        self._write_buffer = bytearray()
+        try:
+            yield
+        except BaseException:
+            # The complete messages written before an error are still sent, but
+            # a failure to send them must not replace the error
+            if self.socket is not None:
+                try:
+                    self._send_write_buffer()
+                except Exception:
+                    pass
+            raise
+        else:
+            if self.socket is not None:
+                self._send_write_buffer()
+        finally:
+            self._write_buffer = None
+
+    def _send_write_buffer(self) -> None:
+        data = self._write_buffer
+        if not data:
+            return
+        self._write_buffer = bytearray()
+        try:
+            self._socket().sendall(data)
         except Exception as e:
             self.close_socket()
             self._logger.error(str(e))
@@ -770,8 +931,6 @@ class Connection:
         try:
             if self.socket is not None:
                 self._socket().close()
-            if self.socket_as_file is not None:
-                self._socket_as_file().close()
         finally:
             self.reset_values()
 
@@ -803,21 +962,23 @@ class Connection:
                 self._logger.warning(message.error_message())
 
     def read_string(self) -> bytearray:
-        s = bytearray()
         while True:
-            char = self.read_bytes(1)
-            if char == b'\x00':
+            pos = self._read_buffer.find(b'\x00', self._read_start, self._read_end)
+            if pos != -1:
                 break
-            s.extend(char)
+            self._fill_read_buffer(self._read_end - self._read_start + 1)
+        s = self._read_buffer[self._read_start:pos]
+        self._read_start = pos + 1
         return s
 
     def read_message(self) -> BackendMessage:
         while True:
             try:
-                type_ = self.read_bytes(1)
-                size = unpack('!I', self.read_bytes(4))[0]
+                self._fill_read_buffer(5)
+                type_, size = unpack_from('!cI', self._read_buffer, self._read_start)
                 if size < 4:
                     raise errors.MessageError("Bad message size: {0}".format(size))
+                self._read_start += 5
                 if type_ == messages.WriteFile.message_id:
                     # The whole WriteFile message may not be read at here.
                     # Instead, only the file name and file length is read.
@@ -837,8 +998,14 @@ class Connection:
                     else:
                         # The rest of the message is read later with write_to_disk()
                         message = messages.WriteFile(filename, file_length)
+                elif type_ == messages.DataRow.message_id and self._is_streamed(size - 4):
+                    message = self._read_streamed_data_row(size - 4, self._cell_stream)
+                elif type_ == messages.DataRow.message_id:
+                    # DataRow copies the field values out of the receive buffer,
+                    # so the message body is passed as a view without copying it.
+                    message = messages.DataRow(self._read_buffer_view(size - 4))
                 elif type_ == messages.RowDescription.message_id:
-                    message = BackendMessage.from_type(type_, self.read_bytes(size - 4), complex_types_enabled=self.complex_types_enabled)
+                    message = self._read_row_description(size - 4)
                 else:
                     message = BackendMessage.from_type(type_, self.read_bytes(size - 4))
                 self._logger.debug('<= %s', message)
@@ -855,6 +1022,175 @@ class Connection:
                 break
         return message
 
+    def _is_streamed(self, n: int) -> bool:
+        """Whether a DataRow message body of n bytes is read by the CellStream."""
+        return self._cell_stream is not None and n > self._cell_stream.threshold
+
+    def _read_streamed_data_row(self, n: int, stream: CellStream) -> messages.DataRow:
+        """Read a DataRow message body of n bytes. The values larger than the
+        threshold of the stream are passed to it as they are received, so the
+        message is never held in memory as a whole.
+        """
+        field_count = unpack('!H', self.read_bytes(2))[0]
+        n -= 2
+        values = StreamedRow([None] * field_count)
+        for idx in range(field_count):
+            size = unpack('!i', self.read_bytes(4))[0]
+            n -= 4
+            if size == -1:
+                continue
+            n -= size
+            if size <= stream.threshold or idx not in stream.positions:
+                values[idx] = self.read_bytes(size)
+                continue
+            chunks = self._read_chunks(size)
+            try:
+                values.cells[idx] = stream.read_cell(idx, chunks)
+            except Exception as e:
+                # Skip the rest of the message, so that the connection stays usable
+                for _ in chunks:
+                    pass
+                for _ in self._read_chunks(n):
+                    pass
+                raise errors.InterfaceError("Cannot stream the value of column '{}': {}".format(
+                                            stream.columns[idx].name, e)) from e
+        return messages.DataRow(None, values)
+
+    def _read_chunks(self, n: int) -> Iterator[memoryview]:
+        """Consume the next n bytes of the server data, yielding views of the
+        receive buffer of up to DEFAULT_READ_BUFFER_SIZE bytes. A view is valid
+        until the next one is yielded.
+        """
+        while n > 0:
+            self._fill_read_buffer(min(n, DEFAULT_READ_BUFFER_SIZE))
+            size = min(n, self._read_end - self._read_start)
+            n -= size
+            yield self._read_buffer_view(size)
+
+    def _read_row_description(self, n: int) -> messages.RowDescription:
+        """Read a RowDescription message body of n bytes.
+
+        Identical message bodies describe identical result sets, so the parsed
+        message is cached by its raw bytes and shared by every result set with
+        the same layout.
+        """
+        data = self.read_bytes(n)
+        key = (data, self.complex_types_enabled)
+        message = self._row_description_cache.get(key)
+        if message is None:
+            message = messages.RowDescription(data, self.complex_types_enabled)
+            self._row_description_cache.put(key, message)
+        return message
+
+    def row_description_cache_info(self) -> CacheInfo:
+        """Return the statistics of the RowDescription cache of this connection."""
+        return self._row_description_cache.info()
+
+    def prepared_statement_cache_info(self) -> CacheInfo:
+        """Return the statistics of the prepared statement cache of this connection."""
+        return self._prepared_statement_cache.info()
+
+    def read_data_rows(self, raw: bool = False) -> Union[List[List[Optional[bytes]]], List[bytes]]:
+        """Decode the consecutive DataRow messages at the head of the receive buffer.
+
+        Every complete DataRow message already received is parsed in one pass and
+        the list of field values of each row is returned, or the message body of
+        each row if `raw` is True. Reading stops before the
+        first message of another type, which is left to read_message(). If the next
+        message is a DataRow that has not been fully received yet, it is read from
+        the server first, so at least one row is returned when the next message is
+        a DataRow.
+        """
+        rows = []
+        try:
+            self._fill_read_buffer(5)
+            if self._read_buffer[self._read_start] != DATA_ROW_ID:
+                return rows
+            size = unpack_from('!I', self._read_buffer, self._read_start + 1)[0]
+            if self._is_streamed(size - 4):
+                return rows
+            self._fill_read_buffer(size + 1)
+
+            buf = self._read_buffer
+            view = self._read_view
+            pos = self._read_start
+            end = self._read_end
+            while end - pos >= 5 and buf[pos] == DATA_ROW_ID:
+                size = unpack_from('!I', buf, pos + 1)[0]
+                if end - pos < size + 1 or self._is_streamed(size - 4):
+                    break
+                # Copy the body out once, field values are then bytes slices of it
+                data = view[pos + 5:pos + size + 1].tobytes()
+                rows.append(data if raw else split_data_row(data))
+                pos += size + 1
+            self._read_start = pos
+        except (SystemError, IOError) as e:
+            self.close_socket()
+            # noinspection PyTypeChecker
+            self._logger.error(e)
+            raise errors.ConnectionError(str(e))
+        self._logger.debug('<= DataRow x %d', len(rows))
+        return rows
+
+    def skip_data_rows(self, max_bytes: Optional[int] = None) -> int:
+        """Discard the consecutive DataRow messages at the head of the server data
+        without parsing them, and return the number of bytes discarded.
+
+        Only the message headers are read, and the messages already received are
+        discarded in bulk. Discarding stops before the first message of another
+        type, which is left to read_message(), or as soon as more than max_bytes
+        are discarded.
+        """
+        skipped = 0
+        try:
+            while max_bytes is None or skipped <= max_bytes:
+                self._fill_read_buffer(5)
+                buf = self._read_buffer
+                start = pos = self._read_start
+                end = self._read_end
+                # Skip the messages that are completely in the buffer
+                while end - pos >= 5 and buf[pos] == DATA_ROW_ID:
+                    next_pos = pos + 1 + _unpack_size(buf, pos + 1)[0]
+                    if next_pos > end:
+                        break
+                    pos = next_pos
+                self._read_start = pos
+                skipped += pos - start
+                if end - pos >= 5:
+                    if buf[pos] != DATA_ROW_ID:
+                        break
+                    # A DataRow that is not completely received yet
+                    size = unpack_from('!I', buf, pos + 1)[0]
+                    self._skip_bytes(size + 1)
+                    skipped += size + 1
+        except (SystemError, IOError) as e:
+            self.close_socket()
+            # noinspection PyTypeChecker
+            self._logger.error(e)
+            raise errors.ConnectionError(str(e))
+        return skipped
+
+    def _skip_bytes(self, n: int) -> None:
+        """Consume the next n bytes of the server data without looking at them."""
+        available = self._read_end - self._read_start
+        if n <= available:
+            self._read_start += n
+            return
+        n -= available
+        # Receive the bytes into a new buffer, so that no view of the current one
+        # is overwritten, and reuse it until they are all received
+        self._reset_read_buffer()
+        vsocket = self._socket()
+        while True:
+            received = vsocket.recv_into(self._read_view)
+            if received == 0:
+                raise errors.ConnectionError("Connection closed by Vertica")
+            if received >= n:
+                self._read_start = n
+                self._read_end = received
+                return
+            n -= received
+
     def read_expected_message(self, expected_types, error_handler=None):
         # Reads a message and does some basic error handling.
         # expected_types must be a class (e.g. messages.BindComplete) or a tuple of classes
@@ -876,22 +1212,36 @@ class Connection:
             raise errors.MessageError(msg)
 
     def read_bytes(self, n: int) -> bytes:
-        if n == 1:
-            result = self._socket_as_file().read(1)
-            if not result:
+        return self._read_buffer_view(n).tobytes()
+
+    def _read_buffer_view(self, n: int) -> memoryview:
+        """Consume the next n bytes of the receive buffer and return a view of them."""
+        self._fill_read_buffer(n)
+        start = self._read_start
+        self._read_start = start + n
+        return self._read_view[start:start + n]
+
+    def _fill_read_buffer(self, n: int) -> None:
+        """Receive data from the server until at least n unread bytes are buffered."""
+        available = self._read_end - self._read_start
+        if available >= n:
+            return
+        if self._read_start + n > len(self._read_buffer):
+            # Not enough room behind the unread data, move it into a new buffer.
+            # Views returned by _read_buffer_view() keep referencing the old buffer,
+            # so it is never resized or overwritten while they are alive.
+            buf = bytearray(max(n, DEFAULT_READ_BUFFER_SIZE))
+            buf[:available] = self._read_view[self._read_start:self._read_end]
+            self._read_buffer = buf
+            self._read_view = memoryview(buf)
+            self._read_start = 0
+            self._read_end = available
+        vsocket = self._socket()
+        while self._read_end - self._read_start < n:
+            received = vsocket.recv_into(self._read_view[self._read_end:])
+            if received == 0:
                 raise errors.ConnectionError("Connection closed by Vertica")
-            return result
-        else:
-            buf = b""
-            to_read = n
-            while to_read > 0:
-                data = self._socket_as_file().read(to_read)
-                received = len(data)
-                if received == 0:
-                    raise errors.ConnectionError("Connection closed by Vertica")
-                buf += data
-                to_read -= received
-            return buf
+            self._read_end += received
 
     def send_GSS_response_and_receive_challenge(self, response):
         # Send the GSS response data to the vertica server
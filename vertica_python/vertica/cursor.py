@@ -49,7 +49,9 @@ from io import IOBase, BytesIO, StringIO
 from math import isnan
 from tempfile import NamedTemporaryFile, SpooledTemporaryFile, TemporaryFile
 from uuid import UUID
-from collections import OrderedDict
+from collections import OrderedDict, deque
+from functools import partial
+from itertools import count
 
 # _TemporaryFileWrapper is an undocumented implementation detail, so
 # import defensively.
@@ -58,19 +60,26 @@ try:
 except ImportError:
     _TemporaryFileWrapper = None
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, NamedTuple
 if TYPE_CHECKING:
     from typing import IO, Any, AnyStr, Callable, Dict, Generator, List, NoReturn, Optional, Sequence, Tuple, Type, TypeVar, Union
     from typing_extensions import Self
+    import numpy
+    import pandas
+    import pyarrow
     from .connection import Connection
     from logging import Logger
     T = TypeVar('T')
 
 from .. import errors, os_utils
 from ..compat import as_str
-from ..vertica import messages
-from ..vertica.column import Column
+from ..datatypes import VerticaType
+from ..vertica import columnar, messages
+from ..vertica.cellstream import CellStream, StreamedRow
+from ..vertica.column import Column, FormatCode
 from ..vertica.deserializer import Deserializer
+from ..vertica.messages.backend_messages.data_row import split_data_row
+from ..vertica.row import LazyRow, LazyRowLayout, Row, column_index, namedtuple_type
 from ..vertica.messages.message import BackendMessage
 
 
@@ -134,6 +143,43 @@ RE_BASIC_INSERT_STAT = (
 END_OF_RESULT_RESPONSES = (messages.CommandComplete, messages.PortalSuspended)
 END_OF_BATCH_RESPONSES = (messages.WriteFile, messages.EndOfBatchResponse)
 DEFAULT_BUFFER_SIZE = 131072
+DEFAULT_FETCH_BATCH_SIZE = 1024
+DEFAULT_COLUMNAR_BATCH_SIZE = 65536
+
+# Row decoders kept for a RowDescription, each built for a different converter
+# registry or deserialization context
+MAX_ROW_DECODERS_PER_DESCRIPTION = 8
+
+# The Python types of the parameter values with which the preparation and first
+# execution of a statement are pipelined (see Cursor._prepare_and_execute()).
+# The parameters are declared of unknown type, like string literals, so the
+# server infers their types from the query, as when it describes the statement
+# first. The prepared statement is reused for values of any type.
+PIPELINE_PARAMETER_TYPES = frozenset([bool, int, float, str])
+
+# The result column types transferred in binary format when the connection option
+# mixed_result_formats is set: fixed-width types, which are smaller in binary and
+# decode at least as fast, and binary strings, which need no unescaping. Strings
+# are the same in both formats, and the server sends NUMERIC values as text.
+MIXED_BINARY_RESULT_TYPES = frozenset([
+    VerticaType.BOOL, VerticaType.INT8, VerticaType.FLOAT8, VerticaType.DATE,
+    VerticaType.TIME, VerticaType.TIMETZ, VerticaType.TIMESTAMP, VerticaType.TIMESTAMPTZ,
+    VerticaType.INTERVAL, VerticaType.INTERVALYM, VerticaType.UUID,
+    VerticaType.BINARY, VerticaType.VARBINARY, VerticaType.LONGVARBINARY,
+])
+
+
+class PreparedStatement(NamedTuple):
+    """A statement prepared on the server, kept in the prepared statement cache
+    of the connection with the metadata the server described it with."""
+    name: str
+    parameters: List[Dict[str, Any]]
+    row_description: Optional[messages.RowDescription]
+
+
+# Versions of the sqldata converter registries, unique across cursors.
+# Version 0 stands for the default converters.
+_converter_versions = count(1)
 
 
 class Cursor:
@@ -143,21 +189,32 @@ class Cursor:
     def __init__(self,
                  connection: Connection,
                  logger: Logger,
-                 cursor_type: Union[None, str, Type[List[Any]], Type[Dict[Any, Any]]] = None,
+                 cursor_type: Union[None, str, Type[List[Any]], Type[Dict[Any, Any]],
+                                    Type[Tuple[Any, ...]], Type[Row], Type[LazyRow]] = None,
                  unicode_error: Optional[str] = None) -> None:
         self.connection = connection
         self._logger = logger
+        # DataRow values decoded in a batch that have not been fetched yet, or
+        # DataRow message bodies for lazy rows. They precede self._message in the result set.
+        self._row_buffer = deque()
+        self._row_factory = None
         self.cursor_type = cursor_type
         self.unicode_error = unicode_error if unicode_error is not None else 'strict'
         self._closed = False
         self._message = None
         self.operation = None
         self.prepared_sql = None  # last statement been prepared
-        self.prepared_name = "s0"
         self._sql_literal_adapters = {}
         self._disable_sqldata_converter = False
         self._sqldata_converters = {}
+        self._sqldata_column_converters = {}
+        self._sqldata_converters_version = 0
         self._des = Deserializer()
+        self._row_description = None
+        self._large_cell_threshold = None
+        self._large_cell_sink = None
+        self._result_type_formats = {}
+        self._result_column_formats = {}
 
         #
         # dbapi attributes
@@ -175,6 +232,22 @@ class Cursor:
     def __exit__(self, type_, value, traceback):
         self.close()
 
+    @property
+    def cursor_type(self) -> Union[None, str, Type[List[Any]], Type[Dict[Any, Any]],
+                                   Type[Tuple[Any, ...]], Type[Row], Type[LazyRow]]:
+        return self._cursor_type
+
+    @cursor_type.setter
+    def cursor_type(self, value: Union[None, str, Type[List[Any]], Type[Dict[Any, Any]],
+                                       Type[Tuple[Any, ...]], Type[Row], Type[LazyRow]]) -> None:
+        self._cursor_type = value
+        self._row_factory = None
+        self._lazy_rows = value in (LazyRow, 'lazy')
+        if not self._lazy_rows and any(isinstance(r, bytes) for r in self._row_buffer):
+            # rows buffered for lazy rows
+            self._row_buffer = deque(split_data_row(r) if isinstance(r, bytes) else r
+                                     for r in self._row_buffer)
+
     #############################################
     # decorators
     #############################################
@@ -201,8 +274,7 @@ class Cursor:
     def close(self) -> None:
         """Close the cursor now."""
         self._logger.info('Close the cursor')
-        if not self.closed() and self.prepared_sql:
-            self._close_prepared_statement()
+        # The prepared statements are kept by the connection for other cursors
         self._closed = True
 
     @handle_ctrl_c
@@ -250,9 +322,12 @@ class Cursor:
                         'with use_prepared_statements=False setting.')
 
             # If the SQL has not been prepared, prepare the SQL
-            if operation != self.prepared_sql:
+            if not self._select_prepared_statement(operation):
+                parameter_type_oids = self._pipeline_parameter_types(parameters)
+                if parameter_type_oids is not None:
+                    self._prepare_and_execute(operation, parameters or (), parameter_type_oids)
+                    return self
                 self._prepare(operation)
-                self.prepared_sql = operation  # the prepared statement is kept
 
             # Bind the parameters and execute
             self._execute_prepared_statement([parameters])
@@ -296,9 +371,8 @@ class Cursor:
             if not all(isinstance(elem, (list, tuple)) for elem in seq_of_parameters):
                 raise TypeError("Each seq_of_parameters element should be a list/tuple")
             # If the SQL has not been prepared, prepare the SQL
-            if operation != self.prepared_sql:
+            if not self._select_prepared_statement(operation):
                 self._prepare(operation)
-                self.prepared_sql = operation  # the prepared statement is kept
 
             # Bind the parameters and execute
             self._execute_prepared_statement(seq_of_parameters)
@@ -332,38 +406,10 @@ class Cursor:
 
     def fetchone(self) -> Optional[Union[List[Any], OrderedDict[str, Any]]]:
         """Return the next record from the current statement result set."""
-        while True:
-            if isinstance(self._message, messages.DataRow):
-                if self.rowcount == -1:
-                    self.rowcount = 1
-                else:
-                    self.rowcount += 1
-                row = self.row_formatter(self._message)
-                # fetch next message
-                self._message = self.connection.read_message()
-                return row
-            elif isinstance(self._message, messages.RowDescription):
-                self.description = self._message.get_description()
-                self._deserializers = self.get_deserializers()
-            elif isinstance(self._message, messages.ReadyForQuery):
-                return None
-            elif isinstance(self._message, END_OF_RESULT_RESPONSES):
-                return None
-            elif isinstance(self._message, messages.EmptyQueryResponse):
-                pass
-            elif isinstance(self._message, messages.VerifyFiles):
-                self._handle_copy_local_protocol()
-            elif isinstance(self._message, messages.EndOfBatchResponse):
-                pass
-            elif isinstance(self._message, messages.CopyDoneResponse):
-                pass
-            elif isinstance(self._message, messages.ErrorResponse):
-                raise errors.QueryError.from_error_response(self._message, self.operation)
-            else:
-                raise errors.MessageError('Unexpected fetchone() state: {}'.format(
-                                    type(self._message).__name__))
-
-            self._message = self.connection.read_message()
+        if not self._fill_row_buffer():
+            return None
+        self._count_rows(1)
+        return self._format_row(self._row_buffer.popleft())
 
     def fetchmany(self, size: Optional[int] = None) -> List[Union[List[Any], OrderedDict[str, Any]]]:
         """Return the next `size` records from the current statement result set.
@@ -371,19 +417,94 @@ class Cursor:
         """
         if not size:
             size = self.arraysize
+        return [self._format_row(values) for values in self._fetch_values(size)]
+
+    def fetchall(self) -> List[Union[List[Any], OrderedDict[str, Any]]]:
+        """Return all the remaining records from the current statement result set."""
         results = []
         while True:
-            row = self.fetchone()
-            if not row:
-                break
-            results.append(row)
-            if len(results) >= size:
+            batch = self.fetchmany(DEFAULT_FETCH_BATCH_SIZE)
+            if not batch:
                 break
+            results.extend(batch)
         return results
 
-    def fetchall(self) -> List[Union[List[Any], OrderedDict[str, Any]]]:
-        """Return all the remaining records from the current statement result set."""
-        return list(self.iterate())
+    def fetchmany_numpy(self, size: Optional[int] = None) -> Dict[str, numpy.ma.MaskedArray]:
+        """Return the next `size` records from the current statement result set
+        as a dict of NumPy masked arrays, one per column, in which NULL values are masked.
+        `size` default to `cursor.arraysize` if not specified. Requires NumPy.
+        """
+        if not size:
+            size = self.arraysize
+        converters = self._column_converters()
+        return columnar.numpy_columns(converters, self._fetch_values(size))
+
+    def fetch_numpy(self) -> Dict[str, numpy.ma.MaskedArray]:
+        """Return all the remaining records from the current statement result set
+        as a dict of NumPy masked arrays, one per column, in which NULL values are masked.
+        Requires NumPy.
+        """
+        converters = self._column_converters()
+        batches = [columnar.numpy_columns(converters, self._fetch_values(DEFAULT_COLUMNAR_BATCH_SIZE))]
+        while True:
+            rows = self._fetch_values(DEFAULT_COLUMNAR_BATCH_SIZE)
+            if not rows:
+                break
+            batches.append(columnar.numpy_columns(converters, rows))
+        return columnar.concat_numpy_columns(batches)
+
+    def fetch_arrow_batches(self, batch_rows: int = DEFAULT_COLUMNAR_BATCH_SIZE,
+                            dictionary_encode: bool = False) -> Generator[pyarrow.RecordBatch, None, None]:
+        """Yield the remaining records from the current statement result set as
+        Apache Arrow RecordBatches of up to `batch_rows` rows. If `dictionary_encode`
+        is True, CHAR/VARCHAR/LONG VARCHAR columns are dictionary-encoded.
+        Requires pyarrow.
+        """
+        converters = self._column_converters()
+        while True:
+            rows = self._fetch_values(batch_rows)
+            if not rows:
+                break
+            yield columnar.arrow_record_batch(converters, rows, dictionary_encode)
+
+    def fetch_arrow_table(self, dictionary_encode: bool = False) -> pyarrow.Table:
+        """Return all the remaining records from the current statement result set
+        as an Apache Arrow Table. If `dictionary_encode` is True, CHAR/VARCHAR/LONG VARCHAR
+        columns are dictionary-encoded. Requires pyarrow.
+        """
+        converters = self._column_converters()
+        batches = []
+        while True:
+            rows = self._fetch_values(DEFAULT_COLUMNAR_BATCH_SIZE)
+            if not rows:
+                break
+            batches.append(columnar.arrow_record_batch(converters, rows, dictionary_encode))
+        return columnar.arrow_table(converters, batches, dictionary_encode)
+
+    def fetch_dataframe(self, chunksize: Optional[int] = None
+                        ) -> Union[pandas.DataFrame, Generator[pandas.DataFrame, None, None]]:
+        """Return all the remaining records from the current statement result set
+        as a pandas DataFrame. If `chunksize` is specified, return a generator of
+        DataFrames of up to `chunksize` rows instead. Requires pandas.
+        """
+        builder = columnar.DataFrameBuilder(self._column_converters())
+        if chunksize is not None:
+            return self._iterate_dataframes(builder, chunksize)
+        while True:
+            rows = self._fetch_values(DEFAULT_COLUMNAR_BATCH_SIZE)
+            if not rows:
+                break
+            builder.append(rows)
+        return builder.build()
+
+    def _iterate_dataframes(self, builder: columnar.DataFrameBuilder,
+                            chunksize: int) -> Generator[pandas.DataFrame, None, None]:
+        while True:
+            rows = self._fetch_values(chunksize)
+            if not rows:
+                break
+            builder.append(rows)
+            yield builder.build()
 
     def nextset(self) -> bool:
         """
@@ -403,8 +524,7 @@ class Cursor:
             # there might be another set, read next message to find out
             self._message = self.connection.read_message()
             if isinstance(self._message, messages.RowDescription):
-                self.description = self._message.get_description()
-                self._deserializers = self.get_deserializers()
+                self._set_description(self._message)
                 self._message = self.connection.read_message()
                 if isinstance(self._message, messages.VerifyFiles):
                     self._handle_copy_local_protocol()
@@ -458,10 +578,12 @@ class Cursor:
 
     def iterate(self) -> Generator[Union[List[Any], OrderedDict[str, Any]], None, None]:
         """Yield the next record from the current statement result set."""
-        row = self.fetchone()
-        while row:
-            yield row
-            row = self.fetchone()
+        while self._fill_row_buffer():
+            while self._row_buffer:
+                # Rows stay in the buffer until they are yielded, so that
+                # fetch*() calls after leaving the loop continue from here.
+                self._count_rows(1)
+                yield self._format_row(self._row_buffer.popleft())
 
     def copy(self, sql: str, data: Union[IO[AnyStr], bytes, str], **kwargs: Any) -> None:
         """
@@ -548,6 +670,7 @@ class Cursor:
         If set to True, bypass conversions from SQL type raw data to the native Python object.
         """
         self._disable_sqldata_converter = bool(value)
+        self._row_factory = None
 
     def register_sqldata_converter(self, oid: int, converter_func: Callable[[bytes, Dict[str, Any]], Any]) -> None:
         """Customize how SQL data values are converted to Python objects when query results are returned."""
@@ -557,49 +680,311 @@ class Cursor:
         if not callable(converter_func):
             raise TypeError("Cannot register this sqldata converter. The converter is not callable.")
 
-        # For an oid, transfer format (BINARY/TEXT) is fixed in a connection
+        # For an oid, transfer format (BINARY/TEXT) is fixed in a connection,
+        # unless set_result_formats() chooses it by column
         self._sqldata_converters[oid] = converter_func
-        # For prepared statements, need to reset self._deserializers
-        if self.description: self._deserializers = self.get_deserializers()
+        self._sqldata_converters_changed()
 
     def unregister_sqldata_converter(self, oid: int) -> None:
         """Cancel customized SQL data values converter and use the default converter."""
         if oid in self._sqldata_converters:
             del self._sqldata_converters[oid]
-            # For prepared statements, need to reset self._deserializers
-            if self.description: self._deserializers = self.get_deserializers()
+            self._sqldata_converters_changed()
         else:
             no_such_oid = f'Nothing was unregistered (oid={oid})'
             warnings.warn(no_such_oid)
 
+    def register_column_converter(self, column: Union[int, str],
+                                  converter_func: Optional[Callable[[bytes, Dict[str, Any]], Any]]) -> None:
+        """Customize how the values of a query result column are converted to Python objects.
+
+        The column is identified by its name or by its position in the result set, and
+        the converter applies to that column in the results of all following queries.
+        It takes precedence over the converter registered for the column type with
+        register_sqldata_converter(). If converter_func is None, the raw bytes of
+        the column are returned without conversion.
+        """
+        if isinstance(column, bool) or not isinstance(column, (int, str)):
+            raise TypeError(f"column converters should be registered on a column name or index, got {column} instead.")
+
+        if converter_func is not None and not callable(converter_func):
+            raise TypeError("Cannot register this column converter. The converter is not callable.")
+
+        self._sqldata_column_converters[column] = converter_func
+        self._sqldata_converters_changed()
+
+    def unregister_column_converter(self, column: Union[int, str]) -> None:
+        """Cancel the converter of a column and use the converter for the column type."""
+        if column in self._sqldata_column_converters:
+            del self._sqldata_column_converters[column]
+            self._sqldata_converters_changed()
+        else:
+            warnings.warn(f'Nothing was unregistered (column={column!r})')
+
+    def set_result_formats(self, types: Optional[Dict[int, int]] = None,
+                           columns: Optional[Dict[Union[int, str], int]] = None) -> None:
+        """Choose the transfer format, FormatCode.TEXT or FormatCode.BINARY, of the
+        result columns of the prepared statements executed from now on.
+
+        `types` maps column type oids to formats, and `columns` maps column names
+        or positions to formats, which take precedence. The formats of the other
+        columns are chosen by the connection options mixed_result_formats and
+        binary_transfer. NUMERIC columns are always transferred as text. Each call
+        replaces the formats chosen by the previous one.
+        """
+        types = dict(types or {})
+        columns = dict(columns or {})
+        for key in types:
+            if isinstance(key, bool) or not isinstance(key, int):
+                raise TypeError(f"result formats should be chosen by oid integer, got {key!r} instead.")
+        for key in columns:
+            if isinstance(key, bool) or not isinstance(key, (int, str)):
+                raise TypeError(f"result formats should be chosen by column name or index, got {key!r} instead.")
+        for fmt in (*types.values(), *columns.values()):
+            if fmt not in (FormatCode.TEXT, FormatCode.BINARY):
+                raise ValueError(f"result format should be FormatCode.TEXT or FormatCode.BINARY, got {fmt!r} instead.")
+        self._result_type_formats = types
+        self._result_column_formats = columns
+
+    def stream_large_cells(self, threshold: Optional[int],
+                           sink: Optional[Callable[[Column], IO[bytes]]] = None) -> None:
+        """Receive the string and binary values larger than threshold bytes as files,
+        without reading them into memory.
+
+        A large value is written to a file as it is received, and the row holds the
+        file instead of a str/bytes object. The file is the one returned by
+        sink(column), or else a temporary file rewound to its start. The file holds
+        UTF-8 text for CHAR/VARCHAR/LONG VARCHAR columns and bytes for
+        BINARY/VARBINARY/LONG VARBINARY columns. Other values are converted as usual.
+        If threshold is None, values are no longer streamed.
+        """
+        if threshold is not None and (isinstance(threshold, bool) or not isinstance(threshold, int)):
+            raise TypeError(f"threshold should be an int or None, got {threshold!r} instead.")
+        if threshold is not None and threshold < 0:
+            raise ValueError(f"threshold should not be negative, got {threshold} instead.")
+        if sink is not None and not callable(sink):
+            raise TypeError("Cannot stream to this sink. The sink is not callable.")
+        self._large_cell_threshold = threshold
+        self._large_cell_sink = sink
+        self._set_cell_stream()
+
+    def _set_cell_stream(self) -> None:
+        if self._large_cell_threshold is None or not self.description:
+            self.connection._cell_stream = None
+        else:
+            self.connection._cell_stream = CellStream(
+                self.description, self._large_cell_threshold, self._large_cell_sink)
+
+    def _sqldata_converters_changed(self) -> None:
+        if self._sqldata_converters or self._sqldata_column_converters:
+            self._sqldata_converters_version = next(_converter_versions)
+        else:
+            self._sqldata_converters_version = 0
+        # For prepared statements, need to reset self._row_decoder
+        if self.description: self._row_decoder = self.get_row_decoder()
+        self._row_factory = None
+
 
     #############################################
     # internal
     #############################################
     def get_deserializers(self):
         return self._des.get_row_deserializers(
-                  self.description, self._sqldata_converters,
-                  {'unicode_error': self.unicode_error,
-                   'session_tz': self.connection.parameters.get('timezone', 'unknown'),
-                   'complex_types_enabled': self.connection.complex_types_enabled,}
-               )
+                  self.description, self._sqldata_converters, self._deserializer_context(),
+                  self._get_column_converters())
+
+    def _get_column_converters(self) -> Optional[Dict[int, Optional[Callable[[bytes, Dict[str, Any]], Any]]]]:
+        """Map the positions of the columns of the current result set to the
+        converters registered for them by register_column_converter().
+        """
+        if not self._sqldata_column_converters or not self.description:
+            return None
+        result = {}
+        num_columns = len(self.description)
+        for idx, col in enumerate(self.description):
+            if col.name in self._sqldata_column_converters:
+                result[idx] = self._sqldata_column_converters[col.name]
+        # a converter registered by column index takes precedence
+        for key, converter_func in self._sqldata_column_converters.items():
+            if isinstance(key, int) and -num_columns <= key < num_columns:
+                result[key % num_columns] = converter_func
+        return result
+
+    def get_row_decoder(self):
+        context = self._deserializer_context()
+        if self._row_description is None:
+            return self._des.get_row_decoder(self.description, self._sqldata_converters, context,
+                                             self._get_column_converters())
+        # The RowDescription may be shared by many result sets (see Connection.read_message()),
+        # so the row decoders built for it are kept along with it.
+        key = (self._sqldata_converters_version, *context.values())
+        decoders = self._row_description.row_decoders
+        decoder = decoders.get(key)
+        if decoder is None:
+            if len(decoders) >= MAX_ROW_DECODERS_PER_DESCRIPTION:
+                decoders.clear()
+            decoder = decoders[key] = self._des.get_row_decoder(
+                self.description, self._sqldata_converters, context, self._get_column_converters())
+        return decoder
+
+    def _set_description(self, row_description: Optional[messages.RowDescription]) -> None:
+        self._row_description = row_description
+        self._row_factory = None
+        if row_description is None:
+            self.description = None
+        else:
+            self.description = row_description.get_description()
+            self._row_decoder = self.get_row_decoder()
+        self._set_cell_stream()
+
+    def _deserializer_context(self) -> Dict[str, Any]:
+        return {'unicode_error': self.unicode_error,
+                'session_tz': self.connection.parameters.get('timezone', 'unknown'),
+                'complex_types_enabled': self.connection.complex_types_enabled,
+                'timestamptz_output': self.connection.options.get('timestamptz_output', 'session'),
+                'numeric_output': self.connection.options.get('numeric_output', 'decimal'),
+                'interval_output': self.connection.options.get('interval_output', 'relativedelta'),
+                'array_output': self.connection.options.get('array_output', 'list'),
+                'decode_cache_size': self.connection.options.get('decode_cache_size', 0),}
+
+    def _fill_row_buffer(self) -> bool:
+        """Read messages until rows of the current result set are in self._row_buffer.
+
+        Return False if the end of the result set is reached instead.
+        """
+        while not self._row_buffer:
+            if isinstance(self._message, messages.DataRow):
+                self._buffer_data_rows()
+                continue
+            elif isinstance(self._message, messages.RowDescription):
+                self._set_description(self._message)
+            elif isinstance(self._message, messages.ReadyForQuery):
+                return False
+            elif isinstance(self._message, END_OF_RESULT_RESPONSES):
+                return False
+            elif isinstance(self._message, messages.EmptyQueryResponse):
+                pass
+            elif isinstance(self._message, messages.VerifyFiles):
+                self._handle_copy_local_protocol()
+            elif isinstance(self._message, messages.EndOfBatchResponse):
+                pass
+            elif isinstance(self._message, messages.CopyDoneResponse):
+                pass
+            elif isinstance(self._message, messages.ErrorResponse):
+                raise errors.QueryError.from_error_response(self._message, self.operation)
+            else:
+                raise errors.MessageError('Unexpected fetchone() state: {}'.format(
+                                    type(self._message).__name__))
+
+            self._message = self.connection.read_message()
+        return True
+
+    def _fetch_values(self, size: Optional[int] = None) -> List[List[Optional[bytes]]]:
+        """Return the raw field values of the next `size` rows of the current
+        result set, or of all the remaining rows if `size` is None.
+        """
+        rows = []
+        while (size is None or len(rows) < size) and self._fill_row_buffer():
+            n = len(self._row_buffer)
+            if size is not None:
+                n = min(size - len(rows), n)
+            rows.extend(self._row_buffer.popleft() for _ in range(n))
+            self._count_rows(n)
+        if self._lazy_rows:
+            rows = [split_data_row(r) if isinstance(r, bytes) else r for r in rows]
+        return rows
+
+    def _column_converters(self) -> List[columnar.ColumnConverter]:
+        """Return the converters of the columns of the current result set for columnar fetches."""
+        if self._large_cell_threshold is not None:
+            raise errors.NotSupportedError('Columnar fetches do not support streaming large values.'
+                                           ' Call stream_large_cells(None) first.')
+        # The description is known once the first message of the result set is read
+        self._fill_row_buffer()
+        if not self.description:
+            return []
+        context = self._deserializer_context()
+        convert = not self._disable_sqldata_converter
+        column_converters = self._get_column_converters() or {}
+        converters = []
+        for idx, col in enumerate(self.description):
+            if idx in column_converters:
+                converters.append(columnar.ColumnConverter(
+                    col, self._sqldata_converters, context, convert, column_converters[idx]))
+            else:
+                converters.append(columnar.ColumnConverter(
+                    col, self._sqldata_converters, context, convert))
+        return converters
+
+    def _count_rows(self, n: int) -> None:
+        if self.rowcount == -1:
+            self.rowcount = n
+        else:
+            self.rowcount += n
+
+    def _buffer_data_rows(self) -> None:
+        """Decode the current DataRow together with the following DataRows that
+        have already been received, then read the message after them.
+        """
+        if self._lazy_rows:
+            self._row_buffer.append(self._message.data)
+            self._row_buffer.extend(self.connection.read_data_rows(raw=True))
+        else:
+            self._row_buffer.append(self._message.values)
+            self._row_buffer.extend(self.connection.read_data_rows())
+        self._message = self.connection.read_message()
 
     def flush_to_query_ready(self) -> None:
+        self._row_buffer.clear()
         # if the last message isn't empty or ReadyForQuery, read all remaining messages
         if self._message is None \
                 or isinstance(self._message, messages.ReadyForQuery):
             return
 
+        # The remaining rows are discarded unparsed. If they turn out to be many,
+        # the query is canceled so that the server stops sending them.
+        threshold = self.connection.options.get('drain_cancel_threshold', 0)
+        skipped = 0
+        cancel_pending = False
         while True:
+            if threshold > 0 and skipped <= threshold:
+                skipped += self.connection.skip_data_rows(threshold - skipped)
+                if skipped > threshold:
+                    cancel_pending = self._cancel_abandoned_query(skipped)
+                    continue
+            else:
+                self.connection.skip_data_rows()
             message = self.connection.read_message()
+            if (cancel_pending and isinstance(message, messages.ErrorResponse) and
+                    errors.QUERY_ERROR_CLASSES.get(message.sqlstate) is errors.QueryCanceled):
+                self._logger.info('The abandoned query was canceled')
+                cancel_pending = False
             if isinstance(message, messages.ReadyForQuery):
+                if cancel_pending:
+                    # The server handles cancel requests asynchronously
+                    self._logger.warning('The abandoned query ended before it was canceled.'
+                                         ' The cancel request may cancel the next query instead')
                 self._message = message
                 break
             elif isinstance(message, messages.VerifyFiles):
                 self._message = message
                 self._handle_copy_local_protocol()
 
+    def _cancel_abandoned_query(self, skipped: int) -> bool:
+        """Cancel the query whose rows are being discarded, and return whether
+        the cancel request was sent."""
+        self._logger.info('Canceling the query after discarding {} bytes of'
+                          ' unfetched rows'.format(skipped))
+        try:
+            self.connection.cancel()
+        except Exception as e:
+            # The rest of the result is then discarded as it arrives
+            self._logger.warning('Failed to cancel the query: {}'.format(e))
+            return False
+        return True
+
     def flush_to_end_of_result(self) -> None:
+        self._row_buffer.clear()
         # if the last message isn't empty or END_OF_RESULT_RESPONSES,
         # read messages until it is
         if (self._message is None or
@@ -608,6 +993,8 @@ class Cursor:
             return
 
         while True:
+            # The remaining rows are discarded unparsed
+            self.connection.skip_data_rows()
             message = self.connection.read_message()
             if (isinstance(message, messages.ReadyForQuery) or
                 isinstance(message, END_OF_RESULT_RESPONSES)):
@@ -615,29 +1002,76 @@ class Cursor:
                 break
 
     def row_formatter(self, row_data):
-        if self.cursor_type is None:
-            return self.format_row_as_array(row_data)
-        elif self.cursor_type in (list, 'list'):
-            return self.format_row_as_array(row_data)
-        elif self.cursor_type in (dict, 'dict'):
-            return self.format_row_as_dict(row_data)
+        return self._format_row(row_data.values)
+
+    def _format_row(self, values):
+        factory = self._row_factory
+        if factory is None:
+            factory = self._row_factory = self._get_row_factory()
+        if values.__class__ is StreamedRow:
+            return self._format_streamed_row(values, factory)
+        if not (self._lazy_rows or self._disable_sqldata_converter):
+            values = self._row_decoder(values)
+        return factory(values)
+
+    def _format_streamed_row(self, values: StreamedRow, factory: Callable[..., Any]) -> Any:
+        """Format a row read by a CellStream. Its streamed values are files, which
+        are not converted.
+        """
+        if self._lazy_rows:
+            return factory(values, cells=values.cells)
+        row = list(values) if self._disable_sqldata_converter else self._row_decoder(values)
+        for idx, cell in values.cells.items():
+            row[idx] = cell
+        return factory(row)
+
+    def _get_row_factory(self) -> Callable[[List[Any]], Any]:
+        """Return the function that creates a row of the cursor_type from the list
+        of column values. It is built once per result set.
+        """
+        cursor_type = self.cursor_type
+        if cursor_type is None or cursor_type in (list, 'list'):
+            return lambda values: values
+        elif cursor_type in (dict, 'dict'):
+            names = [descr.name for descr in self.description]
+            return lambda values: OrderedDict(zip(names, values))
+        elif cursor_type in (tuple, 'tuple'):
+            return tuple
+        elif cursor_type == 'namedtuple':
+            return namedtuple_type([descr.name for descr in self.description])._make
+        elif cursor_type in (Row, 'row'):
+            index = column_index([descr.name for descr in self.description])
+            return lambda values: Row(values, index)
+        elif cursor_type in (LazyRow, 'lazy'):
+            if self._disable_sqldata_converter:
+                converters = [None] * len(self.description)
+            else:
+                converters = self._des.get_column_converters(
+                    self.description, self._sqldata_converters, self._deserializer_context(),
+                    self._get_column_converters())
+            layout = LazyRowLayout(converters, column_index([descr.name for descr in self.description]))
+            return partial(LazyRow, layout=layout)
         else:
             raise TypeError('Unrecognized cursor_type: {0}'.format(self.cursor_type))
 
     def format_row_as_dict(self, row_data) -> OrderedDict[str, Any]:
+        return self._format_values_as_dict(row_data.values)
+
+    def format_row_as_array(self, row_data) -> List[Any]:
+        return self._format_values_as_array(row_data.values)
+
+    def _format_values_as_dict(self, values) -> OrderedDict[str, Any]:
         if self._disable_sqldata_converter:
             return OrderedDict((descr.name, value)
-                    for descr, value in zip(self.description, row_data.values))
+                    for descr, value in zip(self.description, values))
         return OrderedDict(
-            (descr.name, convert(value))
-            for descr, convert, value in zip(self.description, self._deserializers, row_data.values)
+            zip((descr.name for descr in self.description), self._row_decoder(values))
         )
 
-    def format_row_as_array(self, row_data) -> List[Any]:
+    def _format_values_as_array(self, values) -> List[Any]:
         if self._disable_sqldata_converter:
-            return row_data.values
-        return [convert(value)
-                for convert, value in zip(self._deserializers, row_data.values)]
+            return values
+        return self._row_decoder(values)
 
     def object_to_string(self, py_obj: Any, is_copy_data: bool, is_collection: bool = False) -> str:
         """Return the SQL representation of the object as a string"""
@@ -780,8 +1214,7 @@ class Cursor:
         if isinstance(self._message, messages.ErrorResponse):
             raise errors.QueryError.from_error_response(self._message, query)
         elif isinstance(self._message, messages.RowDescription):
-            self.description = self._message.get_description()
-            self._deserializers = self.get_deserializers()
+            self._set_description(self._message)
             self._message = self.connection.read_message()
             if isinstance(self._message, messages.ErrorResponse):
                 raise errors.QueryError.from_error_response(self._message, query)
@@ -943,6 +1376,8 @@ class Cursor:
 
     def _error_handler(self, msg: BackendMessage) -> NoReturn:
         self.connection.write(messages.Sync())
+        # The ReadyForQuery of the Sync is read before the next statement
+        self._message = msg
         raise errors.QueryError.from_error_response(msg, self.operation)
 
     def _prepare(self, query: str) -> None:
@@ -952,38 +1387,179 @@ class Cursor:
         """
         self._logger.info('Prepare a statement: [{}]'.format(query))
 
-        # Send Parse message to server
-        # We don't need to tell the server the parameter types yet
-        self.connection.write(messages.Parse(self.prepared_name, query, param_types=()))
-        # Send Describe message to server
-        self.connection.write(messages.Describe('prepared_statement', self.prepared_name))
-        self.connection.write(messages.Flush())
+        evicted = self._new_prepared_statement()
+        with self.connection.corked():
+            if evicted is not None:
+                self.connection.write(messages.Close('prepared_statement', evicted.name))
+            # Send Parse message to server
+            # We don't need to tell the server the parameter types yet
+            self.connection.write(messages.Parse(self.prepared_name, query, param_types=()))
+            # Send Describe message to server
+            self.connection.write(messages.Describe('prepared_statement', self.prepared_name))
+            self.connection.write(messages.Flush())
+
+        if evicted is not None:
+            # Read expected message: CloseComplete
+            self._message = self.connection.read_expected_message(messages.CloseComplete, self._error_handler)
 
         # Read expected message: ParseComplete
         self._message = self.connection.read_expected_message(messages.ParseComplete, self._error_handler)
 
+        self._read_statement_description(self._error_handler)
+        if len(self._message.command_tag) == 0:
+            msg = 'The statement being prepared is empty'
+            self._logger.error(msg)
+            self.connection.write(messages.Sync())
+            raise errors.EmptyQueryError(msg)
+
+        self._cache_prepared_statement(query)
+        self._logger.info('Finish preparing the statement')
+
+    def _select_prepared_statement(self, query: str) -> bool:
+        """
+        If the query is in the prepared statement cache, make it the statement
+        to execute and return True.
+        """
+        stmt = self.connection._prepared_statement_cache.get(query)
+        if stmt is None:
+            return False
+        self.prepared_sql = query
+        self.prepared_name = stmt.name
+        self._param_metadata = stmt.parameters
+        self._set_description(stmt.row_description)
+        return True
+
+    def _new_prepared_statement(self) -> Optional[PreparedStatement]:
+        """
+        Name the statement about to be prepared with the first of s0, s1, ...
+        that no statement of the prepared statement cache has. If the cache is
+        full, its least recently used statement is evicted and returned, for
+        the caller to close it on the server.
+        """
+        cache = self.connection._prepared_statement_cache
+        evicted = None
+        if cache.maxsize and len(cache) >= cache.maxsize:
+            evicted = cache.evict()[1]
+            self._logger.info('Close the prepared statement {} evicted from the cache'.format(evicted.name))
+        names = {stmt.name for stmt in cache.values()}
+        self.prepared_name = next(name for name in ('s{}'.format(i) for i in count()) if name not in names)
+        self.prepared_sql = None  # until the server parses the query
+        return evicted
+
+    def _cache_prepared_statement(self, query: str) -> None:
+        self.prepared_sql = query  # the prepared statement is kept
+        self.connection._prepared_statement_cache.put(
+            query, PreparedStatement(self.prepared_name, self._param_metadata, self._row_description))
+
+    def _read_statement_description(self, error_handler: Callable[[BackendMessage], NoReturn]) -> None:
+        """
+        Read the response to the Describe message of the prepared statement.
+        """
         # Read expected message: ParameterDescription
-        self._message = self.connection.read_expected_message(messages.ParameterDescription, self._error_handler)
+        self._message = self.connection.read_expected_message(messages.ParameterDescription, error_handler)
         self._param_metadata = self._message.parameters
 
         # Read expected message: RowDescription or NoData
         self._message = self.connection.read_expected_message(
-                        (messages.RowDescription, messages.NoData), self._error_handler)
+                        (messages.RowDescription, messages.NoData), error_handler)
         if isinstance(self._message, messages.NoData):
-            self.description = None  # response was NoData for a DDL/transaction PreparedStatement
+            self._set_description(None)  # response was NoData for a DDL/transaction PreparedStatement
         else:
-            self.description = self._message.get_description()
-            self._deserializers = self.get_deserializers()
+            self._set_description(self._message)
 
         # Read expected message: CommandDescription
-        self._message = self.connection.read_expected_message(messages.CommandDescription, self._error_handler)
+        self._message = self.connection.read_expected_message(messages.CommandDescription, error_handler)
+
+    def _pipeline_parameter_types(self, parameter_values: Optional[Sequence[Any]]) -> Optional[List[int]]:
+        """
+        Return the type oids to declare for the parameters if the statement is
+        to be pipelined, or None if pipelining is disabled or a value is not of
+        a type in PIPELINE_PARAMETER_TYPES.
+        """
+        if not self.connection.options['pipeline_prepared_statements']:
+            return None
+        parameter_values = parameter_values or ()
+        if not all(type(val) in PIPELINE_PARAMETER_TYPES for val in parameter_values):
+            return None
+        return [VerticaType.UNKNOWN] * len(parameter_values)
+
+    def _prepare_and_execute(self, query: str, parameter_values: Sequence[Any],
+                             parameter_type_oids: List[int]) -> None:
+        """
+        Prepare the query and execute it with one set of parameter values in a
+        single round trip: Parse, Describe, Bind, Execute and Sync are sent
+        together, declaring the parameters of unknown type instead of waiting
+        for the server to describe them.
+
+        If the server cannot parse the query with these parameter types, the
+        query is prepared and executed again with _prepare() and
+        _execute_prepared_statement().
+        """
+        self._logger.info('Prepare and execute a statement: [{}]'.format(query))
+        self._logger.info('Bind parameters: {}'.format(parameter_values))
+        portal_name = ""
+        evicted = self._new_prepared_statement()
+        try:
+            with self.connection.corked():
+                if evicted is not None:
+                    self.connection.write(messages.Close('prepared_statement', evicted.name))
+                self.connection.write(messages.Parse(self.prepared_name, query, parameter_type_oids))
+                self.connection.write(messages.Describe('prepared_statement', self.prepared_name))
+                self.connection.write(messages.Bind(portal_name, self.prepared_name,
+                                                    parameter_values, parameter_type_oids,
+                                                    self.connection.options['binary_transfer'],
+                                                    self.connection.options['binary_parameters']))
+                self.connection.write(messages.Execute(portal_name, 0))
+                self.connection.write(messages.Sync())
+                self.connection.write(messages.Flush())
+        except Exception as e:
+            self._logger.error(str(e))
+            # the server will not send anything until we issue a sync
+            self.connection.write(messages.Sync())
+            while not isinstance(self.connection.read_message(), messages.ReadyForQuery):
+                pass
+            self._message = None
+            raise
+
+        # After an error, the server skips the rest of the messages up to the Sync
+        self._message = self.connection.read_message()
+        if evicted is not None and isinstance(self._message, messages.CloseComplete):
+            self._message = self.connection.read_message()
+        if isinstance(self._message, messages.ErrorResponse):
+            self._logger.info('Cannot prepare the statement with parameters of'
+                              ' unknown type: {}'.format(self._message.error_message()))
+            self.flush_to_query_ready()
+            self._prepare(query)
+            self._execute_prepared_statement([parameter_values])
+            return
+        if not isinstance(self._message, messages.ParseComplete):
+            msg = ('Received unexpected message type: {}. Expected type: ParseComplete'
+                   .format(type(self._message).__name__))
+            self._logger.error(msg)
+            raise errors.MessageError(msg)
+
+        self._read_statement_description(self._pipeline_error_handler)
         if len(self._message.command_tag) == 0:
             msg = 'The statement being prepared is empty'
             self._logger.error(msg)
-            self.connection.write(messages.Sync())
+            self.flush_to_query_ready()
             raise errors.EmptyQueryError(msg)
+        self._cache_prepared_statement(query)
+        if len(parameter_values) != len(self._param_metadata):
+            msg = ("Invalid number of parameters for {}: {} given, {} expected"
+                   .format(parameter_values, len(parameter_values), len(self._param_metadata)))
+            self._logger.error(msg)
+            # The server rejects the Bind message
+            self.flush_to_query_ready()
+            raise ValueError(msg)
 
-        self._logger.info('Finish preparing the statement')
+        self._read_execute_response()
+
+    def _pipeline_error_handler(self, msg: BackendMessage) -> NoReturn:
+        # The Sync is already sent, read up to its ReadyForQuery
+        self._message = msg
+        self.flush_to_query_ready()
+        raise errors.QueryError.from_error_response(msg, self.operation)
 
     def _execute_prepared_statement(self, list_of_parameter_values: Sequence[Any]) -> None:
         """
@@ -997,23 +1573,30 @@ class Cursor:
         portal_name = ""
         parameter_type_oids = [metadata['data_type_oid'] for metadata in self._param_metadata]
         parameter_count = len(self._param_metadata)
+        result_format_codes = self._result_format_codes()
 
         try:
-            if len(list_of_parameter_values) == 0:
-                raise ValueError("Empty list/tuple, nothing to execute")
-            for parameter_values in list_of_parameter_values:
-                if parameter_values is None:
-                    parameter_values = ()
-                self._logger.info('Bind parameters: {}'.format(parameter_values))
-                if len(parameter_values) != parameter_count:
-                    msg = ("Invalid number of parameters for {}: {} given, {} expected"
-                           .format(parameter_values, len(parameter_values), parameter_count))
-                    raise ValueError(msg)
-                self.connection.write(messages.Bind(portal_name, self.prepared_name,
-                                             parameter_values, parameter_type_oids,
-                                             self.connection.options['binary_transfer']))
-                self.connection.write(messages.Execute(portal_name, 0))
-            self.connection.write(messages.Sync())
+            # All the messages are sent together, and the buffer is sent before
+            # reading the response to an error
+            with self.connection.corked():
+                if len(list_of_parameter_values) == 0:
+                    raise ValueError("Empty list/tuple, nothing to execute")
+                for parameter_values in list_of_parameter_values:
+                    if parameter_values is None:
+                        parameter_values = ()
+                    self._logger.info('Bind parameters: {}'.format(parameter_values))
+                    if len(parameter_values) != parameter_count:
+                        msg = ("Invalid number of parameters for {}: {} given, {} expected"
+                               .format(parameter_values, len(parameter_values), parameter_count))
+                        raise ValueError(msg)
+                    self.connection.write(messages.Bind(portal_name, self.prepared_name,
+                                                 parameter_values, parameter_type_oids,
+                                                 self.connection.options['binary_transfer'],
+                                                 self.connection.options['binary_parameters'],
+                                                 result_format_codes))
+                    self.connection.write(messages.Execute(portal_name, 0))
+                self.connection.write(messages.Sync())
+                self.connection.write(messages.Flush())
         except Exception as e:
             self._logger.error(str(e))
             # the server will not send anything until we issue a sync
@@ -1021,23 +1604,50 @@ class Cursor:
             self._message = self.connection.read_message()
             raise
 
-        self.connection.write(messages.Flush())
+        if result_format_codes is not None:
+            self._set_description(self._row_description.with_format_codes(result_format_codes))
+        self._read_execute_response()
+
+    def _result_format_codes(self) -> Optional[List[int]]:
+        """
+        Return the formats of the result columns of the prepared statement to
+        request in Bind messages, or None to request the format of the session
+        (see the connection option binary_transfer) for all columns.
+        """
+        mixed = self.connection.options['mixed_result_formats']
+        if self._row_description is None or not (
+                mixed or self._result_type_formats or self._result_column_formats):
+            return None
+        session_format = FormatCode.BINARY if self.connection.options['binary_transfer'] else FormatCode.TEXT
+        num_columns = len(self.description)
+        codes = []
+        for idx, col in enumerate(self.description):
+            if col.type_code == VerticaType.NUMERIC:
+                # The server sends NUMERIC values as text
+                fmt = FormatCode.TEXT
+            elif idx in self._result_column_formats:
+                fmt = self._result_column_formats[idx]
+            elif idx - num_columns in self._result_column_formats:
+                fmt = self._result_column_formats[idx - num_columns]
+            elif col.name in self._result_column_formats:
+                fmt = self._result_column_formats[col.name]
+            elif col.type_code in self._result_type_formats:
+                fmt = self._result_type_formats[col.type_code]
+            elif mixed:
+                fmt = FormatCode.BINARY if col.type_code in MIXED_BINARY_RESULT_TYPES else FormatCode.TEXT
+            else:
+                fmt = session_format
+            codes.append(fmt)
+        return codes
 
+    def _read_execute_response(self) -> None:
+        """
+        Read the response to the first Bind and Execute messages of the prepared
+        statement, up to the first message of the result.
+        """
         # Read expected message: BindComplete
         self.connection.read_expected_message(messages.BindComplete)
 
         self._message = self.connection.read_message()
         if isinstance(self._message, messages.ErrorResponse):
             raise errors.QueryError.from_error_response(self._message, self.prepared_sql)
-
-    def _close_prepared_statement(self) -> None:
-        """
-        Close the prepared statement on the server.
-        """
-        self.prepared_sql = None
-        self.flush_to_query_ready()
-        self.connection.write(messages.Close('prepared_statement', self.prepared_name))
-        self.connection.write(messages.Flush())
-        self._message = self.connection.read_expected_message(messages.CloseComplete)
-        self.connection.write(messages.Sync())
-
@@ -19,8 +19,10 @@ import re
 from datetime import date, datetime, time, timedelta
 from dateutil import tz
 from dateutil.relativedelta import relativedelta
+from codecs import escape_decode
 from decimal import Context, Decimal
-from struct import unpack
+from functools import lru_cache, partial
+from struct import Struct, unpack
 from uuid import UUID
 
 from typing import TYPE_CHECKING
@@ -28,6 +30,12 @@ if TYPE_CHECKING:
     from typing import Any, Callable, Dict, List, Optional, Set, Union
     from ..vertica.column import Column
 
+# orjson is an optional, faster parser of the JSON text of complex type values
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from .. import errors
 from ..compat import as_str, as_bytes
 from ..datatypes import VerticaType
@@ -38,30 +46,269 @@ class Deserializer:
     def get_row_deserializers(self,
                               columns: List[Column],
                               custom_converters: Dict[int, Callable[[bytes, Dict[str, Any]], Any]],
-                              context: Dict[str, Any]) -> List[Callable[[Optional[bytes]], Any]]:
-        result = [None] * len(columns)
-        for idx, col in enumerate(columns):
-            result[idx] = self.get_column_deserializer(col, custom_converters, context)
-        return result
+                              context: Dict[str, Any],
+                              column_converters: Optional[Dict[int, Optional[Callable[[bytes, Dict[str, Any]], Any]]]] = None
+                              ) -> List[Callable[[Optional[bytes]], Any]]:
+        converters = self.get_column_converters(columns, custom_converters, context, column_converters)
+        return [self._nullable(f) for f in converters]
 
     def get_column_deserializer(self,
                                 col: Column,
                                 custom_converters: Dict[int, Callable[[bytes, Dict[str, Any]], Any]],
                                 context: Dict[str, Any]) -> Callable[[Optional[bytes]], Any]:
         """Return a function that inputs a column's raw data and returns a Python object."""
-        if col.type_code in custom_converters:
-            f = custom_converters[col.type_code]
-        else:
-            f = DEFAULTS.get(col.format_code, {}).get(col.type_code)
+        return self._nullable(self.get_column_converter(col, custom_converters, context))
+
+    @staticmethod
+    def _nullable(f: Optional[Callable[[bytes], Any]]) -> Callable[[Optional[bytes]], Any]:
         if f is None:  # skip conversion
             return lambda data: data
 
         def deserializer(data: Optional[bytes]):
             if data is None: # null
                 return None
-            return f(data, ctx={'column': col, **context})
+            return f(data)
         return deserializer
 
+    def get_column_converters(self,
+                              columns: List[Column],
+                              custom_converters: Dict[int, Callable[[bytes, Dict[str, Any]], Any]],
+                              context: Dict[str, Any],
+                              column_converters: Optional[Dict[int, Optional[Callable[[bytes, Dict[str, Any]], Any]]]] = None
+                              ) -> List[Optional[Callable[[bytes], Any]]]:
+        """Return the converter of each column, as returned by get_column_converter().
+
+        column_converters maps column positions to converters that take precedence
+        over the converters for the column types. A converter of None there means
+        that the raw data of the column is returned as is.
+        """
+        result = [None] * len(columns)
+        for idx, col in enumerate(columns):
+            if column_converters and idx in column_converters:
+                f = column_converters[idx]
+                if f is not None:
+                    result[idx] = self.bind_converter(f, col, context)
+            else:
+                result[idx] = self.get_column_converter(col, custom_converters, context)
+        return result
+
+    def get_column_converter(self,
+                             col: Column,
+                             custom_converters: Dict[int, Callable[[bytes, Dict[str, Any]], Any]],
+                             context: Dict[str, Any]) -> Optional[Callable[[bytes], Any]]:
+        """Return a function that converts a column's non-null raw data to a Python object,
+        or None if the raw data is returned as is.
+        """
+        if col.type_code in custom_converters:
+            f = custom_converters[col.type_code]
+        else:
+            f = DEFAULTS.get(col.format_code, {}).get(col.type_code)
+        if f is None:  # skip conversion
+            return None
+        return self.bind_converter(f, col, context)
+
+    def bind_converter(self,
+                       f: Callable[[bytes, Dict[str, Any]], Any],
+                       col: Column,
+                       context: Dict[str, Any]) -> Callable[[bytes], Any]:
+        """Return a function that calls the converter f with the context of the column."""
+        if f is load_varchar_text:
+            return partial(str, encoding='utf-8', errors=context['unicode_error'])
+        if f in CONTEXT_FREE_CONVERTERS:
+            return CONTEXT_FREE_CONVERTERS[f]
+        if f in NUMERIC_OUTPUT_CONVERTERS:
+            output = NUMERIC_OUTPUT_CONVERTERS[f] or context.get('numeric_output', 'decimal')
+            return get_numeric_converter(col, output)
+        if f in INTERVAL_CONVERTERS:
+            output = context.get('interval_output', 'relativedelta')
+            if f is load_interval_text:
+                return partial(_load_interval_text, type_name=col.type_name, output=output)
+            if f is load_intervalYM_text:
+                return partial(_load_intervalYM_text, type_name=col.type_name, output=output)
+            if output == 'timedelta' and f is load_interval_binary:
+                return _load_interval_binary_timedelta
+            if output != 'relativedelta':
+                # microseconds or months
+                return CONTEXT_FREE_CONVERTERS[load_int8_binary]
+        # The output time zone is resolved once for the result set
+        if f is load_timestamptz_text:
+            return partial(_load_timestamptz_text, output=context.get('timestamptz_output', 'session'))
+        if f is load_timestamptz_binary:
+            return partial(_load_timestamptz_binary, timezone=get_timestamptz_timezone(context))
+        if f in COMPLEX_CONVERTERS:
+            if not context['complex_types_enabled']:
+                return partial(str, encoding='utf-8', errors=context['unicode_error'])
+            return self._bind_complex_converter(f, col, context)
+        # The context is built once per column and shared by all of its values
+        ctx = {'column': col, **context}
+        return lambda data: f(data, ctx)
+
+    def _bind_complex_converter(self,
+                                f: Callable[[bytes, Dict[str, Any]], Any],
+                                col: Column,
+                                context: Dict[str, Any]) -> Callable[[bytes], Any]:
+        """Return a function that parses the JSON text of a complex type value with
+        a parser compiled for the column hierarchy.
+        """
+        if f is not load_row_text and not col.child_columns:
+            ctx = {'column': col, **context}
+            return lambda data: f(data, ctx)
+        unicode_error = context['unicode_error']
+        if f is load_row_text:
+            parse = self._compile_row_parser(col, context)
+            return lambda val: parse(loads_json(val, unicode_error))
+        if f is load_set_text:
+            parse = self._compile_array_parser(col, context)
+            return lambda val: set(parse(loads_json(val, unicode_error)))
+        element_type = col.child_columns[0].type_code
+        if context.get('array_output', 'list') == 'numpy' and element_type in NUMPY_ELEMENT_TYPES:
+            # NumPy converts the elements, including the "Infinity" strings of FLOAT
+            from .columnar import import_package
+            to_numpy = partial(_array_to_numpy, import_package('numpy'), NUMPY_ELEMENT_TYPES[element_type])
+            return lambda val: to_numpy(loads_json(val, unicode_error))
+        parse = self._compile_array_parser(col, context)
+        return lambda val: parse(loads_json(val, unicode_error))
+
+    def _compile_array_parser(self, col: Column, context: Dict[str, Any]) -> Callable[[Any], List[Any]]:
+        """Return a function that converts the parsed JSON of an ARRAY/SET value, like parse_array()."""
+        # An array has only one child, all elements in the array are the same type.
+        convert = self._compile_element_parser(col.child_columns[0], context)
+
+        def parse(json_data):
+            if not isinstance(json_data, list):
+                raise TypeError('Expected a list, got {}'.format(json_data))
+            if convert is None:
+                return json_data
+            return [None if element is None else convert(element) for element in json_data]
+        return parse
+
+    def _compile_row_parser(self, col: Column, context: Dict[str, Any]) -> Callable[[Any], Dict[str, Any]]:
+        """Return a function that converts the parsed JSON of a ROW value, like parse_row()."""
+        child_columns = col.child_columns
+        fields = [(child.name, self._compile_element_parser(child, context))
+                  for child in child_columns or ()]
+
+        def parse(json_data):
+            if not isinstance(json_data, dict):
+                raise TypeError('Expected a dict, got {}'.format(json_data))
+            if child_columns is None:   # Special case: SELECT ROW();
+                return json_data
+            if len(json_data) != len(fields): # This situation should never occur
+                raise ValueError('The metadata does not match the fields in the ROW.')
+            parsed_row = {}
+            for key, convert in fields:
+                element = json_data[key]
+                parsed_row[key] = element if element is None or convert is None else convert(element)
+            return parsed_row
+        return parse
+
+    def _compile_element_parser(self, col: Column, context: Dict[str, Any]) -> Optional[Callable[[Any], Any]]:
+        """Return a function that converts a parsed JSON element of the column, like
+        parse_json_element(), or None if the element is returned as is.
+        """
+        type_code = col.type_code
+        if type_code == VerticaType.FLOAT8:
+            # "-Infinity", "Infinity", "NaN"
+            return float
+        if type_code in JSON_TEXT_TYPES:
+            return self.bind_converter(DEFAULTS[FormatCode.TEXT][type_code], col, context)
+        if type_code == VerticaType.NUMERIC:
+            output = context.get('numeric_output', 'decimal')
+            if output == 'scaled_int':
+                scale = col.scale
+                return lambda element: _load_numeric_text_scaled_int(str(element), scale)
+            return float if output == 'float' else Decimal
+        if type_code == VerticaType.UUID:
+            return UUID
+        if type_code == VerticaType.ARRAY:
+            return self._compile_array_parser(col, context)
+        if type_code == VerticaType.ROW:
+            return self._compile_row_parser(col, context)
+        return None
+
+    def get_row_decoder(self,
+                        columns: List[Column],
+                        custom_converters: Dict[int, Callable[[bytes, Dict[str, Any]], Any]],
+                        context: Dict[str, Any],
+                        column_converters: Optional[Dict[int, Optional[Callable[[bytes, Dict[str, Any]], Any]]]] = None
+                        ) -> Callable[[List[Optional[bytes]]], List[Any]]:
+        """Return a function that converts the raw data of a whole row to a list of Python objects.
+
+        Converters are resolved once for the result set, and the body of the function is
+        generated for its exact number of columns, so no per-value dispatch remains.
+        """
+        namespace = {}
+        fields = []
+        converters = self.get_column_converters(columns, custom_converters, context, column_converters)
+        memo_size = context.get('decode_cache_size', 0)
+        memos = {}
+        for idx, f in enumerate(converters):
+            if f is None:
+                fields.append(f'v{idx}')
+                continue
+            if (memo_size > 0 and columns[idx].type_code in MEMOIZABLE_TYPES
+                    and columns[idx].type_code not in custom_converters
+                    and idx not in (column_converters or {})):
+                memo = lru_cache(maxsize=memo_size)(f)
+                memos[f'f{idx}'] = (memo, f)
+                f = memo
+            namespace[f'f{idx}'] = f
+            fields.append(f'None if v{idx} is None else f{idx}(v{idx})')
+        if memos:
+            # Every MEMO_SAMPLE_ROWS rows, the memos with a low hit ratio are dropped
+            namespace['check_memos'] = _MemoChecker(namespace, memos)
+            namespace['rows_to_check'] = MEMO_SAMPLE_ROWS
+            src = ('def decode_row(values):\n'
+                   '    global rows_to_check\n'
+                   '    rows_to_check -= 1\n'
+                   '    if not rows_to_check: check_memos()\n'
+                   f'    {"".join(f"v{idx}, " for idx in range(len(columns)))}= values\n'
+                   f'    return [{", ".join(fields)}]\n')
+        elif columns:
+            src = ('def decode_row(values):\n'
+                   f'    {"".join(f"v{idx}, " for idx in range(len(columns)))}= values\n'
+                   f'    return [{", ".join(fields)}]\n')
+        else:
+            src = 'def decode_row(values):\n    return []\n'
+        exec(src, namespace)
+        return namespace['decode_row']
+
+
+# Types whose default converters return immutable objects, which equal raw
+# values can share (see the 'decode_cache_size' connection option)
+MEMOIZABLE_TYPES = {
+    VerticaType.CHAR, VerticaType.VARCHAR, VerticaType.NUMERIC, VerticaType.UUID,
+    VerticaType.DATE, VerticaType.TIME, VerticaType.TIMETZ,
+    VerticaType.TIMESTAMP, VerticaType.TIMESTAMPTZ,
+}
+MEMO_SAMPLE_ROWS = 2048
+MEMO_MIN_HIT_RATIO = 0.5
+
+
+class _MemoChecker:
+    """Replace the column memos of a row decoder by the plain converters
+    when less than MEMO_MIN_HIT_RATIO of the lookups of the last
+    MEMO_SAMPLE_ROWS rows were hits.
+    """
+    def __init__(self, namespace: Dict[str, Any], memos: Dict[str, Any]) -> None:
+        self.namespace = namespace
+        self.memos = memos
+        self.lookups = {name: (0, 0) for name in memos}
+
+    def __call__(self) -> None:
+        for name, (memo, f) in list(self.memos.items()):
+            hits, misses, _, _ = memo.cache_info()
+            last_hits, last_misses = self.lookups[name]
+            self.lookups[name] = (hits, misses)
+            hits -= last_hits
+            misses -= last_misses
+            if hits + misses and hits < MEMO_MIN_HIT_RATIO * (hits + misses):
+                self.namespace[name] = f
+                memo.cache_clear()
+                del self.memos[name]
+        # Once all memos are dropped, the countdown never reaches zero again
+        self.namespace['rows_to_check'] = MEMO_SAMPLE_ROWS if self.memos else -1
+
 
 YEAR_TO_MONTH_RE = re.compile(r"(-)?(\d+)-(\d+)")
 TIMETZ_RE = re.compile(
@@ -74,6 +321,57 @@ TIMETZ_RE = re.compile(
 )
 TZ_RE = re.compile(r"(?ix) ^([-+]) (\d+) (?: : (\d+) )? (?: : (\d+) )? $")
 SECONDS_PER_DAY = 86400
+# Microseconds from 1970-01-01 to 2000-01-01
+Y2K_EPOCH_MICROSECONDS = 946684800000000
+_UTC = tz.tzutc()
+_DATETIMETZ_EPOCH = datetime(2000, 1, 1, tzinfo=_UTC)
+_UNIX_EPOCH_UTC = datetime(1970, 1, 1, tzinfo=_UTC)
+
+# The values of the 'timestamptz_output' connection option
+TIMESTAMPTZ_OUTPUTS = ('session', 'utc', 'microseconds')
+# The values of the 'numeric_output' connection option
+NUMERIC_OUTPUTS = ('decimal', 'float', 'scaled_int')
+# The values of the 'interval_output' connection option
+INTERVAL_OUTPUTS = ('relativedelta', 'timedelta', 'microseconds')
+# The values of the 'array_output' connection option
+ARRAY_OUTPUTS = ('list', 'numpy')
+
+
+@lru_cache(maxsize=64)
+def get_session_timezone(session_tz: str) -> tz.tzinfo:
+    """Return the time zone object of a session time zone setting, i.e. the
+    value of the 'timezone' ParameterStatus. The local time zone is returned
+    if the setting is unknown.
+    """
+    if TZ_RE.match(session_tz):  # -HH:MM / +HH:MM
+        session_tz = 'UTC' + session_tz
+    timezone = tz.gettz(session_tz)
+    return timezone if timezone else tz.gettz()
+
+@lru_cache(maxsize=256)
+def get_tzoffset(seconds: int) -> tz.tzoffset:
+    """Return the fixed time zone object of a UTC offset in seconds."""
+    return tz.tzoffset(None, seconds)
+
+def get_timestamptz_timezone(ctx: Dict[str, Any]) -> Optional[tz.tzinfo]:
+    """Return the time zone that TIMESTAMPTZ values are converted to, or None
+    if they are returned as microseconds since the Unix epoch.
+    """
+    output = ctx.get('timestamptz_output', 'session')
+    if output == 'microseconds':
+        return None
+    if output == 'utc':
+        return _UTC
+    return get_session_timezone(ctx['session_tz'])
+
+def load_bool_text(val: bytes, ctx: Dict[str, Any]) -> bool:
+    """
+    Parses text representation of a BOOLEAN type.
+    :param val: bytes - b't' for True, b'f' for False
+    :param ctx: dict
+    :return: an instance of bool
+    """
+    return val == b't'
 
 def load_bool_binary(val: bytes, ctx: Dict[str, Any]) -> bool:
     """
@@ -84,6 +382,15 @@ def load_bool_binary(val: bytes, ctx: Dict[str, Any]) -> bool:
     """
     return val == b'\x01'
 
+def load_int8_text(val: bytes, ctx: Dict[str, Any]) -> int:
+    """
+    Parses text representation of a INTEGER type.
+    :param val: bytes
+    :param ctx: dict
+    :return: int
+    """
+    return int(val)
+
 def load_int8_binary(val: bytes, ctx: Dict[str, Any]) -> int:
     """
     Parses binary representation of a INTEGER type.
@@ -93,6 +400,15 @@ def load_int8_binary(val: bytes, ctx: Dict[str, Any]) -> int:
     """
     return unpack("!q", val)[0]
 
+def load_float8_text(val: bytes, ctx: Dict[str, Any]) -> float:
+    """
+    Parses text representation of a FLOAT type.
+    :param val: bytes
+    :param ctx: dict
+    :return: float
+    """
+    return float(val)
+
 def load_float8_binary(val: bytes, ctx: Dict[str, Any]) -> float:
     """
     Parses binary representation of a FLOAT type.
@@ -102,20 +418,95 @@ def load_float8_binary(val: bytes, ctx: Dict[str, Any]) -> float:
     """
     return unpack("!d", val)[0]
 
-def load_numeric_binary(val: bytes, ctx: Dict[str, Any]) -> Decimal:
+def load_numeric_text(val: bytes, ctx: Dict[str, Any]) -> Union[Decimal, float, int]:
+    """
+    Parses text representation of a NUMERIC type.
+    :param val: bytes
+    :param ctx: dict
+    :return: decimal.Decimal, or float / int if ctx['numeric_output'] is 'float' / 'scaled_int'
+    """
+    output = ctx.get('numeric_output', 'decimal')
+    if output == 'float':
+        return float(val)
+    if output == 'scaled_int':
+        return _load_numeric_text_scaled_int(val, ctx['column'].scale)
+    return Decimal(as_str(val))
+
+def _load_numeric_text_scaled_int(val: bytes, scale: int) -> int:
+    integer, _, fraction = as_bytes(val).partition(b'.')
+    if len(fraction) > scale:  # This situation should never occur
+        return int(Decimal(as_str(val)).scaleb(scale))
+    return int(integer + fraction.ljust(scale, b'0'))
+
+def load_numeric_binary(val: bytes, ctx: Dict[str, Any]) -> Union[Decimal, float, int]:
     """
     Parses binary representation of a NUMERIC type.
     :param val: bytes
     :param ctx: dict
-    :return: decimal.Decimal
+    :return: decimal.Decimal, or float / int if ctx['numeric_output'] is 'float' / 'scaled_int'
     """
     # N-byte signed integer represents the unscaled value of the numeric
     # N is roughly (precision//19+1)*8
     unscaledVal = int.from_bytes(val, byteorder='big', signed=True)
+    output = ctx.get('numeric_output', 'decimal')
+    if output == 'scaled_int':
+        return unscaledVal
     precision = ctx['column'].precision
     scale = ctx['column'].scale
+    if output == 'float':
+        return unscaledVal / 10 ** scale
     # The numeric value is (unscaledVal * 10^(-scale))
-    return Decimal(unscaledVal).scaleb(-scale, context=Context(prec=precision))
+    return Decimal(unscaledVal).scaleb(-scale, context=get_numeric_context(precision))
+
+def _load_numeric_binary_decimal(val: bytes, scale: int, context: Context) -> Decimal:
+    return Decimal(int.from_bytes(val, byteorder='big', signed=True)).scaleb(-scale, context=context)
+
+def _load_numeric_binary_float(val: bytes, divisor: int) -> float:
+    # int / int true division is correctly rounded
+    return int.from_bytes(val, byteorder='big', signed=True) / divisor
+
+def load_numeric_float(val: bytes, ctx: Dict[str, Any]) -> float:
+    """
+    Parses text/binary representation of a NUMERIC type as float.
+    Can be registered with Cursor.register_column_converter().
+    :param val: bytes
+    :param ctx: dict
+    :return: float
+    """
+    return get_numeric_converter(ctx['column'], 'float')(val)
+
+def load_numeric_scaled_int(val: bytes, ctx: Dict[str, Any]) -> int:
+    """
+    Parses text/binary representation of a NUMERIC type as the unscaled integer,
+    i.e. the value multiplied by 10^scale of the column.
+    Can be registered with Cursor.register_column_converter().
+    :param val: bytes
+    :param ctx: dict
+    :return: int
+    """
+    return get_numeric_converter(ctx['column'], 'scaled_int')(val)
+
+@lru_cache(maxsize=128)
+def get_numeric_context(precision: int) -> Context:
+    """Return the decimal context that NUMERIC values of a precision are created in."""
+    return Context(prec=precision)
+
+def get_numeric_converter(col: Column, output: str) -> Callable[[bytes], Union[Decimal, float, int]]:
+    """Return a function that converts the raw data of a NUMERIC column as
+    specified by the 'numeric_output' option: 'decimal', 'float' or 'scaled_int'.
+    """
+    if col.format_code == FormatCode.BINARY:
+        if output == 'scaled_int':
+            return partial(int.from_bytes, byteorder='big', signed=True)
+        if output == 'float':
+            return partial(_load_numeric_binary_float, divisor=10 ** col.scale)
+        return partial(_load_numeric_binary_decimal, scale=col.scale,
+                       context=get_numeric_context(col.precision))
+    if output == 'scaled_int':
+        return partial(_load_numeric_text_scaled_int, scale=col.scale)
+    if output == 'float':
+        return float
+    return lambda val: Decimal(val.decode('utf-8'))
 
 def load_varchar_text(val: bytes, ctx: Dict[str, Any]) -> str:
     """
@@ -138,7 +529,7 @@ def load_date_text(val: bytes, ctx: Dict[str, Any]) -> date:
     if s.endswith(' BC'):
         raise errors.NotSupportedError('Dates Before Christ are not supported by datetime.date. Got: {0}'.format(s))
     try:
-        return date(*map(lambda x: int(x), s.split('-')))
+        return date.fromisoformat(s)
     except ValueError:
         raise errors.NotSupportedError('Dates after year 9999 are not supported by datetime.date. Got: {0}'.format(s))
 
@@ -150,13 +541,19 @@ def load_date_binary(val: bytes, ctx: Dict[str, Any]) -> date:
     :return: datetime.date
     :raises NotSupportedError when a date Before Christ is encountered
     """
+    return _load_date_binary(val)
+
+_DATE_MIN_ORDINAL = date.min.toordinal()
+_DATE_MAX_ORDINAL = date.max.toordinal()
+
+def _load_date_binary(val: bytes) -> date:
     # 8-byte integer represents the Julian day number
     # https://en.wikipedia.org/wiki/Julian_day
-    jdn = load_int8_binary(val, ctx)
+    jdn = unpack('!q', val)[0]
     days = jdn - 1721426 + 1  # shift epoch to 0001-1-1 (J1721426)
-    if days < date.min.toordinal():
+    if days < _DATE_MIN_ORDINAL:
         raise errors.NotSupportedError('Dates Before Christ are not supported by datetime.date. Got: Julian day number {0}'.format(jdn))
-    elif days > date.max.toordinal():
+    elif days > _DATE_MAX_ORDINAL:
         raise errors.NotSupportedError('Dates after year 9999 are not supported by datetime.date. Got: Julian day number {0}'.format(jdn))
     return date.fromordinal(days)
 
@@ -167,10 +564,11 @@ def load_time_text(val: bytes, ctx: Dict[str, Any]) -> time:
     :param ctx: dict
     :return: datetime.time
     """
-    val = as_str(val)
-    if len(val) == 8:
-        return datetime.strptime(val, '%H:%M:%S').time()
-    return datetime.strptime(val, '%H:%M:%S.%f').time()
+    # HH:MM:SS[.ffffff], trailing zeros of the fraction of second are omitted
+    s = as_str(val)
+    if len(s) == 8 or len(s) == 15:
+        return time.fromisoformat(s)
+    return time(int(s[0:2]), int(s[3:5]), int(s[6:8]), int(s[9:].ljust(6, '0')))
 
 def load_time_binary(val: bytes, ctx: Dict[str, Any]) -> time:
     """
@@ -221,7 +619,7 @@ def load_timetz_text(val: bytes, ctx: Dict[str, Any]) -> time:
     if sign == "-":
         tz_offset = -tz_offset
 
-    return time(int(hr), int(mi), int(sec), us, tz.tzoffset(None, tz_offset))
+    return time(int(hr), int(mi), int(sec), us, get_tzoffset(tz_offset))
 
 def load_timetz_binary(val: bytes, ctx: Dict[str, Any]) -> time:
     """
@@ -242,7 +640,7 @@ def load_timetz_binary(val: bytes, ctx: Dict[str, Any]) -> time:
     msecs, fraction = divmod(msecs, 1000000)
     msecs, second = divmod(msecs, 60)
     hour, minute = divmod(msecs, 60)
-    return time(hour, minute, second, fraction, tz.tzoffset(None, tz_offset))
+    return time(hour, minute, second, fraction, get_tzoffset(tz_offset))
 
 def load_timestamp_text(val: bytes, ctx: Dict[str, Any]) -> datetime:
     """
@@ -251,12 +649,17 @@ def load_timestamp_text(val: bytes, ctx: Dict[str, Any]) -> datetime:
     :param ctx: dict
     :return: datetime.datetime
     """
+    # YYYY-MM-DD HH:MM:SS[.ffffff], trailing zeros of the fraction of second are omitted
     s = as_str(val)
     if s.endswith(" BC"):
         raise errors.NotSupportedError('Timestamps Before Christ are not supported by datetime.datetime. Got: {0}'.format(s))
-    fmt = '%Y-%m-%d %H:%M:%S.%f' if '.' in s else '%Y-%m-%d %H:%M:%S'
     try:
-        return datetime.strptime(s, fmt)
+        if len(s) == 19 or len(s) == 26:
+            return datetime.fromisoformat(s)
+        if s[4:5] != '-':  # year might be over 9999
+            raise ValueError
+        return datetime(int(s[0:4]), int(s[5:7]), int(s[8:10]),
+                        int(s[11:13]), int(s[14:16]), int(s[17:19]), int(s[20:].ljust(6, '0')))
     except ValueError:
         raise errors.NotSupportedError('Timestamps after year 9999 are not supported by datetime.datetime. Got: {0}'.format(s))
 
@@ -267,24 +670,31 @@ def load_timestamp_binary(val: bytes, ctx: Dict[str, Any]) -> datetime:
     :param ctx: dict
     :return: datetime.datetime
     """
+    return _load_timestamp_binary(val)
+
+_TIMESTAMP_EPOCH = datetime(2000, 1, 1)
+
+def _load_timestamp_binary(val: bytes) -> datetime:
     # 8-byte integer represents the number of microseconds since 2000-01-01 00:00:00.
-    msecs = load_int8_binary(val, ctx)
-    _datetime_epoch = datetime(2000, 1, 1)
+    msecs = unpack('!q', val)[0]
     try:
-        return _datetime_epoch + timedelta(microseconds=msecs)
+        return _TIMESTAMP_EPOCH + timedelta(0, 0, msecs)
     except OverflowError:
         if msecs < 0:
             raise errors.NotSupportedError('Timestamps Before Christ are not supported by datetime.datetime.')
         else:
             raise errors.NotSupportedError('Timestamps after year 9999 are not supported by datetime.datetime.')
 
-def load_timestamptz_text(val: bytes, ctx: Dict[str, Any]) -> datetime:
+def load_timestamptz_text(val: bytes, ctx: Dict[str, Any]) -> Union[datetime, int]:
     """
     Parses text representation of a TIMESTAMPTZ type.
     :param val: bytes
     :param ctx: dict
-    :return: datetime.datetime
+    :return: datetime.datetime, or int if ctx['timestamptz_output'] is 'microseconds'
     """
+    return _load_timestamptz_text(val, ctx.get('timestamptz_output', 'session'))
+
+def _load_timestamptz_text(val: bytes, output: str) -> Union[datetime, int]:
     s = as_str(val)
     if s.endswith(" BC"):
         raise errors.NotSupportedError('TimestampTzs Before Christ are not supported by datetime.datetime. Got: {0}'.format(s))
@@ -292,30 +702,34 @@ def load_timestamptz_text(val: bytes, ctx: Dict[str, Any]) -> datetime:
     if len(dt) != 2:
         raise errors.DataError("Cannot parse TIMESTAMPTZ '{}'".format(s))
     try:
-        d = date(*map(lambda x: int(x), dt[0].split('-')))
+        d = date.fromisoformat(dt[0])
     except ValueError:  # year might be over 9999
         raise errors.NotSupportedError('TimestampTzs after year 9999 are not supported by datetime.datetime. Got: {0}'.format(s))
-    t = load_timetz_text(dt[1], ctx)
-    return datetime.combine(d, t)
+    t = load_timetz_text(dt[1], None)
+    # The time zone of the value is the session time zone of the server
+    ts = datetime.combine(d, t)
+    if output == 'microseconds':
+        return (ts - _UNIX_EPOCH_UTC) // timedelta(microseconds=1)
+    if output == 'utc':
+        return ts.astimezone(_UTC)
+    return ts
 
-def load_timestamptz_binary(val: bytes, ctx: Dict[str, Any]) -> datetime:
+def load_timestamptz_binary(val: bytes, ctx: Dict[str, Any]) -> Union[datetime, int]:
     """
     Parses binary representation of a TIMESTAMPTZ type.
     :param val: bytes
     :param ctx: dict
-    :return: datetime.datetime
+    :return: datetime.datetime, or int if ctx['timestamptz_output'] is 'microseconds'
     """
+    return _load_timestamptz_binary(val, get_timestamptz_timezone(ctx))
+
+def _load_timestamptz_binary(val: bytes, timezone: Optional[tz.tzinfo]) -> Union[datetime, int]:
     # 8-byte integer represents the number of microseconds since 2000-01-01 00:00:00 in the UTC timezone.
-    msecs = load_int8_binary(val, ctx)
-    _datetimetz_epoch = datetime(2000, 1, 1, tzinfo=tz.tzutc())
-    # Process session time zone setting
-    if TZ_RE.match(ctx['session_tz']):  # -HH:MM / +HH:MM
-        ctx['session_tz'] = 'UTC' + ctx['session_tz']
-    session_tz = tz.gettz(ctx['session_tz'])
-    # Use local time zone if session time zone is unknown
-    timezone = session_tz if session_tz else tz.gettz()
+    msecs = unpack('!q', val)[0]
+    if timezone is None:
+        return msecs + Y2K_EPOCH_MICROSECONDS
     try:
-        ts = _datetimetz_epoch + timedelta(microseconds=msecs)
+        ts = _DATETIMETZ_EPOCH + timedelta(microseconds=msecs)
         return ts.astimezone(timezone)
     except OverflowError:
         if msecs < 0:
@@ -323,13 +737,17 @@ def load_timestamptz_binary(val: bytes, ctx: Dict[str, Any]) -> datetime:
         else:  # year might be over 9999
             raise errors.NotSupportedError('TimestampTzs after year 9999 are not supported by datetime.datetime.')
 
-def load_interval_text(val: bytes, ctx: Dict[str, Any]) -> relativedelta:
+def load_interval_text(val: bytes, ctx: Dict[str, Any]) -> Union[relativedelta, timedelta, int]:
     """
     Parses text representation of a INTERVAL day-time type.
     :param val: bytes
     :param ctx: dict
-    :return: dateutil.relativedelta.relativedelta
+    :return: dateutil.relativedelta.relativedelta, or datetime.timedelta / int (microseconds)
+             if ctx['interval_output'] is 'timedelta' / 'microseconds'
     """
+    return _load_interval_text(val, ctx['column'].type_name, ctx.get('interval_output', 'relativedelta'))
+
+def _load_interval_text(val: bytes, type_name: str, output: str) -> Union[relativedelta, timedelta, int]:
     # [-]dd hh:mm:ss.ffffff
     interval = as_str(val)
     sign = -1 if interval[0] == '-' else 1
@@ -351,7 +769,6 @@ def load_interval_text(val: bytes, ctx: Dict[str, Any]) -> relativedelta:
     idx += 1
 
     # Determine the unit for the first number
-    type_name = ctx['column'].type_name
     parts_idx = 0  # Interval Day
     if type_name in ('Interval Day to Hour', 'Interval Day to Minute', 'Interval Day to Second'):
         parts_idx = 0 if (saw_days or idx > len(interval)) else 1
@@ -370,34 +787,51 @@ def load_interval_text(val: bytes, ctx: Dict[str, Any]) -> relativedelta:
             parts[parts_idx] = sign * int(val)
             parts_idx += 1
 
-    return relativedelta(days=parts[0], hours=parts[1], minutes=parts[2], seconds=parts[3], microseconds=parts[4])
+    if output == 'relativedelta':
+        return relativedelta(days=parts[0], hours=parts[1], minutes=parts[2], seconds=parts[3], microseconds=parts[4])
+    msecs = (((parts[0] * 24 + parts[1]) * 60 + parts[2]) * 60 + parts[3]) * 1000000 + parts[4]
+    return msecs if output == 'microseconds' else timedelta(microseconds=msecs)
 
-def load_interval_binary(val: bytes, ctx: Dict[str, Any]) -> relativedelta:
+def load_interval_binary(val: bytes, ctx: Dict[str, Any]) -> Union[relativedelta, timedelta, int]:
     """
     Parses binary representation of a INTERVAL day-time type.
     :param val: bytes
     :param ctx: dict
-    :return: dateutil.relativedelta.relativedelta
+    :return: dateutil.relativedelta.relativedelta, or datetime.timedelta / int (microseconds)
+             if ctx['interval_output'] is 'timedelta' / 'microseconds'
     """
     # 8-byte integer containing the number of microseconds in the interval
     msecs = load_int8_binary(val, ctx)
+    output = ctx.get('interval_output', 'relativedelta')
+    if output == 'microseconds':
+        return msecs
+    if output == 'timedelta':
+        return timedelta(microseconds=msecs)
     return relativedelta(microseconds=msecs)
 
-def load_intervalYM_text(val: bytes, ctx: Dict[str, Any]) -> relativedelta:
+def _load_interval_binary_timedelta(val: bytes) -> timedelta:
+    return timedelta(microseconds=unpack('!q', val)[0])
+
+def load_intervalYM_text(val: bytes, ctx: Dict[str, Any]) -> Union[relativedelta, int]:
     """
     Parses text representation of a INTERVAL YEAR TO MONTH / INTERVAL YEAR / INTERVAL MONTH type.
     :param val: bytes
     :param ctx: dict
-    :return: dateutil.relativedelta.relativedelta
+    :return: dateutil.relativedelta.relativedelta, or int (months)
+             if ctx['interval_output'] is not 'relativedelta'
     """
+    return _load_intervalYM_text(val, ctx['column'].type_name, ctx.get('interval_output', 'relativedelta'))
+
+def _load_intervalYM_text(val: bytes, type_name: str, output: str) -> Union[relativedelta, int]:
     s = as_str(val)
-    type_name = ctx['column'].type_name
     if type_name == 'Interval Year to Month':
         m = YEAR_TO_MONTH_RE.match(s)
         if not m:
             raise errors.DataError("Cannot parse interval '{}'".format(s))
         sign, year, month = m.groups()
         sign = -1 if sign else 1
+        if output != 'relativedelta':
+            return sign * (int(year) * 12 + int(month))
         return relativedelta(years=sign*int(year), months=sign*int(month))
     else:
         try:
@@ -405,19 +839,22 @@ def load_intervalYM_text(val: bytes, ctx: Dict[str, Any]) -> relativedelta:
         except ValueError:
             raise errors.DataError("Cannot parse interval '{}'".format(s))
         if type_name == 'Interval Year':
-            return relativedelta(years=interval)
+            return interval * 12 if output != 'relativedelta' else relativedelta(years=interval)
         else:   # Interval Month
-            return relativedelta(months=interval)
+            return interval if output != 'relativedelta' else relativedelta(months=interval)
 
-def load_intervalYM_binary(val: bytes, ctx: Dict[str, Any]) -> relativedelta:
+def load_intervalYM_binary(val: bytes, ctx: Dict[str, Any]) -> Union[relativedelta, int]:
     """
     Parses binary representation of a INTERVAL YEAR TO MONTH / INTERVAL YEAR / INTERVAL MONTH type.
     :param val: bytes
     :param ctx: dict
-    :return: dateutil.relativedelta.relativedelta
+    :return: dateutil.relativedelta.relativedelta, or int (months)
+             if ctx['interval_output'] is not 'relativedelta'
     """
     # 8-byte integer containing the number of months in the interval
     months = load_int8_binary(val, ctx)
+    if ctx.get('interval_output', 'relativedelta') != 'relativedelta':
+        return months
     return relativedelta(months=months)
 
 def load_uuid_binary(val: bytes, ctx: Dict[str, Any]) -> UUID:
@@ -430,6 +867,8 @@ def load_uuid_binary(val: bytes, ctx: Dict[str, Any]) -> UUID:
     # 16-byte value in big-endian order interpreted as UUID
     return UUID(bytes=bytes(val))
 
+VARBINARY_CHUNK_SIZE = 65536
+
 def load_varbinary_text(s: bytes, ctx: Dict[str, Any]) -> bytes:
     """
     Parses text representation of a BINARY / VARBINARY / LONG VARBINARY type.
@@ -437,22 +876,62 @@ def load_varbinary_text(s: bytes, ctx: Dict[str, Any]) -> bytes:
     :param ctx: dict
     :return: bytes
     """
-    s = as_bytes(s)
-    buf = []
-    i = 0
-    while i < len(s):
-        c = s[i: i+1]
-        if c == b'\\':
-            c2 = s[i+1: i+2]
-            if c2 == b'\\':  # escaped \
-                i += 2
-            else:   # A \xxx octal string
-                c = bytes([int(s[i+1: i+4], 8)])
-                i += 4
+    return unescape_varbinary(as_bytes(s))
+
+def unescape_varbinary(data: bytes, buffer: Optional[bytearray] = None) -> Union[bytes, memoryview]:
+    """
+    Decodes the text representation of binary data, in which a backslash is
+    escaped as '\\\\' and a non-printable byte as an '\\ooo' octal escape.
+
+    If a bytearray buffer is given, the data is decoded into it and a memoryview
+    of the buffer is returned, so that large values can be decoded one after
+    another without allocating new objects. The memoryview must be released
+    before the buffer is reused.
+    """
+    if buffer is None:
+        if b'\\' not in data:
+            return bytes(data)
+        # The escapes are a subset of the escapes of Python bytes literals
+        return escape_decode(data)[0]
+    # Decode the data in chunks, so that no more than a chunk is allocated
+    view = memoryview(data)
+    size = 0
+    start = 0
+    while start < len(data):
+        end = start + VARBINARY_CHUNK_SIZE
+        if end >= len(data):
+            end = len(data)
         else:
-            i += 1
-        buf.append(c)
-    return b''.join(buf)
+            # An escape is at most 4 bytes long, so a chunk that does not end
+            # with a backslash in its last 3 bytes does not split an escape
+            while end < len(data) and data.find(b'\\', end - 3, end) != -1:
+                end += 1
+        decoded = escape_decode(view[start:end])[0]
+        buffer[size:size + len(decoded)] = decoded
+        size += len(decoded)
+        start = end
+    del buffer[size:]
+    return memoryview(buffer)
+
+def loads_json(val: bytes, unicode_error: str) -> Any:
+    """Parse the JSON text of a complex type value, with orjson if it is installed."""
+    if orjson is not None:
+        try:
+            return orjson.loads(val)
+        except orjson.JSONDecodeError:
+            # e.g. invalid UTF-8, NaN or integers beyond 64 bits
+            pass
+    return json.loads(val.decode('utf-8', unicode_error))
+
+def _array_to_numpy(np, dtype: str, elements: List[Any]) -> Any:
+    if not isinstance(elements, list):
+        raise TypeError('Expected a list, got {}'.format(elements))
+    # A masked array is much slower to build, so it is only used for NULL elements
+    if None in elements:
+        mask = [element is None for element in elements]
+        return np.ma.masked_array([0 if element is None else element for element in elements],
+                                  mask=mask, dtype=dtype)
+    return np.array(elements, dtype=dtype)
 
 def load_array_text(val: bytes, ctx: Dict[str, Any]) -> Union[str, List[Any]]:
     """
@@ -461,11 +940,10 @@ def load_array_text(val: bytes, ctx: Dict[str, Any]) -> Union[str, List[Any]]:
     :param ctx: dict
     :return: list
     """
-    v = val.decode('utf-8', ctx['unicode_error'])
     # Some old servers have a bug of sending ARRAY oid without child metadata
     if not ctx['complex_types_enabled']:
-        return v
-    json_data = json.loads(v)
+        return val.decode('utf-8', ctx['unicode_error'])
+    json_data = loads_json(val, ctx['unicode_error'])
     return parse_array(json_data, ctx)
 
 def load_set_text(val: bytes, ctx: Dict[str, Any]) -> Set[Any]:
@@ -503,11 +981,10 @@ def load_row_text(val: bytes, ctx: Dict[str, Any]) -> Union[str, Dict[str, Any]]
     :param ctx: dict
     :return: dict
     """
-    v = val.decode('utf-8', ctx['unicode_error'])
     # Some old servers have a bug of sending ROW oid without child metadata
     if not ctx['complex_types_enabled']:
-        return v
-    json_data = json.loads(v)
+        return val.decode('utf-8', ctx['unicode_error'])
+    json_data = loads_json(val, ctx['unicode_error'])
     return parse_row(json_data, ctx)
 
 def parse_row(json_data: Dict[str, Any], ctx: Dict[str, Any]) -> Dict[str, Any]:
@@ -531,6 +1008,12 @@ def parse_row(json_data: Dict[str, Any], ctx: Dict[str, Any]) -> Dict[str, Any]:
         parsed_row[key] = parse_json_element(element, child_ctx)
     return parsed_row
 
+# Types of complex type elements that are JSON strings in the text representation of the type
+JSON_TEXT_TYPES = {VerticaType.DATE, VerticaType.TIME, VerticaType.TIMETZ,
+                   VerticaType.TIMESTAMP, VerticaType.TIMESTAMPTZ,
+                   VerticaType.INTERVAL, VerticaType.INTERVALYM,
+                   VerticaType.BINARY, VerticaType.VARBINARY, VerticaType.LONGVARBINARY}
+
 def parse_json_element(element: Any, ctx: Dict[str, Any]) -> Any:
     type_code = ctx['column'].type_code
     if type_code in (VerticaType.BOOL, VerticaType.INT8,
@@ -540,14 +1023,12 @@ def parse_json_element(element: Any, ctx: Dict[str, Any]) -> Any:
     if type_code == VerticaType.FLOAT8:
         return float(element)
     # element type: str
-    if type_code in (VerticaType.DATE, VerticaType.TIME, VerticaType.TIMETZ,
-                     VerticaType.TIMESTAMP, VerticaType.TIMESTAMPTZ,
-                     VerticaType.INTERVAL, VerticaType.INTERVALYM,
-                     VerticaType.BINARY, VerticaType.VARBINARY,
-                     VerticaType.LONGVARBINARY):
+    if type_code in JSON_TEXT_TYPES:
         return DEFAULTS[FormatCode.TEXT][type_code](element, ctx)
     elif type_code == VerticaType.NUMERIC:
-        return Decimal(element)
+        if ctx.get('numeric_output', 'decimal') == 'decimal':
+            return Decimal(element)
+        return load_numeric_text(str(element), ctx)
     elif type_code == VerticaType.UUID:
         return UUID(element)
     # element type: list
@@ -561,10 +1042,10 @@ def parse_json_element(element: Any, ctx: Dict[str, Any]) -> Any:
 DEFAULTS = {
     FormatCode.TEXT: {
         VerticaType.UNKNOWN: None,
-        VerticaType.BOOL: lambda val, ctx: val == b't',
-        VerticaType.INT8: lambda val, ctx: int(val),
-        VerticaType.FLOAT8: lambda val, ctx: float(val),
-        VerticaType.NUMERIC: lambda val, ctx: Decimal(val.decode('utf-8')),
+        VerticaType.BOOL: load_bool_text,
+        VerticaType.INT8: load_int8_text,
+        VerticaType.FLOAT8: load_float8_text,
+        VerticaType.NUMERIC: load_numeric_text,
         VerticaType.CHAR: load_varchar_text,
         VerticaType.VARCHAR: load_varchar_text,
         VerticaType.LONGVARCHAR: load_varchar_text,
@@ -681,3 +1162,38 @@ DEFAULTS = {
     },
 }
 
+
+
+_unpack_float8 = Struct('!d').unpack
+
+# Converters that do not use the context, mapped to equivalent single-argument functions
+CONTEXT_FREE_CONVERTERS = {
+    load_bool_text: b't'.__eq__,
+    load_bool_binary: b'\x01'.__eq__,
+    load_int8_text: int,
+    load_int8_binary: partial(int.from_bytes, byteorder='big', signed=True),
+    load_float8_text: float,
+    load_float8_binary: lambda val: _unpack_float8(val)[0],
+    load_date_binary: _load_date_binary,
+    load_timestamp_binary: _load_timestamp_binary,
+}
+
+# NUMERIC converters, mapped to the numeric output they produce (None for the
+# 'numeric_output' option of the context)
+NUMERIC_OUTPUT_CONVERTERS = {
+    load_numeric_text: None,
+    load_numeric_binary: None,
+    load_numeric_float: 'float',
+    load_numeric_scaled_int: 'scaled_int',
+}
+
+INTERVAL_CONVERTERS = {load_interval_text, load_interval_binary, load_intervalYM_text, load_intervalYM_binary}
+
+COMPLEX_CONVERTERS = {load_array_text, load_set_text, load_row_text}
+
+# Element types of the 1-D arrays returned as NumPy arrays, mapped to the dtype
+NUMPY_ELEMENT_TYPES = {
+    VerticaType.BOOL: 'bool',
+    VerticaType.INT8: 'int64',
+    VerticaType.FLOAT8: 'float64',
+}
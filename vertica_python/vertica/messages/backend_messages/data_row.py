@@ -37,25 +37,78 @@ from __future__ import annotations
 
 from struct import unpack_from
 
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from typing import List, Optional
+
 from ..message import BackendMessage
 
 
+def split_data_row(data: bytes) -> List[Optional[bytes]]:
+    """Return the field values of a DataRow message body, None for NULL."""
+    field_count = unpack_from('!H', data, 0)[0]
+    values = [None] * field_count
+    pos = 2
+    for i in range(field_count):
+        size = unpack_from('!i', data, pos)[0]
+        pos += 4
+        if size != -1:
+            values[i] = data[pos:pos + size]
+            pos += size
+    return values
+
+
+def copy_data_row(data: memoryview) -> List[Optional[bytes]]:
+    """Return the field values of a DataRow message body held in a memoryview,
+    None for NULL. Each value is copied out of the view, the body as a whole is
+    not copied.
+    """
+    field_count = unpack_from('!H', data, 0)[0]
+    values = [None] * field_count
+    pos = 2
+    for i in range(field_count):
+        size = unpack_from('!i', data, pos)[0]
+        pos += 4
+        if size != -1:
+            values[i] = data[pos:pos + size].tobytes()
+            pos += size
+    return values
+
+
+def data_row_offsets(data: bytes) -> List[int]:
+    """Return the start and end positions of the field values of a DataRow
+    message body, as a flat list [start0, end0, start1, end1, ...].
+    The start position of a NULL value is -1.
+    """
+    field_count = unpack_from('!H', data, 0)[0]
+    offsets = [-1] * (field_count * 2)
+    pos = 2
+    for i in range(0, field_count * 2, 2):
+        size = unpack_from('!i', data, pos)[0]
+        pos += 4
+        if size != -1:
+            offsets[i] = pos
+            pos += size
+            offsets[i + 1] = pos
+    return offsets
+
+
 class DataRow(BackendMessage):
     message_id = b'D'
 
-    def __init__(self, data):
+    def __init__(self, data, values=None):
         BackendMessage.__init__(self)
-        field_count = unpack_from('!H', data, 0)[0]
-        self.values = [None] * field_count
-        pos = 2
-
-        for i in range(field_count):
-            size = unpack_from('!i', data, pos)[0]
-            pos += 4
-
-            if size != -1:
-                self.values[i] = data[pos : pos + size]
-                pos += size
+        if values is not None:
+            # The field values were read one by one (see Connection.read_message()),
+            # there is no message body
+            self.data = self.values = values
+            return
+        # data may be a memoryview of the connection's receive buffer, which is
+        # reused. Only the field values are kept, LazyRow accepts them as well.
+        if isinstance(data, memoryview):
+            self.data = self.values = copy_data_row(data)
+        else:
+            self.data = self.values = split_data_row(data)
 
 
 BackendMessage.register(DataRow)
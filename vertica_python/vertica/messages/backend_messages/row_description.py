@@ -42,9 +42,10 @@ returned in response to a SELECT, FETCH, etc query.
 
 from __future__ import annotations
 
+from copy import copy
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
-    from typing import List
+    from typing import List, Sequence
 from struct import unpack, unpack_from, calcsize
 
 from ..message import BackendMessage
@@ -58,6 +59,10 @@ class RowDescription(BackendMessage):
     def __init__(self, data, complex_types_enabled):
         BackendMessage.__init__(self)
         self.fields = []
+        # Row decoders built for this result set layout, see Cursor.get_row_decoder()
+        self.row_decoders = {}
+        # Copies of this RowDescription in other formats, see with_format_codes()
+        self._format_variants = {}
         field_dict = {}
         field_count = unpack('!H', data[0:2])[0]
 
@@ -151,6 +156,29 @@ class RowDescription(BackendMessage):
         # return a list of Column objects for Cursor.description
         return self.fields
 
+    def with_format_codes(self, format_codes: Sequence[int]) -> RowDescription:
+        """Return a RowDescription of the same columns transferred in the given
+        formats, one per column.
+
+        The columns of this RowDescription, which may be shared by many result
+        sets, are left unchanged. The copy is kept for later calls.
+        """
+        key = tuple(format_codes)
+        if all(col.format_code == fmt for col, fmt in zip(self.fields, key)):
+            return self
+        variant = self._format_variants.get(key)
+        if variant is None:
+            variant = copy(self)
+            variant.fields = []
+            for col, fmt in zip(self.fields, key):
+                col = copy(col)
+                col.format_code = fmt
+                variant.fields.append(col)
+            variant.row_decoders = {}
+            variant._format_variants = {}
+            self._format_variants[key] = variant
+        return variant
+
     def __str__(self):
         s = ",\n".join([c.debug_info() for c in self.fields])
         return f"RowDescription: [\n{s}]"
@@ -44,7 +44,9 @@ The response is either BindComplete or ErrorResponse.
 
 from __future__ import annotations
 
+from datetime import date, datetime, timedelta, timezone
 from struct import pack
+from uuid import UUID
 
 from ..message import BulkFrontendMessage
 from ....datatypes import VerticaType
@@ -53,18 +55,78 @@ from ....compat import as_bytes
 BACKSLASH = b'\\'
 BACKSLASH_ESCAPE = b'\\134'
 
+INT8_MIN = -2 ** 63
+INT8_MAX = 2 ** 63 - 1
+# Julian day number of date.fromordinal(0)
+JULIAN_DAY_OFFSET = 1721425
+Y2K_EPOCH = datetime(2000, 1, 1)
+Y2K_EPOCH_UTC = datetime(2000, 1, 1, tzinfo=timezone.utc)
+MICROSECOND = timedelta(microseconds=1)
+
+
+# The binary representations of parameter values, the same as in query results
+# (see the load_*_binary functions of vertica.deserializer). An encoder returns
+# None for a value that is sent as text.
+
+def encode_bool_binary(val):
+    if type(val) is bool:
+        return b'\x01' if val else b'\x00'
+
+def encode_int8_binary(val):
+    if type(val) is int and INT8_MIN <= val <= INT8_MAX:
+        return pack('!q', val)
+
+def encode_float8_binary(val):
+    if type(val) is float:
+        return pack('!d', val)
+
+def encode_date_binary(val):
+    # 8-byte integer represents the Julian day number
+    if type(val) is date:
+        return pack('!q', val.toordinal() + JULIAN_DAY_OFFSET)
+
+def encode_timestamp_binary(val):
+    # 8-byte integer represents the number of microseconds since 2000-01-01 00:00:00
+    if type(val) is datetime and val.tzinfo is None:
+        return pack('!q', (val - Y2K_EPOCH) // MICROSECOND)
+
+def encode_timestamptz_binary(val):
+    # 8-byte integer represents the number of microseconds since 2000-01-01 00:00:00 UTC.
+    # A naive datetime is in the session time zone, which the server applies to text.
+    if type(val) is datetime and val.utcoffset() is not None:
+        return pack('!q', (val - Y2K_EPOCH_UTC) // MICROSECOND)
+
+def encode_uuid_binary(val):
+    # 16-byte value in big-endian order
+    if type(val) is UUID:
+        return val.bytes
+
+BINARY_PARAMETER_ENCODERS = {
+    VerticaType.BOOL: encode_bool_binary,
+    VerticaType.INT8: encode_int8_binary,
+    VerticaType.FLOAT8: encode_float8_binary,
+    VerticaType.DATE: encode_date_binary,
+    VerticaType.TIMESTAMP: encode_timestamp_binary,
+    VerticaType.TIMESTAMPTZ: encode_timestamptz_binary,
+    VerticaType.UUID: encode_uuid_binary,
+}
+
 
 class Bind(BulkFrontendMessage):
     message_id = b'B'
 
     def __init__(self, portal_name: str, prepared_statement_name: str, parameter_values,
-                 parameter_type_oids, binary_transfer: bool) -> None:
+                 parameter_type_oids, binary_transfer: bool, binary_parameters: bool = False,
+                 result_format_codes=None) -> None:
         BulkFrontendMessage.__init__(self)
         self._portal_name = portal_name
         self._prepared_statement_name = prepared_statement_name
         self._parameter_values = parameter_values
         self._parameter_type_oids = parameter_type_oids
         self._binary_transfer = binary_transfer
+        self._binary_parameters = binary_parameters
+        # The format of each result column, which overrides binary_transfer
+        self._result_format_codes = result_format_codes
 
     def read_bytes(self):
         utf_portal_name = self._portal_name.encode('utf-8')
@@ -73,20 +135,20 @@ class Bind(BulkFrontendMessage):
         bytes_ = pack('!{0}sx{1}sx'.format(len(utf_portal_name), len(utf_prepared_statement_name)),
                       utf_portal_name, utf_prepared_statement_name)
 
-        # Parameter format codes -- use the default format (text)
-        bytes_ += pack('!H', 0)
-
-        # Number of parameters
-        bytes_ += pack('!H', len(self._parameter_type_oids))
-
+        format_codes = [0] * len(self._parameter_type_oids)
         param_bytes_ = b''
-        for oid, val in zip(self._parameter_type_oids, self._parameter_values):
-            # Parameter type oids
-            bytes_ += pack('!I', oid)
+        for i, (oid, val) in enumerate(zip(self._parameter_type_oids, self._parameter_values)):
             # Parameter values
             if val is None:  # -1 indicates a NULL parameter value
                 param_bytes_ += pack('!i', -1)
-            elif oid in (VerticaType.BINARY, VerticaType.VARBINARY, VerticaType.LONGVARBINARY):
+                continue
+            if self._binary_parameters and oid in BINARY_PARAMETER_ENCODERS:
+                binary = BINARY_PARAMETER_ENCODERS[oid](val)
+                if binary is not None:
+                    format_codes[i] = 1
+                    param_bytes_ += pack('!I', len(binary)) + binary
+                    continue
+            if oid in (VerticaType.BINARY, VerticaType.VARBINARY, VerticaType.LONGVARBINARY):
                 # Encode binary data as UTF8 bytes
                 val = as_bytes(val)
                 # Escape the byte value \ with "\134"(octal for backslash)
@@ -102,14 +164,27 @@ class Bind(BulkFrontendMessage):
                 val = val.encode('utf-8') if not isinstance(val, bytes) else val
                 param_bytes_ += pack('!I{0}s'.format(len(val)), len(val), val)
 
+        # Parameter format codes
+        if any(format_codes):
+            bytes_ += pack('!{0}H'.format(len(format_codes) + 1), len(format_codes), *format_codes)
+        else:
+            # Use the default format (text) for all parameters
+            bytes_ += pack('!H', 0)
+
+        # Number of parameters, and their type oids
+        bytes_ += pack('!H{0}I'.format(len(self._parameter_type_oids)),
+                       len(self._parameter_type_oids), *self._parameter_type_oids)
+
         bytes_ += param_bytes_
 
         # Result column transfer format
-        if self._binary_transfer:
-            bytes_ += pack('!H', 1) # Specify the number of format codes followed
-            bytes_ += pack('!H', 1) # Use binary format for all result columns
-        else:
-            # Use the default format (text) for all result columns
-            bytes_ += pack('!H', 0)
+        result_formats = self._result_format_codes
+        if result_formats is None:
+            result_formats = (1,) if self._binary_transfer else ()
+        elif len(set(result_formats)) == 1:
+            # A single format code applies to all result columns
+            result_formats = tuple(result_formats[:1]) if result_formats[0] else ()
+        # No format code stands for the default format (text) for all result columns
+        bytes_ += pack('!{0}H'.format(len(result_formats) + 1), len(result_formats), *result_formats)
 
         return bytes_
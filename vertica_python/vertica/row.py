@@ -0,0 +1,221 @@
+# Copyright (c) 2024 Open Text.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+from collections import namedtuple
+
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Type, Union
+
+from ..vertica.messages.backend_messages.data_row import data_row_offsets
+
+
+def column_index(names: Sequence[str]) -> Dict[str, int]:
+    """Map column names to column positions. If a name is duplicated,
+    the first column with the name is used.
+    """
+    index = {}
+    for idx, name in enumerate(names):
+        index.setdefault(name, idx)
+    return index
+
+
+def namedtuple_type(names: Sequence[str]) -> Type[Tuple[Any, ...]]:
+    """Create a namedtuple class for rows of a result set. Column names that are
+    not valid identifiers (e.g. '?column?') or are duplicated are replaced with
+    positional names ('_0', '_1', ...).
+    """
+    return namedtuple('Row', names, rename=True)
+
+
+class Row:
+    """A query result row.
+
+    A Row is a read-only sequence of the column values that also supports access
+    by column name, as row['name'] or row.name. All rows of a result set share
+    one column name to position mapping, so a row stores nothing but its values.
+    """
+    __slots__ = ('_values', '_index')
+
+    def __init__(self, values: List[Any], index: Dict[str, int]) -> None:
+        self._values = values
+        self._index = index
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return self._values[self._index[key]]
+        return self._values[key]
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith('__'):
+            raise AttributeError(name)
+        try:
+            return self._values[self._index[name]]
+        except KeyError:
+            raise AttributeError(f"Row has no column '{name}'") from None
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._values)
+
+    def __contains__(self, value: Any) -> bool:
+        return value in self._values
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, Row):
+            return self._values == other._values
+        if isinstance(other, (list, tuple)):
+            return list(self._values) == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __reduce__(self):
+        return (Row, (self._values, self._index))
+
+    def __repr__(self) -> str:
+        names = [None] * len(self._values)
+        for name, idx in self._index.items():
+            names[idx] = name
+        fields = ', '.join(f'{name}={value!r}' if name is not None else repr(value)
+                           for name, value in zip(names, self._values))
+        return f'Row({fields})'
+
+    def keys(self) -> List[str]:
+        """Return the column names."""
+        return list(self._index)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return a dict of column names and values."""
+        return {name: self._values[idx] for name, idx in self._index.items()}
+
+
+class LazyRowLayout:
+    """The column converters and the column index shared by the lazy rows of a result set."""
+    __slots__ = ('converters', 'index')
+
+    def __init__(self, converters: List[Optional[Callable[[bytes], Any]]], index: Dict[str, int]) -> None:
+        # A converter of None returns the raw bytes of the column
+        self.converters = converters
+        self.index = index
+
+
+_NOT_DECODED = object()
+
+
+class LazyRow:
+    """A query result row that converts its values on first access.
+
+    A LazyRow holds the raw DataRow message body. Field offsets are located when
+    a value is first accessed, and each value is converted by its column
+    deserializer at most once. It supports the same access as Row: by position,
+    row['name'] and row.name. Iterating over the row, materialize() and as_dict()
+    convert all values.
+    """
+    __slots__ = ('_data', '_offsets', '_cells', '_layout')
+
+    def __init__(self, data: Union[bytes, List[Optional[bytes]]], layout: LazyRowLayout,
+                 cells: Optional[Dict[int, Any]] = None) -> None:
+        # data is a DataRow message body, or the list of its field values.
+        # cells maps positions to values that are not converted.
+        self._data = data
+        self._offsets = None
+        self._cells = None
+        self._layout = layout
+        if cells:
+            self._cells = [_NOT_DECODED] * len(layout.converters)
+            for idx, value in cells.items():
+                self._cells[idx] = value
+
+    def _get(self, idx: int) -> Any:
+        cells = self._cells
+        if cells is None:
+            cells = self._cells = [_NOT_DECODED] * len(self._layout.converters)
+        value = cells[idx]
+        if value is _NOT_DECODED:
+            raw = self.raw(idx)
+            f = self._layout.converters[idx]
+            value = cells[idx] = raw if raw is None or f is None else f(raw)
+        return value
+
+    def _position(self, key: Union[int, str]) -> int:
+        if isinstance(key, str):
+            return self._layout.index[key]
+        n = len(self._layout.converters)
+        if not -n <= key < n:
+            raise IndexError('LazyRow index out of range')
+        return key % n
+
+    def raw(self, key: Union[int, str]) -> Optional[bytes]:
+        """Return the raw bytes of a value without converting it, None for NULL."""
+        idx = self._position(key)
+        data = self._data
+        if not isinstance(data, bytes):
+            return data[idx]
+        offsets = self._offsets
+        if offsets is None:
+            offsets = self._offsets = data_row_offsets(data)
+        start = offsets[2 * idx]
+        if start == -1:
+            return None
+        return data[start:offsets[2 * idx + 1]]
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return [self._get(idx) for idx in range(len(self))[key]]
+        return self._get(self._position(key))
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith('__'):
+            raise AttributeError(name)
+        try:
+            idx = self._layout.index[name]
+        except KeyError:
+            raise AttributeError(f"Row has no column '{name}'") from None
+        return self._get(idx)
+
+    def __len__(self) -> int:
+        return len(self._layout.converters)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.materialize())
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (LazyRow, Row, list, tuple)):
+            return self.materialize() == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __reduce__(self):
+        return (Row, (self.materialize(), self._layout.index))
+
+    def __repr__(self) -> str:
+        return repr(Row(self.materialize(), self._layout.index))
+
+    def materialize(self) -> List[Any]:
+        """Convert all values and return them as a list."""
+        return [self._get(idx) for idx in range(len(self))]
+
+    def keys(self) -> List[str]:
+        """Return the column names."""
+        return list(self._layout.index)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return a dict of column names and converted values."""
+        return {name: self._get(idx) for name, idx in self._layout.index.items()}